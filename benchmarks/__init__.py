@@ -0,0 +1,9 @@
+"""Benchmarks for pdpipe.
+
+Synthetic data generators live in `benchmarks.data`, the measurement harness
+in `benchmarks.runner` and per-stage micro-benchmarks in `benchmarks.stages`.
+Run them from the repository root, e.g.:
+
+    python -m benchmarks.stages --rows 1 1000 100000 --cols 4 16
+
+"""
@@ -0,0 +1,228 @@
+"""Compare benchmark results against a stored baseline.
+
+Results are matched by benchmark name, phase, and row and column counts. A
+result regresses if its throughput (rows per second) drops by more than the
+time threshold, or if its peak memory grows by more than the memory
+threshold; small absolute differences, which are mostly noise, are ignored.
+A benchmark which succeeded in the baseline but now fails also regresses.
+Baseline benchmarks missing from the current results are reported as such.
+
+    python -m benchmarks.compare baseline.json current.json
+    python -m benchmarks.compare baseline.json current.json \\
+        --time-threshold 0.1 --memory-threshold 0.05
+
+The command exits with status 1 if any regression is found.
+
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from .runner import read_results
+
+DEFAULT_TIME_THRESHOLD = 0.25
+DEFAULT_MEMORY_THRESHOLD = 0.10
+# absolute differences below these are considered noise
+MIN_SECONDS_DELTA = 0.001
+MIN_PEAK_BYTES_DELTA = 2**20
+
+
+def _key(res: dict) -> tuple:
+    return (res["benchmark"], res["phase"], res["rows"], res["cols"])
+
+
+def _compare_pair(
+    base: dict,
+    cur: dict,
+    time_threshold: float,
+    memory_threshold: float,
+) -> dict:
+    comparison = {"throughput_ratio": None, "memory_ratio": None}
+    if cur.get("error"):
+        if base.get("error"):
+            return {**comparison, "status": "failing", "reasons": []}
+        return {**comparison, "status": "regressed", "reasons": ["failed"]}
+    if base.get("error"):
+        return {**comparison, "status": "fixed", "reasons": []}
+    reasons = []
+    improved = False
+    if cur["seconds"] > 0 and base["seconds"] > 0:
+        ratio = base["seconds"] / cur["seconds"]
+        comparison["throughput_ratio"] = ratio
+        delta = abs(cur["seconds"] - base["seconds"])
+        if delta >= MIN_SECONDS_DELTA:
+            if ratio < 1 - time_threshold:
+                reasons.append(f"throughput x{ratio:.2f}")
+            elif ratio > 1 + time_threshold:
+                improved = True
+    base_peak, cur_peak = base.get("peak_bytes"), cur.get("peak_bytes")
+    if base_peak and cur_peak is not None:
+        ratio = cur_peak / base_peak
+        comparison["memory_ratio"] = ratio
+        if abs(cur_peak - base_peak) >= MIN_PEAK_BYTES_DELTA:
+            if ratio > 1 + memory_threshold:
+                reasons.append(f"peak memory x{ratio:.2f}")
+            elif ratio < 1 - memory_threshold:
+                improved = True
+    if reasons:
+        status = "regressed"
+    elif improved:
+        status = "improved"
+    else:
+        status = "ok"
+    return {**comparison, "status": status, "reasons": reasons}
+
+
+def _unmatched(status: str) -> dict:
+    return {
+        "status": status,
+        "reasons": [],
+        "throughput_ratio": None,
+        "memory_ratio": None,
+    }
+
+
+def compare_results(
+    baseline: List[dict],
+    current: List[dict],
+    time_threshold: float = DEFAULT_TIME_THRESHOLD,
+    memory_threshold: float = DEFAULT_MEMORY_THRESHOLD,
+) -> List[dict]:
+    """Compare current benchmark results to baseline ones.
+
+    Parameters
+    ----------
+    baseline : list of dict
+        Baseline benchmark results.
+    current : list of dict
+        Current benchmark results.
+    time_threshold : float, default 0.25
+        The allowed relative drop in throughput.
+    memory_threshold : float, default 0.1
+        The allowed relative growth in peak memory.
+
+    Returns
+    -------
+    list of dict
+        A comparison for every current result, with a 'status' entry - one
+        of 'ok', 'improved', 'regressed', 'fixed', 'failing' or 'new' - and
+        the reasons of regressions, if any, in a 'reasons' entry, followed by
+        a comparison with the 'missing' status for every baseline result
+        missing from the current results.
+
+    """
+    base_by_key = {_key(res): res for res in baseline}
+    comparisons = []
+    for cur in current:
+        base = base_by_key.pop(_key(cur), None)
+        if base is None:
+            comparison = _unmatched("new")
+        else:
+            comparison = _compare_pair(
+                base, cur, time_threshold, memory_threshold
+            )
+        comparisons.append({"key": _key(cur), **comparison})
+    for key in base_by_key:
+        comparisons.append({"key": key, **_unmatched("missing")})
+    return comparisons
+
+
+def missing(comparisons: List[dict]) -> List[dict]:
+    """Return the comparisons of baseline results missing from current ones."""
+    return [c for c in comparisons if c["status"] == "missing"]
+
+
+def regressions(comparisons: List[dict]) -> List[dict]:
+    """Return the regressed comparisons."""
+    return [c for c in comparisons if c["status"] == "regressed"]
+
+
+def _ratio_str(ratio: Optional[float]) -> str:
+    return "-" if ratio is None else f"x{ratio:.2f}"
+
+
+def print_comparisons(comparisons: List[dict], file=None) -> None:
+    """Print comparisons as an aligned table."""
+    file = file or sys.stdout
+    print(
+        f"{'benchmark':<40} {'phase':<14} {'rows':>9} {'cols':>5} "
+        f"{'throughput':>10} {'memory':>8}  status",
+        file=file,
+    )
+    for comp in comparisons:
+        benchmark, phase, rows, cols = comp["key"]
+        status = comp["status"]
+        if comp["reasons"]:
+            status = f"{status}: {', '.join(comp['reasons'])}"
+        print(
+            f"{benchmark:<40} {phase:<14} {rows:>9} {cols:>5} "
+            f"{_ratio_str(comp['throughput_ratio']):>10} "
+            f"{_ratio_str(comp['memory_ratio']):>8}  {status}",
+            file=file,
+        )
+
+
+def check(
+    baseline: List[dict],
+    current: List[dict],
+    time_threshold: float = DEFAULT_TIME_THRESHOLD,
+    memory_threshold: float = DEFAULT_MEMORY_THRESHOLD,
+    file=None,
+) -> bool:
+    """Print a comparison of results, returning False on any regression."""
+    file = file or sys.stdout
+    comparisons = compare_results(
+        baseline, current, time_threshold, memory_threshold
+    )
+    print_comparisons(comparisons, file=file)
+    n_missing = len(missing(comparisons))
+    if n_missing:
+        print(
+            f"\n{n_missing} baseline result(s) missing from current results.",
+            file=file,
+        )
+    regressed = regressions(comparisons)
+    if regressed:
+        print(f"\n{len(regressed)} regression(s) found.", file=file)
+        return False
+    print("\nNo regressions found.", file=file)
+    return True
+
+
+def add_threshold_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add regression threshold command-line arguments to a parser."""
+    parser.add_argument(
+        "--time-threshold",
+        type=float,
+        default=DEFAULT_TIME_THRESHOLD,
+        help="Allowed relative throughput drop (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=DEFAULT_MEMORY_THRESHOLD,
+        help="Allowed relative peak memory growth (default: %(default)s).",
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare pdpipe benchmark results against a baseline."
+    )
+    parser.add_argument("baseline", help="Baseline results JSON file.")
+    parser.add_argument("current", help="Current results JSON file.")
+    add_threshold_arguments(parser)
+    args = parser.parse_args(argv)
+    passed = check(
+        read_results(args.baseline),
+        read_results(args.current),
+        time_threshold=args.time_threshold,
+        memory_threshold=args.memory_threshold,
+    )
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Deterministic synthetic data generators for pdpipe benchmarks.
+
+Every generator takes the number of rows and columns to generate and a seed,
+and always returns the same dataframe for the same arguments.
+
+"""
+
+import numpy as np
+import pandas as pd
+
+# fmt: off
+VOCABULARY = np.array(
+    [
+        "the", "a", "of", "and", "to", "in", "is", "it", "that", "was",
+        "for", "on", "are", "with", "as", "be", "at", "this", "have", "from",
+        "shirt", "jacket", "shoe", "dress", "coat", "scarf", "hat", "sock",
+        "running", "runner", "runs", "walked", "walking", "walks", "sold",
+        "selling", "sells", "cheap", "cheaper", "cheapest", "quality",
+        "qualities", "red", "blue", "green", "black", "white", "large",
+        "larger", "small", "smaller", "delivery", "delivered", "returned",
+        "return", "returns", "excellent", "terrible", "fine", "ok",
+        "zyzzyva", "quixotic", "sesquipedalian", "defenestration",
+    ],
+    dtype=object,
+)
+CATEGORIES = np.array(
+    ["tops", "bottoms", "shoes", "accessories", "outerwear", "bags",
+     "jewelry", "sportswear", "underwear", "swimwear", "sleepwear", "other"],
+    dtype=object,
+)
+# fmt: on
+
+
+def _rng(seed: int) -> np.random.Generator:
+    return np.random.default_rng(seed)
+
+
+def numeric_frame(
+    n_rows: int, n_cols: int, seed: int = 0, nan_rate: float = 0.0
+) -> pd.DataFrame:
+    """Return a frame of float columns 'n0', 'n1', ... ."""
+    rng = _rng(seed)
+    data = rng.normal(loc=10, scale=5, size=(n_rows, n_cols))
+    if nan_rate > 0:
+        data[rng.random(size=data.shape) < nan_rate] = np.nan
+    return pd.DataFrame(data, columns=[f"n{i}" for i in range(n_cols)])
+
+
+def categorical_frame(
+    n_rows: int, n_cols: int, seed: int = 0, n_categories: int = 8
+) -> pd.DataFrame:
+    """Return a frame of low-cardinality string columns 'c0', 'c1', ... ."""
+    rng = _rng(seed)
+    categories = CATEGORIES[: max(1, min(n_categories, len(CATEGORIES)))]
+    return pd.DataFrame(
+        {
+            f"c{i}": categories[rng.integers(0, len(categories), n_rows)]
+            for i in range(n_cols)
+        }
+    )
+
+
+def mixed_frame(n_rows: int, n_cols: int, seed: int = 0) -> pd.DataFrame:
+    """Return a frame of numeric and categorical columns, half of each.
+
+    Numeric columns hold 5% missing values; an integer 'id' column with
+    repeating values is added as well.
+
+    """
+    n_num = max(1, n_cols // 2)
+    n_cat = max(1, n_cols - n_num)
+    num = numeric_frame(n_rows, n_num, seed=seed, nan_rate=0.05)
+    cat = categorical_frame(n_rows, n_cat, seed=seed + 1)
+    res = pd.concat([num, cat], axis=1)
+    res["id"] = _rng(seed + 2).integers(0, max(1, n_rows // 4), n_rows)
+    return res
+
+
+def _token_lists(rng, n_rows, tokens_per_row):
+    lengths = rng.integers(1, 2 * tokens_per_row, n_rows)
+    tokens = VOCABULARY[rng.integers(0, len(VOCABULARY), lengths.sum())]
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    return [list(row) for row in np.split(tokens, offsets[1:-1])]
+
+
+def token_frame(
+    n_rows: int, n_cols: int, seed: int = 0, tokens_per_row: int = 12
+) -> pd.DataFrame:
+    """Return a frame of token-list columns 'tk0', 'tk1', ... ."""
+    rng = _rng(seed)
+    return pd.DataFrame(
+        {
+            f"tk{i}": _token_lists(rng, n_rows, tokens_per_row)
+            for i in range(n_cols)
+        }
+    )
+
+
+def text_frame(
+    n_rows: int, n_cols: int, seed: int = 0, words_per_row: int = 12
+) -> pd.DataFrame:
+    """Return a frame of free-text string columns 't0', 't1', ... ."""
+    rng = _rng(seed)
+    return pd.DataFrame(
+        {
+            f"t{i}": [
+                " ".join(tokens) + "."
+                for tokens in _token_lists(rng, n_rows, words_per_row)
+            ]
+            for i in range(n_cols)
+        }
+    )
+
+
+SALES_COLUMNS = [
+    "SKC",
+    "date",
+    "sales",
+    "sales_amount",
+    "passenger_flow",
+    "plus_purchase",
+    "activity_level",
+    "S",
+    "A",
+    "B",
+    "N",
+    "shelf_date",
+    "end_of_season",
+    "category_group",
+    "category",
+    "original_price",
+    "season",
+]
+
+
+def sales_frame(n_rows: int, n_cols: int = None, seed: int = 0):
+    """Return a synthetic version of the sales dataset of pdpipe issue #29.
+
+    `n_cols` is ignored, as the sales dataset has a fixed schema (see
+    `SALES_COLUMNS`); it is accepted for a uniform generator signature.
+
+    """
+    rng = _rng(seed)
+    n_skus = max(1, n_rows // 50)
+    start = np.datetime64("2020-01-01")
+    shelf = start + rng.integers(0, 300, n_rows).astype("timedelta64[D]")
+    date = shelf + rng.integers(-10, 120, n_rows).astype("timedelta64[D]")
+    season_end = shelf + rng.integers(60, 180, n_rows).astype("timedelta64[D]")
+    price = np.round(rng.uniform(5, 200, n_rows), 2)
+    sales = rng.integers(-2, 30, n_rows)
+    group = np.where(rng.random(n_rows) < 0.4, "tops", "bottoms")
+    return pd.DataFrame(
+        {
+            "SKC": [f"SKC{i:06d}" for i in rng.integers(0, n_skus, n_rows)],
+            "date": np.datetime_as_string(date),
+            "sales": sales,
+            "sales_amount": np.round(
+                sales * price * rng.uniform(0.5, 1, n_rows), 2
+            ),
+            "passenger_flow": rng.integers(-5, 500, n_rows),
+            "plus_purchase": rng.integers(-1, 40, n_rows),
+            "activity_level": rng.integers(0, 4, n_rows),
+            "S": rng.integers(0, 10, n_rows),
+            "A": rng.integers(0, 10, n_rows),
+            "B": rng.integers(0, 10, n_rows),
+            "N": rng.integers(0, 10, n_rows),
+            "shelf_date": np.datetime_as_string(shelf),
+            "end_of_season": np.datetime_as_string(season_end),
+            "category_group": group.astype(object),
+            "category": CATEGORIES[rng.integers(0, len(CATEGORIES), n_rows)],
+            "original_price": price,
+            "season": rng.choice(
+                np.array(["spring", "summer", "autumn", "winter"], object),
+                n_rows,
+            ),
+        },
+        columns=SALES_COLUMNS,
+    )
+
+
+GENERATORS = {
+    "numeric": numeric_frame,
+    "numeric_nan": lambda n_rows, n_cols, seed=0: numeric_frame(
+        n_rows, n_cols, seed=seed, nan_rate=0.1
+    ),
+    "categorical": categorical_frame,
+    "mixed": mixed_frame,
+    "tokens": token_frame,
+    "text": text_frame,
+    "sales": sales_frame,
+}
+
+
+def make_frame(kind: str, n_rows: int, n_cols: int, seed: int = 0):
+    """Return a synthetic frame of the given kind and shape."""
+    return GENERATORS[kind](n_rows, n_cols, seed=seed)
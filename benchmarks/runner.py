@@ -0,0 +1,123 @@
+"""Measurement harness shared by pdpipe benchmarks.
+
+Wall time is measured with `time.perf_counter`, taking the best of several
+repeats, while peak memory is measured in a separate, single run traced by
+`tracemalloc` (which numpy and pandas allocations are reported to), so that
+tracing overhead does not distort timings.
+
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def measure_time(func: Callable[[], object], repeat: int = 3) -> float:
+    """Return the best wall time, in seconds, of calling func repeat times."""
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_peak_memory(func: Callable[[], object]) -> int:
+    """Return the peak memory, in bytes, allocated during a call to func."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return max(0, peak - baseline)
+
+
+def measure(
+    func: Callable[[], object],
+    repeat: int = 3,
+    memory: bool = True,
+) -> Tuple[float, Optional[int]]:
+    """Return the best wall time and the peak memory of calling func."""
+    seconds = measure_time(func, repeat=repeat)
+    peak = measure_peak_memory(func) if memory else None
+    return seconds, peak
+
+
+def error_str(error: Exception) -> str:
+    """Return a short, single-line description of an error."""
+    msg = str(error).strip().split("\n")[0]
+    return f"{type(error).__name__}: {msg}"[:200]
+
+
+def environment() -> Dict[str, str]:
+    """Return a description of the benchmarking environment."""
+    import numpy
+    import pandas
+
+    import pdpipe
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "pdpipe": pdpipe.__version__,
+    }
+
+
+def write_results(results: List[dict], path: str) -> None:
+    """Write benchmark results, with environment details, as JSON."""
+    with open(path, "w") as f:
+        json.dump(
+            {"environment": environment(), "results": results},
+            f,
+            indent=2,
+        )
+
+
+def write_baseline(results: List[dict], path: str) -> None:
+    """Write benchmark results as a baseline, refusing any failed ones."""
+    failed = [res["benchmark"] for res in results if res.get("error")]
+    if failed:
+        raise ValueError(
+            f"Failed benchmarks can't be stored as a baseline: {failed}"
+        )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    write_results(results, path)
+
+
+def read_results(path: str) -> List[dict]:
+    """Read benchmark results written by `write_results`."""
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def print_results(results: List[dict], file=None, header=True) -> None:
+    """Print benchmark results as an aligned table."""
+    file = file or sys.stdout
+    if header:
+        print(
+            f"{'benchmark':<40} {'phase':<14} {'rows':>9} {'cols':>5} "
+            f"{'time [ms]':>11} {'peak [MB]':>10}",
+            file=file,
+        )
+    for res in results:
+        if res.get("error"):
+            stats = f"ERROR: {res['error']}"
+        else:
+            peak = res.get("peak_bytes")
+            peak_str = "-" if peak is None else f"{peak / 2**20:.2f}"
+            stats = f"{res['seconds'] * 1000:>11.3f} {peak_str:>10}"
+        print(
+            f"{res['benchmark']:<40} {res['phase']:<14} "
+            f"{res['rows']:>9} {res['cols']:>5} {stats}",
+            file=file,
+        )
@@ -0,0 +1,550 @@
+"""Per-stage micro-benchmarks for pdpipe.
+
+Every public stage of `basic_stages`, `col_generation`, `sklearn_stages`,
+`text_stages` and `nltk_stages`, as well as `fly` row filters and `pdp.df`
+expressions, is timed - both fitting (`fit_transform`, including stage
+construction) and applying a fitted stage (`transform`) - over a grid of row
+and column counts of deterministic synthetic data (see `benchmarks.data`).
+Peak memory of each phase is recorded as well.
+
+Usage examples, run from the repository root:
+
+    python -m benchmarks.stages
+    python -m benchmarks.stages --rows 1 1e3 1e5 1e7 --cols 4 16 64
+    python -m benchmarks.stages --group sklearn_stages --output sk.json
+    python -m benchmarks.stages --filter "Scale|Imputer" --repeat 5
+
+"""
+
+import argparse
+import importlib
+import math
+import re
+import sys
+import warnings
+from typing import Callable, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import pdpipe as pdp
+
+from .data import make_frame
+from .runner import error_str, measure, print_results, write_results
+
+DEFAULT_ROWS = (1, 1_000, 100_000)
+FULL_ROWS = (1, 1_000, 100_000, 10_000_000)
+DEFAULT_COLS = (4, 16)
+
+
+class StageBenchmark:
+    """A micro-benchmark of a single pipeline stage.
+
+    Parameters
+    ----------
+    name : str
+        The name of the benchmark.
+    group : str
+        The group of the benchmark, usually the name of the module defining
+        the benchmarked stage.
+    data : str
+        The kind of synthetic data to benchmark on. See `benchmarks.data`.
+    make_stage : callable
+        Builds the benchmarked stage given an input dataframe.
+    make_y : callable, optional
+        Builds a label series given an input dataframe, for stages that
+        transform labels.
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        group: str,
+        data: str,
+        make_stage: Callable[[pd.DataFrame], pdp.PdPipelineStage],
+        make_y: Optional[Callable[[pd.DataFrame], pd.Series]] = None,
+    ) -> None:
+        self.name = name
+        self.group = group
+        self.data = data
+        self.make_stage = make_stage
+        self.make_y = make_y
+
+
+def _first(X):
+    return X.columns[0]
+
+
+def _last(X):
+    return X.columns[-1]
+
+
+def _sklearn(name):
+    # sklearn is imported lazily so that listing benchmarks stays cheap
+    module_name, _, attr_name = name.rpartition(".")
+    return getattr(importlib.import_module(module_name), attr_name)
+
+
+def _enricher_pipeline(X):
+    # enrichers need the application context of an enclosing pipeline
+    return pdp.PdPipeline([pdp.ApplicationContextEnricher(nrows=len)])
+
+
+def _row_sum(row):
+    return row.iloc[0] + row.iloc[-1]
+
+
+BENCHMARKS = [
+    # === basic_stages ===
+    StageBenchmark(
+        "ColDrop", "basic_stages", "mixed", lambda X: pdp.ColDrop(_first(X))
+    ),
+    StageBenchmark(
+        "ValDrop",
+        "basic_stages",
+        "categorical",
+        lambda X: pdp.ValDrop(["tops", "shoes"], _first(X)),
+    ),
+    StageBenchmark(
+        "ValDrop[all_columns]",
+        "basic_stages",
+        "categorical",
+        lambda X: pdp.ValDrop(["tops"]),
+    ),
+    StageBenchmark(
+        "ValKeep",
+        "basic_stages",
+        "categorical",
+        lambda X: pdp.ValKeep(["tops", "shoes", "bags"], _first(X)),
+    ),
+    StageBenchmark(
+        "ColRename",
+        "basic_stages",
+        "numeric",
+        lambda X: pdp.ColRename({lbl: f"{lbl}_r" for lbl in X.columns}),
+    ),
+    StageBenchmark(
+        "DropNa", "basic_stages", "numeric_nan", lambda X: pdp.DropNa()
+    ),
+    StageBenchmark(
+        "SetIndex", "basic_stages", "mixed", lambda X: pdp.SetIndex("id")
+    ),
+    StageBenchmark(
+        "FreqDrop", "basic_stages", "mixed", lambda X: pdp.FreqDrop(2, "id")
+    ),
+    StageBenchmark(
+        "ColReorder",
+        "basic_stages",
+        "numeric",
+        lambda X: pdp.ColReorder({_last(X): 0}),
+    ),
+    StageBenchmark(
+        "RowDrop[dict]",
+        "basic_stages",
+        "numeric",
+        lambda X: pdp.RowDrop({_first(X): lambda x: x < 5}),
+    ),
+    StageBenchmark(
+        "RowDrop[list]",
+        "basic_stages",
+        "numeric",
+        lambda X: pdp.RowDrop([lambda x: x < 0], reduce="any"),
+    ),
+    StageBenchmark(
+        "Schematize",
+        "basic_stages",
+        "mixed",
+        lambda X: pdp.Schematize(list(reversed(X.columns))),
+    ),
+    StageBenchmark(
+        "DropDuplicates",
+        "basic_stages",
+        "categorical",
+        lambda X: pdp.DropDuplicates(),
+    ),
+    StageBenchmark(
+        "ColumnDtypeEnforcer",
+        "basic_stages",
+        "numeric",
+        lambda X: pdp.ColumnDtypeEnforcer(
+            {lbl: "float32" for lbl in X.columns}
+        ),
+    ),
+    StageBenchmark(
+        "ConditionValidator",
+        "basic_stages",
+        "numeric",
+        lambda X: pdp.ConditionValidator(pdp.cond.HasNoMissingValues()),
+    ),
+    StageBenchmark(
+        "ApplicationContextEnricher",
+        "basic_stages",
+        "numeric",
+        _enricher_pipeline,
+    ),
+    # === col_generation ===
+    StageBenchmark(
+        "Bin",
+        "col_generation",
+        "numeric",
+        lambda X: pdp.Bin({_first(X): [0, 5, 10, 15]}),
+    ),
+    StageBenchmark(
+        "OneHotEncode",
+        "col_generation",
+        "categorical",
+        lambda X: pdp.OneHotEncode(),
+    ),
+    StageBenchmark(
+        "MapColVals",
+        "col_generation",
+        "categorical",
+        lambda X: pdp.MapColVals(
+            list(X.columns), {cat: i for i, cat in enumerate(["tops", "bags"])}
+        ),
+    ),
+    StageBenchmark(
+        "ApplyToRows",
+        "col_generation",
+        "numeric",
+        lambda X: pdp.ApplyToRows(_row_sum, "row_sum"),
+    ),
+    StageBenchmark(
+        "ApplyByCols",
+        "col_generation",
+        "numeric",
+        lambda X: pdp.ApplyByCols(list(X.columns), math.floor),
+    ),
+    StageBenchmark(
+        "TransformByCols",
+        "col_generation",
+        "numeric",
+        lambda X: pdp.TransformByCols(list(X.columns), np.abs),
+    ),
+    StageBenchmark(
+        "Diff",
+        "col_generation",
+        "numeric",
+        lambda X: pdp.Diff(list(X.columns)),
+    ),
+    StageBenchmark(
+        "ColByFrameFunc",
+        "col_generation",
+        "numeric",
+        lambda X: pdp.ColByFrameFunc(
+            "ratio", lambda df: df[_first(df)] / df[_last(df)]
+        ),
+    ),
+    StageBenchmark(
+        "AggByCols",
+        "col_generation",
+        "numeric",
+        lambda X: pdp.AggByCols(list(X.columns), np.abs),
+    ),
+    StageBenchmark(
+        "Log",
+        "col_generation",
+        "numeric",
+        lambda X: pdp.Log(non_neg=True, suppress_warnings=True),
+    ),
+    # === sklearn_stages ===
+    StageBenchmark(
+        "Encode", "sklearn_stages", "categorical", lambda X: pdp.Encode()
+    ),
+    StageBenchmark(
+        "Scale",
+        "sklearn_stages",
+        "numeric",
+        lambda X: pdp.Scale("StandardScaler"),
+    ),
+    StageBenchmark(
+        "Scale[joint]",
+        "sklearn_stages",
+        "numeric",
+        lambda X: pdp.Scale("MinMaxScaler", joint=True),
+    ),
+    StageBenchmark(
+        "SklearnColumnTransform",
+        "sklearn_stages",
+        "numeric",
+        lambda X: pdp.SklearnColumnTransform(
+            _sklearn("sklearn.preprocessing.StandardScaler")()
+        ),
+    ),
+    StageBenchmark(
+        "TfidfVectorizeTokenLists",
+        "sklearn_stages",
+        "tokens",
+        lambda X: pdp.TfidfVectorizeTokenLists(_first(X)),
+    ),
+    StageBenchmark(
+        "Decompose",
+        "sklearn_stages",
+        "numeric",
+        lambda X: pdp.Decompose(
+            _sklearn("sklearn.decomposition.PCA")(),
+            n_components=max(1, len(X.columns) // 2),
+        ),
+    ),
+    StageBenchmark(
+        "EncodeLabel",
+        "sklearn_stages",
+        "numeric",
+        lambda X: pdp.EncodeLabel(),
+        make_y=lambda X: pd.Series(
+            np.where(X[_first(X)] > 10, "high", "low"), index=X.index
+        ),
+    ),
+    StageBenchmark(
+        "Imputer", "sklearn_stages", "numeric_nan", lambda X: pdp.Imputer()
+    ),
+    # === text_stages ===
+    StageBenchmark(
+        "RegexReplace",
+        "text_stages",
+        "text",
+        lambda X: pdp.RegexReplace(list(X.columns), r"\bthe\b", "THE"),
+    ),
+    StageBenchmark(
+        "DropTokensByLength",
+        "text_stages",
+        "tokens",
+        lambda X: pdp.DropTokensByLength(list(X.columns), 4),
+    ),
+    StageBenchmark(
+        "DropTokensByList",
+        "text_stages",
+        "tokens",
+        lambda X: pdp.DropTokensByList(
+            list(X.columns), ["the", "a", "of", "and", "to", "in"]
+        ),
+    ),
+    # === nltk_stages ===
+    StageBenchmark(
+        "TokenizeText",
+        "nltk_stages",
+        "text",
+        lambda X: pdp.TokenizeText(list(X.columns)),
+    ),
+    StageBenchmark(
+        "UntokenizeText",
+        "nltk_stages",
+        "tokens",
+        lambda X: pdp.UntokenizeText(list(X.columns)),
+    ),
+    StageBenchmark(
+        "RemoveStopwords",
+        "nltk_stages",
+        "tokens",
+        lambda X: pdp.RemoveStopwords("english", list(X.columns)),
+    ),
+    StageBenchmark(
+        "SnowballStem",
+        "nltk_stages",
+        "tokens",
+        lambda X: pdp.SnowballStem("EnglishStemmer", list(X.columns)),
+    ),
+    StageBenchmark(
+        "DropRareTokens",
+        "nltk_stages",
+        "tokens",
+        lambda X: pdp.DropRareTokens(list(X.columns), 2),
+    ),
+    # === fly ===
+    StageBenchmark(
+        "drop_rows_where[gt]",
+        "fly",
+        "numeric",
+        lambda X: pdp.drop_rows_where[_first(X)] > 10,
+    ),
+    StageBenchmark(
+        "keep_rows_where[isin]",
+        "fly",
+        "categorical",
+        lambda X: pdp.keep_rows_where[_first(X)].isin(["tops", "shoes"]),
+    ),
+    StageBenchmark(
+        "drop_rows_where[compound]",
+        "fly",
+        "numeric",
+        lambda X: (pdp.drop_rows_where[_first(X)] > 10)
+        | (pdp.drop_rows_where[_last(X)] < 5),
+    ),
+    # === pdp.df expressions ===
+    StageBenchmark(
+        "df[arithmetic]",
+        "df",
+        "numeric",
+        lambda X: pdp.df["res"] << (pdp.df[_first(X)] + pdp.df[_last(X)] * 2),
+    ),
+    StageBenchmark(
+        "df[series_method]",
+        "df",
+        "numeric_nan",
+        lambda X: pdp.df["res"] << pdp.df[_first(X)].fillna(0),
+    ),
+    StageBenchmark(
+        "df[dataframe_method]",
+        "df",
+        "numeric",
+        lambda X: pdp.df.sort_values(by=_first(X)),
+    ),
+]
+
+
+def run_benchmark(
+    benchmark: StageBenchmark,
+    X: pd.DataFrame,
+    repeat: int = 3,
+    memory: bool = True,
+) -> List[dict]:
+    """Run a single stage benchmark over the given dataframe.
+
+    Returns one result dict per measured phase ('fit_transform' and
+    'transform'). Failures are recorded in the 'error' entry of a result
+    rather than raised.
+
+    """
+    y = benchmark.make_y(X) if benchmark.make_y is not None else None
+    base = {
+        "benchmark": benchmark.name,
+        "group": benchmark.group,
+        "rows": len(X),
+        "cols": len(X.columns),
+    }
+
+    def _fit_transform():
+        return benchmark.make_stage(X).fit_transform(X, y)
+
+    results = []
+    try:
+        seconds, peak = measure(_fit_transform, repeat=repeat, memory=memory)
+        results.append(
+            {
+                **base,
+                "phase": "fit_transform",
+                "seconds": seconds,
+                "peak_bytes": peak,
+            }
+        )
+        stage = benchmark.make_stage(X)
+        stage.fit_transform(X, y)
+        seconds, peak = measure(
+            lambda: stage.transform(X, y), repeat=repeat, memory=memory
+        )
+        results.append(
+            {
+                **base,
+                "phase": "transform",
+                "seconds": seconds,
+                "peak_bytes": peak,
+            }
+        )
+    except Exception as error:  # pylint: disable=broad-except
+        phase = "transform" if results else "fit_transform"
+        results.append({**base, "phase": phase, "error": error_str(error)})
+    return results
+
+
+def select_benchmarks(
+    pattern: Optional[str] = None,
+    groups: Optional[Iterable[str]] = None,
+) -> List[StageBenchmark]:
+    """Return the benchmarks matching a name regex and belonging to groups."""
+    selected = BENCHMARKS
+    if pattern:
+        selected = [b for b in selected if re.search(pattern, b.name)]
+    if groups:
+        groups = set(groups)
+        selected = [b for b in selected if b.group in groups]
+    return selected
+
+
+def run_stage_benchmarks(
+    rows: Iterable[int] = DEFAULT_ROWS,
+    cols: Iterable[int] = DEFAULT_COLS,
+    benchmarks: Optional[List[StageBenchmark]] = None,
+    repeat: int = 3,
+    memory: bool = True,
+    verbose: bool = False,
+) -> List[dict]:
+    """Run stage benchmarks over a grid of row and column counts."""
+    if benchmarks is None:
+        benchmarks = BENCHMARKS
+    results = []
+    for n_rows in rows:
+        for n_cols in cols:
+            frames = {}
+            for benchmark in benchmarks:
+                if benchmark.data not in frames:
+                    frames[benchmark.data] = make_frame(
+                        benchmark.data, n_rows, n_cols
+                    )
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    res = run_benchmark(
+                        benchmark,
+                        frames[benchmark.data],
+                        repeat=repeat,
+                        memory=memory,
+                    )
+                if verbose:
+                    print_results(res, header=False)
+                results.extend(res)
+    return results
+
+
+def _count(value: str) -> int:
+    return int(float(value))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Run pdpipe per-stage micro-benchmarks."
+    )
+    parser.add_argument("--rows", type=_count, nargs="+", default=None)
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help=f"Use row counts {FULL_ROWS}, including 1e7 rows.",
+    )
+    parser.add_argument(
+        "--cols", type=_count, nargs="+", default=list(DEFAULT_COLS)
+    )
+    parser.add_argument(
+        "--filter", default=None, help="Regex on benchmark names."
+    )
+    parser.add_argument("--group", nargs="+", default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip the (slower) peak memory measurements.",
+    )
+    parser.add_argument("--output", default=None, help="JSON results file.")
+    parser.add_argument("--list", action="store_true")
+    args = parser.parse_args(argv)
+
+    benchmarks = select_benchmarks(args.filter, args.group)
+    if args.list:
+        for benchmark in benchmarks:
+            print(f"{benchmark.group:<16} {benchmark.name}")
+        return
+    rows = args.rows or (FULL_ROWS if args.full else DEFAULT_ROWS)
+    print_results([], header=True)
+    results = run_stage_benchmarks(
+        rows=rows,
+        cols=args.cols,
+        benchmarks=benchmarks,
+        repeat=args.repeat,
+        memory=not args.no_memory,
+        verbose=True,
+    )
+    if args.output:
+        write_results(results, args.output)
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
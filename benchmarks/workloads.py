@@ -0,0 +1,352 @@
+"""End-to-end workload benchmarks for pdpipe.
+
+Each workload is a complete, production-like pipeline, run over synthetic
+data (see `benchmarks.data`), and timed, and memory-profiled, through both
+its fitting and its application phases:
+
+- sales_features: the sales feature pipeline of pdpipe issue #29.
+- text_tfidf: TokenizeText -> RemoveStopwords -> SnowballStem ->
+  TfidfVectorizeTokenLists over free-text reviews.
+- mixed_estimator: a PdPipelineAndSklearnEstimator that imputes, one-hot
+  encodes and scales mixed numeric/categorical data before a logistic
+  regression; fit, then predict.
+
+Results can be stored as a baseline and later compared against, failing when
+throughput or peak memory regress past given thresholds:
+
+    python -m benchmarks.workloads --save-baseline
+    python -m benchmarks.workloads --compare
+
+Timings only compare on the same machine and environment, so no baseline is
+shipped with pdpipe: generate one, on the machine the comparisons are to be
+run on, from the revision to compare against, before making any changes. It
+is stored in benchmarks/baselines/, which git ignores. Baselines are only
+stored if all workloads ran; text_tfidf needs the NLTK punkt and stopwords
+data to be installed.
+
+In mixed_estimator, applying takes much longer than fitting, as OneHotEncode
+fits with pandas.get_dummies but encodes new data row by row.
+
+See `benchmarks.compare` for comparing two stored result files.
+
+"""
+
+import argparse
+import os
+import sys
+import warnings
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import pdpipe as pdp
+
+from .compare import add_threshold_arguments, check
+from .data import SALES_COLUMNS, make_frame, mixed_frame
+from .runner import (
+    error_str,
+    measure,
+    print_results,
+    read_results,
+    write_baseline,
+    write_results,
+)
+
+DEFAULT_ROWS = (2_000,)
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+DEFAULT_BASELINE = os.path.join(BASELINE_DIR, "workloads.json")
+
+
+class Workload:
+    """An end-to-end benchmark workload.
+
+    Parameters
+    ----------
+    name : str
+        The name of the workload.
+    make_data : callable
+        Given a number of rows, returns an (X, y) tuple of synthetic data; y
+        can be None.
+    make_model : callable
+        Returns a new, unfitted, model - usually a pipeline.
+    fit : callable
+        Fits a model given X and y.
+    apply : callable
+        Applies a fitted model to X.
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        make_data: Callable[[int], tuple],
+        make_model: Callable[[], object],
+        fit: Callable[[object, pd.DataFrame, Optional[pd.Series]], object],
+        apply: Callable[[object, pd.DataFrame], object],
+    ) -> None:
+        self.name = name
+        self.make_data = make_data
+        self.make_model = make_model
+        self.fit = fit
+        self.apply = apply
+
+
+# === sales features, from issue #29 ===
+
+
+def _sales_row_features(row):
+    standard_amount = row["original_price"] * row["sales"]
+    return pd.Series(
+        {
+            "standard_amount": standard_amount,
+            "sales_discount": (
+                0
+                if standard_amount <= 0
+                else row["sales_amount"] / standard_amount
+            ),
+            "week": int(row["date"].strftime("%W")),
+            "days_on_counter": (row["date"] - row["shelf_date"])
+            / np.timedelta64(1, "D"),
+            "life_cycle": (row["end_of_season"] - row["shelf_date"])
+            / np.timedelta64(1, "D"),
+            "C1": 1 if row["category_group"] == "tops" else 0,
+            "C2": 1 if row["category_group"] == "other" else 0,
+            "sales": max(0, row["sales"]),
+            "passenger_flow": max(0, row["passenger_flow"]),
+            "plus_purchase": max(0, row["plus_purchase"]),
+        }
+    )
+
+
+def _tops_or_other(value):
+    return "tops" if value == "tops" else "other"
+
+
+def _in_life_cycle(df):
+    return df[df["days_on_counter"] <= df["life_cycle"]]
+
+
+def _sales_pipeline():
+    return pdp.PdPipeline(
+        [
+            pdp.Schematize(SALES_COLUMNS),
+            pdp.ApplyByCols("category_group", _tops_or_other),
+            pdp.ApplyByCols(
+                ["date", "shelf_date", "end_of_season"], pd.to_datetime
+            ),
+            pdp.ApplyToRows(_sales_row_features),
+            pdp.AdHocStage(_in_life_cycle),
+            pdp.ColDrop("activity_level"),
+        ]
+    )
+
+
+# === text features ===
+
+
+def _text_data(n_rows):
+    X = make_frame("text", n_rows, 1)
+    X.columns = ["review"]
+    return X, None
+
+
+def _text_pipeline():
+    return pdp.PdPipeline(
+        [
+            pdp.TokenizeText("review"),
+            pdp.RemoveStopwords("english", "review"),
+            pdp.SnowballStem("EnglishStemmer", "review"),
+            pdp.TfidfVectorizeTokenLists("review"),
+        ]
+    )
+
+
+# === mixed data, with a scikit-learn estimator ===
+
+
+def _mixed_data(n_rows):
+    X = mixed_frame(n_rows, 8).drop(columns="id")
+    y = pd.Series(
+        (X["n0"].fillna(10) + (X["c0"] == "tops") * 5 > 12).astype(int),
+        index=X.index,
+    )
+    return X, y
+
+
+def _mixed_estimator():
+    from sklearn.linear_model import LogisticRegression
+
+    from pdpipe.skintegrate import PdPipelineAndSklearnEstimator
+
+    pipeline = pdp.PdPipeline(
+        [
+            pdp.Imputer(columns=pdp.cq.OfNumericDtypes()),
+            pdp.OneHotEncode(),
+            pdp.Scale("StandardScaler"),
+        ]
+    )
+    return PdPipelineAndSklearnEstimator(
+        pipeline=pipeline, estimator=LogisticRegression(max_iter=500)
+    )
+
+
+WORKLOADS = [
+    Workload(
+        "sales_features",
+        make_data=lambda n_rows: (make_frame("sales", n_rows, 0), None),
+        make_model=_sales_pipeline,
+        fit=lambda model, X, y: model.fit_transform(X),
+        apply=lambda model, X: model.transform(X),
+    ),
+    Workload(
+        "text_tfidf",
+        make_data=_text_data,
+        make_model=_text_pipeline,
+        fit=lambda model, X, y: model.fit_transform(X),
+        apply=lambda model, X: model.transform(X),
+    ),
+    Workload(
+        "mixed_estimator",
+        make_data=_mixed_data,
+        make_model=_mixed_estimator,
+        fit=lambda model, X, y: model.fit(X, y),
+        apply=lambda model, X: model.predict(X),
+    ),
+]
+
+
+def run_workload(
+    workload: Workload,
+    n_rows: int,
+    repeat: int = 3,
+    memory: bool = True,
+) -> List[dict]:
+    """Run a workload over synthetic data with the given number of rows.
+
+    Returns one result dict per phase ('fit' and 'apply'). Failures are
+    recorded in the 'error' entry of a result rather than raised.
+
+    """
+    X, y = workload.make_data(n_rows)
+    base = {
+        "benchmark": workload.name,
+        "group": "workloads",
+        "rows": len(X),
+        "cols": len(X.columns),
+    }
+    results = []
+    try:
+        seconds, peak = measure(
+            lambda: workload.fit(workload.make_model(), X, y),
+            repeat=repeat,
+            memory=memory,
+        )
+        results.append(
+            {**base, "phase": "fit", "seconds": seconds, "peak_bytes": peak}
+        )
+        model = workload.make_model()
+        workload.fit(model, X, y)
+        seconds, peak = measure(
+            lambda: workload.apply(model, X), repeat=repeat, memory=memory
+        )
+        results.append(
+            {**base, "phase": "apply", "seconds": seconds, "peak_bytes": peak}
+        )
+    except Exception as error:  # pylint: disable=broad-except
+        phase = "apply" if results else "fit"
+        results.append({**base, "phase": phase, "error": error_str(error)})
+    return results
+
+
+def run_workloads(
+    rows=DEFAULT_ROWS,
+    workloads: Optional[List[Workload]] = None,
+    repeat: int = 3,
+    memory: bool = True,
+    verbose: bool = False,
+) -> List[dict]:
+    """Run workloads for each of the given row counts."""
+    if workloads is None:
+        workloads = WORKLOADS
+    results = []
+    for n_rows in rows:
+        for workload in workloads:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                res = run_workload(
+                    workload, n_rows, repeat=repeat, memory=memory
+                )
+            if verbose:
+                print_results(res, header=False)
+            results.extend(res)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Run pdpipe end-to-end workload benchmarks."
+    )
+    parser.add_argument(
+        "--rows",
+        type=lambda value: int(float(value)),
+        nargs="+",
+        default=list(DEFAULT_ROWS),
+    )
+    parser.add_argument("--workload", nargs="+", default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="JSON results file.")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help=f"Store results as the baseline, in {DEFAULT_BASELINE}.",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        default=None,
+        metavar="BASELINE",
+        help="Compare results with a baseline, exiting with 1 on regression.",
+    )
+    add_threshold_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.compare and not os.path.exists(args.compare):
+        parser.error(
+            f"no baseline at {args.compare}; store one with --save-baseline"
+        )
+    workloads = WORKLOADS
+    if args.workload:
+        workloads = [w for w in WORKLOADS if w.name in args.workload]
+    print_results([], header=True)
+    results = run_workloads(
+        rows=args.rows,
+        workloads=workloads,
+        repeat=args.repeat,
+        verbose=True,
+    )
+    if args.output:
+        write_results(results, args.output)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    if args.save_baseline:
+        try:
+            write_baseline(results, DEFAULT_BASELINE)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            sys.exit(1)
+        print(f"Baseline written to {DEFAULT_BASELINE}", file=sys.stderr)
+    if args.compare:
+        print()
+        passed = check(
+            read_results(args.compare),
+            results,
+            time_threshold=args.time_threshold,
+            memory_threshold=args.memory_threshold,
+        )
+        if not passed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
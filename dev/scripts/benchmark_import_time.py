@@ -0,0 +1,73 @@
+"""Benchmark the startup cost of `import pdpipe` using `python -X importtime`.
+
+Run from the repository root, e.g.:
+
+    python dev/scripts/benchmark_import_time.py --repeat 5 --top 15
+
+Use `--max-ms` to fail (exit code 1) when the median cumulative import time
+of pdpipe exceeds a given budget, e.g. in CI.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+SRC_DIR = os.path.join(REPO_ROOT, "src")
+
+
+def import_time_report(module="pdpipe"):
+    """Return (self_us, cumulative_us) per imported module for one run."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [SRC_DIR, env.get("PYTHONPATH", "")]
+    ).rstrip(os.pathsep)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    report = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        report[name.strip()] = (int(self_us), int(cumulative_us))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="pdpipe")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    reports = [import_time_report(args.module) for _ in range(args.repeat)]
+    totals_ms = [report[args.module][1] / 1000 for report in reports]
+    median_ms = statistics.median(totals_ms)
+    print(
+        f"import {args.module}: median {median_ms:.1f}ms, "
+        f"min {min(totals_ms):.1f}ms, max {max(totals_ms):.1f}ms "
+        f"over {args.repeat} runs"
+    )
+    last = reports[-1]
+    print(f"{len(last)} modules imported. Slowest by self time:")
+    by_self = sorted(last.items(), key=lambda item: -item[1][0])
+    for name, (self_us, cumulative_us) in by_self[: args.top]:
+        print(
+            f"  {self_us / 1000:8.1f}ms self {cumulative_us / 1000:8.1f}ms "
+            f"cumulative  {name}"
+        )
+    if args.max_ms is not None and median_ms > args.max_ms:
+        print(f"FAILED: {median_ms:.1f}ms exceeds budget of {args.max_ms}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
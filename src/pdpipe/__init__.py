@@ -14,10 +14,12 @@ mixed-type data.
 # pylint: disable=C0413
 # flake8: noqa
 
+from importlib import import_module as _import_module
+
 from . import core
 from .core import PdPipelineStage, AdHocStage, PdPipeline, make_pdpipeline
 
-core.__load_stage_attributes_from_module__("pdpipe.core")
+core.__register_lazy_stage_attributes_from_module__("pdpipe.core")
 
 from . import basic_stages
 from .basic_stages import (
@@ -37,7 +39,7 @@ from .basic_stages import (
     ApplicationContextEnricher,
 )
 
-core.__load_stage_attributes_from_module__("pdpipe.basic_stages")
+core.__register_lazy_stage_attributes_from_module__("pdpipe.basic_stages")
 
 from . import col_generation
 from .col_generation import (
@@ -53,11 +55,12 @@ from .col_generation import (
     Log,
 )
 
-core.__load_stage_attributes_from_module__("pdpipe.col_generation")
+core.__register_lazy_stage_attributes_from_module__("pdpipe.col_generation")
 
 from . import text_stages
 from .text_stages import (
     RegexReplace,
+    MultiRegexReplace,
     DropTokensByLength,
     DropTokensByList,
 )
@@ -66,35 +69,73 @@ from .lbl import (
     DropLabelsByValues,
 )
 
-core.__load_stage_attributes_from_module__("pdpipe.lbl")
+core.__register_lazy_stage_attributes_from_module__("pdpipe.lbl")
 
-core.__load_stage_attributes_from_module__("pdpipe.text_stages")
+core.__register_lazy_stage_attributes_from_module__("pdpipe.text_stages")
 
 from . import wrappers
 from .wrappers import (
     FitOnly,
 )
 
-core.__load_stage_attributes_from_module__("pdpipe.wrappers")
+core.__register_lazy_stage_attributes_from_module__("pdpipe.wrappers")
 
 from .fly import (
     drop_rows_where,
     keep_rows_where,
 )
 
-from . import skintegrate
-from . import sklearn_stages
-from .sklearn_stages import (
-    Encode,
-    Scale,
-    SklearnColumnTransform,
-    TfidfVectorizeTokenLists,
-    Decompose,
-    EncodeLabel,
-    Imputer,
-)
+# modules depending on heavy optional libraries (scikit-learn, nltk) are only
+# imported when one of their members is first accessed; see __getattr__
+_LAZY_MODULE_MEMBERS = {
+    "skintegrate": [],
+    "sklearn_stages": [
+        "Encode",
+        "Scale",
+        "SklearnColumnTransform",
+        "TfidfVectorizeTokenLists",
+        "Decompose",
+        "EncodeLabel",
+        "Imputer",
+    ],
+    "nltk_stages": [
+        "TokenizeText",
+        "UntokenizeText",
+        "RemoveStopwords",
+        "SnowballStem",
+        "DropRareTokens",
+    ],
+}
+
+_LAZY_ATTRIBUTES = {}
+for _module_name, _member_names in _LAZY_MODULE_MEMBERS.items():
+    _LAZY_ATTRIBUTES[_module_name] = (_module_name, None)
+    for _member_name in _member_names:
+        _LAZY_ATTRIBUTES[_member_name] = (_module_name, _member_name)
+    core.__register_lazy_stage_attributes__(
+        f"pdpipe.{_module_name}", _member_names
+    )
+del _module_name, _member_names, _member_name
+
+
+def __getattr__(name):
+    try:
+        module_name, member_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(
+            f"module 'pdpipe' has no attribute '{name}'"
+        ) from None
+    module_obj = _import_module(f"pdpipe.{module_name}")
+    if member_name is None:
+        value = module_obj
+    else:
+        value = getattr(module_obj, member_name)
+    globals()[name] = value
+    return value
+
 
-core.__load_stage_attributes_from_module__("pdpipe.sklearn_stages")
+def __dir__():
+    return sorted(set(globals()).union(_LAZY_ATTRIBUTES))
 
 
 __all__ = [
@@ -130,6 +171,7 @@ __all__ = [
     "Log",
     "text_stages",
     "RegexReplace",
+    "MultiRegexReplace",
     "DropTokensByLength",
     "DropTokensByList",
     "lbl",
@@ -157,22 +199,12 @@ __all__ = [
 ]
 
 
-from . import nltk_stages
-from .nltk_stages import (
-    TokenizeText,
-    UntokenizeText,
-    RemoveStopwords,
-    SnowballStem,
-    DropRareTokens,
-)
-
-core.__load_stage_attributes_from_module__("pdpipe.nltk_stages")
-
 from . import run_time_parameters
 from .run_time_parameters import contextual, dynamic
 
 from .df import DF_HANDLE as df
 
+from . import frame_stats
 from . import cq
 from . import rq
 from . import cond
@@ -183,6 +215,7 @@ __all__.extend(
         "dynamic",
         "contextual",
         "df",
+        "frame_stats",
         "cq",
         "rq",
         "cond",
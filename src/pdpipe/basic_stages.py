@@ -3,19 +3,26 @@
 from collections import deque
 from typing import Callable, Dict, List, Optional, Union
 
+import numpy
 import pandas
 from strct.dicts import reverse_dict_partial
 
 import pdpipe.cond as cond
-from pdpipe.core import ColumnsBasedPipelineStage, PdPipelineStage
+from pdpipe.core import (
+    ColumnsBasedPipelineStage,
+    PdPipelineStage,
+    _RowFilterStage,
+)
 from pdpipe.cq import ColumnQualifier
 from pdpipe.exceptions import FailedConditionError
+from pdpipe.rq import RowQualifier
 from pdpipe.pdp_types import ColumnsParamType
 
 # from pdpipe.util import out_of_place_col_insert
 from pdpipe.shared import (
     _interpret_columns_param,
     _list_str,
+    _ValueSet,
 )
 
 
@@ -80,7 +87,26 @@ class ColDrop(ColumnsBasedPipelineStage):
         return X.drop(to_drop, axis=1, errors=self._errors)
 
 
-class ValDrop(ColumnsBasedPipelineStage):
+class _ValueFilterStage(_RowFilterStage, ColumnsBasedPipelineStage):
+    """A base class for stages filtering rows by the values in columns."""
+
+    def _is_fusable_row_filter(self) -> bool:
+        return (
+            super()._is_fusable_row_filter()
+            and self._row_independent_columns(self._col_arg)
+            and self._row_independent_columns(self._exclude_columns)
+        )
+
+    def _get_value_set(self) -> _ValueSet:
+        # values might be swapped by dynamic or contextual parameters
+        value_set = getattr(self, "_value_set", None)
+        if value_set is None or value_set.values is not self._values:
+            value_set = _ValueSet(self._values)
+            self._value_set = value_set
+        return value_set
+
+
+class ValDrop(_ValueFilterStage):
     """A pipeline stage that drops rows by value.
 
     Parameters
@@ -132,23 +158,26 @@ class ValDrop(ColumnsBasedPipelineStage):
         super_kwargs["none_columns"] = "all"
         super().__init__(**super_kwargs)
 
+    def _row_mask(self, X, keep, fit):
+        mask = numpy.ones(len(X), dtype=bool)
+        for col in self._get_columns(X, fit=fit):
+            mask[self._get_value_set().isin(X[col])] = False
+        return self._and_masks(keep, mask)
+
     def _transformation(
         self,
         X: pandas.DataFrame,
         verbose: bool,
         fit: bool,
     ) -> pandas.DataFrame:
-        inter_X = X
-        before_count = len(inter_X)
-        columns_to_check = self._get_columns(X, fit=fit)
-        for col in columns_to_check:
-            inter_X = inter_X[~inter_X[col].isin(self._values)]
+        before_count = len(X)
+        inter_X = self._filter_rows(X, fit=fit)
         if verbose:
             print(f"{before_count - len(inter_X)} rows dropped.")
         return inter_X
 
 
-class ValKeep(ColumnsBasedPipelineStage):
+class ValKeep(_ValueFilterStage):
     """A pipeline stage that keeps rows by value.
 
     Parameters
@@ -200,12 +229,15 @@ class ValKeep(ColumnsBasedPipelineStage):
         super_kwargs["none_columns"] = "all"
         super().__init__(**super_kwargs)
 
+    def _row_mask(self, X, keep, fit):
+        mask = numpy.ones(len(X), dtype=bool)
+        for col in self._get_columns(X, fit=fit):
+            mask[~self._get_value_set().isin(X[col])] = False
+        return self._and_masks(keep, mask)
+
     def _transformation(self, X, verbose, fit):
-        inter_X = X
-        before_count = len(inter_X)
-        columns_to_check = self._get_columns(X, fit=fit)
-        for col in columns_to_check:
-            inter_X = inter_X[inter_X[col].isin(self._values)]
+        before_count = len(X)
+        inter_X = self._filter_rows(X, fit=fit)
         if verbose:
             print(f"{before_count - len(inter_X)} rows dropped.")
         return inter_X
@@ -284,7 +316,7 @@ class ColRename(PdPipelineStage):
         return X.rename(columns=self._rename_mapper)
 
 
-class DropNa(PdPipelineStage):
+class DropNa(_RowFilterStage, PdPipelineStage):
     """A pipeline stage that drops null values.
 
     Supports all parameter supported by pandas.dropna function.
@@ -322,6 +354,32 @@ class DropNa(PdPipelineStage):
     def _prec(self, X):
         return True
 
+    def _is_fusable_row_filter(self) -> bool:
+        kwargs = self._dropna_kwargs
+        return (
+            super()._is_fusable_row_filter()
+            and kwargs.get("axis", 0) in (0, "index")
+            and not kwargs.get("inplace")
+            # pandas refuses both, so let it raise
+            and not ("how" in kwargs and "thresh" in kwargs)
+        )
+
+    def _row_mask(self, X, keep, fit):
+        subset = self._dropna_kwargs.get("subset")
+        if subset is not None:
+            if isinstance(subset, str) or not hasattr(subset, "__iter__"):
+                subset = [subset]
+            X = X[list(subset)]
+        notna = X.notna().to_numpy()
+        thresh = self._dropna_kwargs.get("thresh")
+        if thresh is not None:
+            mask = notna.sum(axis=1) >= thresh
+        elif self._dropna_kwargs.get("how", "any") == "all":
+            mask = notna.any(axis=1)
+        else:
+            mask = notna.all(axis=1)
+        return self._and_masks(keep, mask)
+
     def _transform(self, X, verbose):
         before_count = len(X)
         ncols_before = len(X.columns)
@@ -385,7 +443,7 @@ class SetIndex(PdPipelineStage):
         return X.set_index(keys=self._keys, **self._setindex_kwargs)
 
 
-class FreqDrop(PdPipelineStage):
+class FreqDrop(_RowFilterStage, PdPipelineStage):
     """A pipeline stage that drops rows by value frequency.
 
     Parameters
@@ -429,12 +487,19 @@ class FreqDrop(PdPipelineStage):
     def _prec(self, X):
         return self._column in X.columns
 
-    def _transform(self, X, verbose):
-        inter_X = X
-        before_count = len(inter_X)
-        valcount = X[self._column].value_counts()
+    def _row_mask(self, X, keep, fit):
+        column = X[self._column]
+        # frequencies are counted over the rows kept by preceding stages
+        counted = column if keep is None else column[keep]
+        valcount = counted.value_counts()
         to_drop = valcount[valcount < self._threshold].index
-        inter_X = inter_X[~inter_X[self._column].isin(to_drop)]
+        return self._and_masks(
+            keep, ~column.isin(to_drop).to_numpy(dtype=bool)
+        )
+
+    def _transform(self, X, verbose):
+        before_count = len(X)
+        inter_X = self._filter_rows(X, fit=False)
         if verbose:
             print(f"{before_count - len(inter_X)} rows dropped.")
         return inter_X
@@ -496,18 +561,22 @@ class ColReorder(PdPipelineStage):
             raise ValueError(f"Bad positions mapping given: {new_columns}")
 
 
-class RowDrop(ColumnsBasedPipelineStage):
+class RowDrop(_RowFilterStage, ColumnsBasedPipelineStage):
     """A pipeline stage that drops rows by callable conditions.
 
     Parameters
     ----------
     conditions : list-like or dict
         The list of conditions that make a row eligible to be dropped. Each
-        condition must be a callable that take a cell value and return a bool
-        value. If a list of callables is given, the conditions are checked for
-        each column value of each row. If a dict mapping column labels to
-        callables is given, then each condition is only checked for the column
-        values of the designated column.
+        condition must be a callable that either takes a cell value and
+        returns a bool value, or takes a column series and returns a boolean
+        series (see the `vectorized` parameter). If a list of callables is
+        given, the conditions are checked for each column value of each row.
+        If a dict mapping column labels to callables is given, then each
+        condition is only checked for the column values of the designated
+        column. Row qualifiers (see `pdpipe.rq`) can also be given as
+        conditions, in which case they are applied to input dataframes as a
+        whole.
     reduce : 'any', 'all' or 'xor', default 'any'
         Determines how row conditions are reduced. If set to 'all', a row must
         satisfy all given conditions to be dropped. If set to 'any', rows
@@ -528,6 +597,14 @@ class RowDrop(ColumnsBasedPipelineStage):
         `columns` parameter. Alternatively, this parameter can be assigned a
         callable returning a labels iterable from an input pandas.DataFrame.
         See `pdpipe.cq`. Optional. By default no columns are excluded.
+    vectorized : bool or 'auto', default False
+        If True, conditions are called with whole column series, and are
+        expected to return boolean series. If False, the default, they are
+        called with each cell value. If set to 'auto', each condition is first
+        called with the whole column series; its result is used if it is a
+        boolean series agreeing with calling the condition on the first few
+        cell values, and the condition is otherwise called with each cell
+        value.
     **kwargs : object
         All PdPipelineStage constructor parameters are supported.
 
@@ -543,10 +620,23 @@ class RowDrop(ColumnsBasedPipelineStage):
        a   b
     1  1   4
     3  5  11
+    >>> pdp.RowDrop([lambda s: s.between(3, 4)], vectorized=True).apply(df)
+       a   b
+    3  5  11
 
     """
 
     _REDUCERS = {"all": all, "any": any, "xor": lambda x: sum(x) == 1}
+    _MASK_REDUCERS = {
+        "all": lambda masks: masks.all(axis=1),
+        "any": lambda masks: masks.any(axis=1),
+        "xor": lambda masks: masks.sum(axis=1) == 1,
+    }
+    # the number of cell values vectorized results are checked against
+    _N_PROBE_VALUES = 8
+
+    # stages pickled by earlier versions of pdpipe hold one of these as their
+    # row condition, so they are kept for such stages to be unpickled
 
     class _DictRowCond(object):
         """Filter rows by a dict of conditions."""
@@ -570,24 +660,13 @@ class RowDrop(ColumnsBasedPipelineStage):
             res = [self.reducer(row.apply(cond)) for cond in self.conditions]
             return self.reducer(res)
 
-    def _row_condition_builder(self, conditions, reduce):
-        reducer = RowDrop._REDUCERS[reduce]
-        if self._cond_is_dict:
-            row_cond = RowDrop._DictRowCond(
-                conditions=conditions, reducer=reducer
-            )
-        else:
-            row_cond = RowDrop._ListRowCond(
-                conditions=conditions, reducer=reducer
-            )
-        return row_cond
-
     def __init__(
         self,
         conditions: Union[List[object], Dict[object, object]],
         reduce: str = None,
         columns: ColumnsParamType = None,
         exclude_columns: ColumnsParamType = None,
+        vectorized: Union[bool, str] = False,
         **kwargs: object,
     ):
         self._conditions = conditions
@@ -601,6 +680,12 @@ class RowDrop(ColumnsBasedPipelineStage):
                     " of the RowDrop constructor!"
                 ).format(reduce)
             )
+        if vectorized not in (True, False, "auto"):
+            raise ValueError(
+                "The 'vectorized' parameter of the RowDrop constructor must "
+                f"be True, False or 'auto', not {vectorized!r}!"
+            )
+        self._vectorized = vectorized
         self._cond_is_dict = isinstance(conditions, dict)
         if self._cond_is_dict:
             valid = all([callable(cond) for cond in conditions.values()])
@@ -615,7 +700,6 @@ class RowDrop(ColumnsBasedPipelineStage):
                 raise ValueError(
                     "RowDrop condition lists can contain only callables!"
                 )
-        self._row_cond = self._row_condition_builder(conditions, reduce)
         super_kwargs = {
             "columns": columns,
             "exclude_columns": exclude_columns,
@@ -625,12 +709,105 @@ class RowDrop(ColumnsBasedPipelineStage):
         super_kwargs["none_columns"] = "all"
         super().__init__(**super_kwargs)
 
+    def _cell_mask(self, cond, series):
+        values = series.tolist()
+        return numpy.fromiter(
+            (bool(cond(value)) for value in values),
+            dtype=bool,
+            count=len(values),
+        )
+
+    def _vector_mask(self, cond, series):
+        """Return the result of a vectorized condition, or None if invalid."""
+        try:
+            res = cond(series)
+        except Exception:  # pylint: disable=broad-except
+            return None
+        if isinstance(res, pandas.Series):
+            if not res.index.equals(series.index):
+                return None
+            res = res.to_numpy()
+        if (
+            not isinstance(res, numpy.ndarray)
+            or res.dtype != bool
+            or res.shape != (len(series),)
+        ):
+            return None
+        return res
+
+    def _series_mask(self, cond, series):
+        vectorized = getattr(self, "_vectorized", False)
+        if vectorized is False:
+            return self._cell_mask(cond, series)
+        if vectorized is True:
+            res = cond(series)
+            if isinstance(res, pandas.Series):
+                res = res.to_numpy()
+            return numpy.asarray(res, dtype=bool)
+        res = self._vector_mask(cond, series)
+        if res is None:
+            return self._cell_mask(cond, series)
+        # a cell condition may still return a boolean series when given a
+        # whole series; make sure it means the same
+        for value, vector_value in zip(
+            series.iloc[: self._N_PROBE_VALUES].tolist(), res
+        ):
+            try:
+                cell_value = bool(cond(value))
+            except Exception:  # pylint: disable=broad-except
+                # not a cell condition, then
+                return res
+            if cell_value != vector_value:
+                return self._cell_mask(cond, series)
+        return res
+
+    def _condition_mask(self, cond, X, columns):
+        if isinstance(cond, RowQualifier):
+            return numpy.array(cond(X), dtype=bool)
+        masks = numpy.empty((len(X), len(columns)), dtype=bool)
+        for i, lbl in enumerate(columns):
+            masks[:, i] = self._series_mask(cond, X[lbl])
+        return RowDrop._MASK_REDUCERS[self._reduce](masks)
+
+    def _is_fusable_row_filter(self) -> bool:
+        # vectorized conditions might depend on the rows of whole columns
+        return (
+            super()._is_fusable_row_filter()
+            and getattr(self, "_vectorized", False) is False
+            and not any(
+                isinstance(cond, RowQualifier) for cond in self._cond_list()
+            )
+            and self._row_independent_columns(self._col_arg)
+            and self._row_independent_columns(self._exclude_columns)
+        )
+
+    def _cond_list(self):
+        if self._cond_is_dict:
+            return list(self._conditions.values())
+        return list(self._conditions)
+
+    def _row_mask(self, X, keep, fit):
+        columns = self._get_columns(X, fit=fit)
+        if self._cond_is_dict:
+            masks = [
+                self._condition_mask(cond, X, [lbl])
+                for lbl, cond in self._conditions.items()
+            ]
+        else:
+            masks = [
+                self._condition_mask(cond, X, columns)
+                for cond in self._conditions
+            ]
+        drop = RowDrop._MASK_REDUCERS[self._reduce](
+            numpy.column_stack(masks)
+            if masks
+            else numpy.empty((len(X), 0), dtype=bool)
+        )
+        return self._and_masks(keep, ~drop)
+
     def _transformation(self, X, verbose, fit):
         before_count = len(X)
-        columns = self._get_columns(X, fit=fit)
-        subX = X[columns]
-        drop_index = ~subX.apply(self._row_cond, axis=1)
-        inter_X = X[drop_index]
+        inter_X = self._filter_rows(X, fit=fit)
         if verbose:
             print(f"{before_count - len(inter_X)} rows dropped.")
         return inter_X
@@ -57,6 +57,156 @@ def _effective_n_jobs(n_jobs):
     return n_jobs
 
 
+_MEMOIZE_MODES = (None, "unique")
+
+
+def _check_memoize(memoize: Optional[str]) -> Optional[str]:
+    if memoize not in _MEMOIZE_MODES:
+        raise ValueError(f"memoize must be None or 'unique', not {memoize!r}.")
+    return memoize
+
+
+def _apply_by_unique(
+    series: pd.Series,
+    func: Callable,
+    args: tuple = (),
+    kwargs: Optional[dict] = None,
+) -> Optional[pd.Series]:
+    """Apply an element-wise function once per distinct value of a series.
+
+    The series is factorized, the function is applied to each of its distinct
+    values - missing values included - and the results are broadcast back by
+    the factorization codes, so equal values share the same result object.
+    Returns None if the values of the series are not hashable, or if they are
+    objects of mixed types or missing values, which factorization would merge
+    when equal - like 1, True and 1.0, or None and NaN.
+
+    """
+    if kwargs is None:
+        kwargs = {}
+    if series.dtype == object and (
+        series.hasnans
+        or pd.api.types.infer_dtype(series, skipna=False).startswith("mixed")
+    ):
+        return None
+    try:
+        codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    except TypeError:
+        return None
+    results = np.empty(len(uniques), dtype=object)
+    for i, value in enumerate(uniques):
+        results[i] = func(value, *args, **kwargs)
+    # inferred as Series.apply infers the dtype of its results
+    values = pd.Series(results).infer_objects().array.take(codes)
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def _transformed_layout(
+    labels: pd.Index,
+    columns: list,
+    result_columns: list,
+    drop: bool,
+) -> Optional[list]:
+    """Return the column labels of a dataframe with transformed columns.
+
+    Transformed columns are inserted - as if one by one - right after their
+    source columns, replacing them if drop is True, and replacing existing
+    columns of the same label. Returns None if labels are not unique strings,
+    in which case columns should be inserted one by one.
+
+    """
+    if not labels.is_unique:
+        return None
+    if not all(isinstance(lbl, str) for lbl in result_columns):
+        return None
+    layout = list(labels)
+    for source, result in zip(columns, result_columns):
+        loc = labels.get_loc(source) + 1
+        if drop:
+            if source not in layout:
+                return None
+            layout.remove(source)
+            loc -= 1
+        if result in layout:
+            layout.remove(result)
+        layout.insert(loc, result)
+    return layout
+
+
+def _assemble_transformed(
+    X: pd.DataFrame,
+    layout: list,
+    transformed: pd.DataFrame,
+) -> pd.DataFrame:
+    """Assemble a dataframe from the columns of X and transformed columns.
+
+    Columns of the given layout are taken from the transformed dataframe
+    where it has them - its last column of each label - and from X otherwise.
+
+    """
+    transformed = transformed.loc[
+        :, ~transformed.columns.duplicated(keep="last")
+    ]
+    new_labels = set(transformed.columns)
+    kept = [lbl for lbl in layout if lbl not in new_labels]
+    res = pd.concat([X[kept], transformed], axis=1)
+    return res[layout]
+
+
+def _dtype_groups(X: pd.DataFrame, columns: list) -> list:
+    """Return lists of positions in columns of columns of the same dtype."""
+    groups = {}
+    for i, dtype in enumerate(X[columns].dtypes):
+        groups.setdefault(dtype, []).append(i)
+    return list(groups.values())
+
+
+class _DictLookup(object):
+    """A dict map, precompiled into a hash index of its keys.
+
+    Series are mapped by it as by pandas.Series.map(), which converts dict
+    maps into a series indexed by their keys on every call. Here, this is
+    done just once, and the hash table of the index is reused by all later
+    lookups. Maps with missing-value keys are left to pandas, which matches
+    missing values in ways an index lookup does not.
+
+    """
+
+    def __init__(self, mapping: dict) -> None:
+        self.mapping = mapping
+        if len(mapping) == 0:
+            self.lookup = pd.Series(mapping, dtype=np.float64)
+        else:
+            self.lookup = pd.Series(
+                list(mapping.values()),
+                index=pd.Index(list(mapping.keys()), tupleize_cols=False),
+            )
+        self.has_na = bool(self.lookup.index.hasnans)
+
+    @staticmethod
+    def supports(mapping: object, series: pd.Series) -> bool:
+        """Return True if the given map can map the given series."""
+        return (
+            isinstance(mapping, dict)
+            # dicts with default values are mapped by lookups
+            and not hasattr(mapping, "__missing__")
+            # categoricals are mapped by category, and masked arrays
+            # match missing values differently
+            and (
+                isinstance(series.dtype, np.dtype)
+                or isinstance(series.dtype, pd.StringDtype)
+            )
+        )
+
+    def map(self, series: pd.Series) -> pd.Series:
+        """Map the values of the given series."""
+        indexer = self.lookup.index.get_indexer(series)
+        values = pd.api.extensions.take(
+            self.lookup.array, indexer, allow_fill=True
+        )
+        return pd.Series(values, index=series.index, name=series.name)
+
+
 class Bin(PdPipelineStage):
     """A pipeline stage that adds a binned version of a column or columns.
 
@@ -411,6 +561,18 @@ class ColumnTransformer(ColumnsBasedPipelineStage):
     ) -> pd.Series:
         raise NotImplementedError
 
+    def _block_transform(
+        self, X: pd.DataFrame, columns: list
+    ) -> Optional[pd.DataFrame]:
+        """Transform the given columns of a dataframe all at once.
+
+        Subclasses able to transform all columns at once should override
+        this method, returning a dataframe of the transformed columns, in
+        order, or None if they should be transformed one by one.
+
+        """
+        return None
+
     def _get_result_columns(self, columns):
         if self._result_columns is not None:
             return self._result_columns
@@ -440,6 +602,14 @@ class ColumnTransformer(ColumnsBasedPipelineStage):
     def _transformation(self, X, verbose, fit):
         columns = self._get_columns(X, fit=fit)
         result_columns = self._get_result_columns(columns)
+        layout = _transformed_layout(
+            X.columns, columns, result_columns, self._drop
+        )
+        if layout is not None:
+            transformed = self._block_transform(X, columns)
+            if transformed is not None:
+                transformed.columns = result_columns
+                return _assemble_transformed(X, layout, transformed)
         inter_X = X
         for i, colname in enumerate(columns):
             source_col = X[colname]
@@ -529,6 +699,14 @@ class MapColVals(ColumnTransformer):
         If set to True, source columns are dropped after being mapped.
     suffix : str, default '_map'
         The suffix mapped columns gain if no new column labels are given.
+    memoize : 'unique', optional
+        If set to 'unique', a callable, attribute or method map is applied
+        just once per distinct value of each column, and its results are
+        broadcast to all rows holding that value; equal values thus share the
+        same result object, and values that compare equal, like 0.0 and -0.0,
+        are mapped as one. Object columns of mixed types or with missing
+        values are mapped row by row. Well suited to low-cardinality columns.
+        Columns of the category dtype are always mapped once per category.
     **kwargs : object
         All PdPipelineStage constructor parameters are supported.
 
@@ -568,9 +746,11 @@ class MapColVals(ColumnTransformer):
         result_columns: Optional[ColumnLabelsType] = None,
         drop: Optional[bool] = True,
         suffix: Optional[str] = None,
+        memoize: Optional[str] = None,
         **kwargs: Dict[str, object],
     ):
         self._value_map = value_map
+        self._memoize = _check_memoize(memoize)
         self._applied_value_map = value_map
         if isinstance(value_map, str):
             self._applied_value_map = _AttrGetter(attr_name=value_map)
@@ -593,7 +773,37 @@ class MapColVals(ColumnTransformer):
         super().__init__(**super_kwargs)
 
     def _col_transform(self, series, label):
-        return series.map(self._applied_value_map)
+        value_map = self._applied_value_map
+        if (
+            getattr(self, "_memoize", None) == "unique"
+            and callable(value_map)
+            and not isinstance(value_map, pd.Series)
+            # pandas already maps categoricals by category
+            and not isinstance(series.dtype, pd.CategoricalDtype)
+        ):
+            res = _apply_by_unique(series, value_map)
+            if res is not None:
+                return res
+        if _DictLookup.supports(value_map, series):
+            lookup = self._get_dict_lookup(value_map)
+            # lookups pickled by earlier versions might have missing keys
+            if not getattr(lookup, "has_na", True):
+                return lookup.map(series)
+        return series.map(value_map)
+
+    def _transformation(self, X, verbose, fit):
+        if fit:
+            # maps might have been modified in place since the last fit
+            self._dict_lookup = None
+        return super()._transformation(X=X, verbose=verbose, fit=fit)
+
+    def _get_dict_lookup(self, value_map: dict) -> _DictLookup:
+        lookup = getattr(self, "_dict_lookup", None)
+        # maps might be swapped by contextual parameters
+        if lookup is None or lookup.mapping is not value_map:
+            lookup = _DictLookup(value_map)
+            self._dict_lookup = lookup
+        return lookup
 
 
 class ApplyToRows(PdPipelineStage):
@@ -776,6 +986,25 @@ class ApplyByCols(ColumnTransformer):
         suited for functions that release the GIL or spend time on I/O.
         Functions should not depend on shared mutable state or call ordering
         when parallel execution is enabled.
+    memoize : 'unique', optional
+        If set to 'unique', the function is applied just once per distinct
+        value of each column, and its results are broadcast to all rows
+        holding that value; equal values thus share the same result object,
+        and values that compare equal, like 0.0 and -0.0, are transformed as
+        one. Object columns of mixed types or with missing values are
+        transformed row by row. Well suited to low-cardinality columns.
+        Columns of the category dtype are always transformed once per
+        category.
+    vectorized : bool or 'auto', default False
+        If True, func is called once with each whole column series instead of
+        with each of its values, and is expected to return a series of the
+        same index. If set to 'auto', func is first called with the whole
+        column series; its result is used if it is a series of the same index,
+        or an array of the same length, agreeing with calling func on the first
+        few values of the column, and func is otherwise called with each
+        value. The outcome is cached per column on fit and reused on later
+        transforms. The dtype of vectorized results may differ from that of
+        element-wise ones; e.g. integer-valued floats.
     **kwargs : dict, optional
         Additional keyword arguments to pass as keywords arguments to func.
         Valid constructor parameters of superclasses are extracted and used
@@ -784,6 +1013,7 @@ class ApplyByCols(ColumnTransformer):
     Examples
     --------
     >>> import pandas as pd; import pdpipe as pdp; import math;
+    >>> import numpy as np;
     >>> data = [[3.2, "acd"], [7.2, "alk"], [12.1, "alk"]]
     >>> df = pd.DataFrame(data, [1,2,3], ["ph","lbl"])
     >>> round_ph = pdp.ApplyByCols("ph", math.ceil)
@@ -792,9 +1022,17 @@ class ApplyByCols(ColumnTransformer):
     1   4  acd
     2   8  alk
     3  13  alk
+    >>> pdp.ApplyByCols("ph", np.ceil, vectorized="auto")(df)
+         ph  lbl
+    1   4.0  acd
+    2   8.0  alk
+    3  13.0  alk
 
     """
 
+    # the number of values vectorized results are checked against
+    _N_PROBE_VALUES = 8
+
     def __init__(
         self,
         columns,
@@ -805,10 +1043,21 @@ class ApplyByCols(ColumnTransformer):
         suffix=None,
         args=(),
         n_jobs=None,
+        memoize=None,
+        vectorized=False,
         **kwargs,
     ):
+        if vectorized not in (True, False, "auto"):
+            raise ValueError(
+                "vectorized must be True, False or 'auto', not "
+                f"{vectorized!r}."
+            )
         self._func = func
         self._n_jobs = n_jobs
+        self._memoize = _check_memoize(memoize)
+        self._vectorized = vectorized
+        # column label to whether func is applied to it as a whole
+        self._vectorized_choice = {}
         self._inject_label = False
         self._inject_fit_context = False
         self._inject_application_context = False
@@ -887,8 +1136,82 @@ class ApplyByCols(ColumnTransformer):
             kwargs["application_context"] = (
                 application_context or self.application_context
             )
+        res = self._vectorized_result(series, label, kwargs)
+        if res is not None:
+            return res
+        if getattr(self, "_memoize", None) == "unique" and not isinstance(
+            series.dtype, pd.CategoricalDtype
+        ):
+            res = _apply_by_unique(series, self._func, self._args, kwargs)
+            if res is not None:
+                return res
         return series.apply(self._func, args=self._args, **kwargs)
 
+    def _vector_transform(self, series, kwargs):
+        """Call func with a whole series, or return None if it fails."""
+        try:
+            res = self._func(series, *self._args, **kwargs)
+        except Exception:  # pylint: disable=broad-except
+            return None
+        if isinstance(res, pd.Series):
+            if not res.index.equals(series.index):
+                return None
+            return res.rename(series.name)
+        if np.ndim(res) != 1 or len(res) != len(series):
+            return None
+        return pd.Series(res, index=series.index, name=series.name)
+
+    @staticmethod
+    def _probe_values_match(value, vector_value):
+        try:
+            if bool(pd.isna(value)) and bool(pd.isna(vector_value)):
+                return True
+        except (TypeError, ValueError):
+            pass
+        try:
+            if bool(value == vector_value):
+                return True
+        except Exception:  # pylint: disable=broad-except
+            return False
+        try:
+            # vectorized floating point math may differ in the last bits
+            return bool(np.isclose(value, vector_value, rtol=1e-12, atol=0))
+        except TypeError:
+            return False
+
+    def _vectorized_result(self, series, label, kwargs):
+        """Return the vectorized transformation of a series, if one is used."""
+        vectorized = getattr(self, "_vectorized", False)
+        if vectorized is False:
+            return None
+        if vectorized is True:
+            res = self._func(series, *self._args, **kwargs)
+            if isinstance(res, pd.Series):
+                return res.rename(series.name)
+            return pd.Series(res, index=series.index, name=series.name)
+        choices = self._vectorized_choice
+        if label in choices and not self._is_being_fitted:
+            if choices[label]:
+                return self._vector_transform(series, kwargs)
+            return None
+        if len(series) == 0:
+            # nothing to check results against
+            return None
+        res = self._vector_transform(series, kwargs)
+        if res is not None:
+            sample = series.iloc[: self._N_PROBE_VALUES].tolist()
+            for value, vector_value in zip(sample, res.tolist()):
+                try:
+                    cell_value = self._func(value, *self._args, **kwargs)
+                except Exception:  # pylint: disable=broad-except
+                    # not an element-wise function, then
+                    break
+                if not self._probe_values_match(cell_value, vector_value):
+                    res = None
+                    break
+        choices[label] = res is not None
+        return res
+
 
 class TransformByCols(ColumnTransformer):
     """A pipeline stage applying a series-wise function to columns w/
@@ -1043,6 +1366,13 @@ class Diff(ColumnTransformer):
     def _col_transform(self, series, label):
         return series.diff(periods=self._periods)
 
+    def _block_transform(self, X, columns):
+        try:
+            return X[columns].diff(periods=self._periods)
+        except Exception:  # pylint: disable=broad-except
+            # raised again, column by column
+            return None
+
 
 class ColByFrameFunc(PdPipelineStage):
     """A pipeline stage adding a column by applying a dataframe-wide function.
@@ -1232,6 +1562,61 @@ class AggByCols(ColumnTransformer):
     def _col_transform(self, series, label):
         return series.agg(self._func)
 
+    def _block_transform(self, X, columns):
+        # callables are called with each column by DataFrame.agg anyway
+        if not isinstance(self._func, str):
+            return None
+        subset = X[columns]
+        results = [None] * len(columns)
+        # aggregated by dtype, so results aren't upcast to a common dtype
+        for positions in _dtype_groups(X, columns):
+            group = subset.iloc[:, positions]
+            if not isinstance(group.dtypes.iloc[0], np.dtype):
+                # extension arrays might be aggregated differently by frames
+                for pos in positions:
+                    res = self._broadcast(
+                        self._col_transform(subset.iloc[:, pos], None), X
+                    )
+                    if res is None:
+                        return None
+                    results[pos] = res
+                continue
+            try:
+                res = group.agg(self._func)
+            except Exception:  # pylint: disable=broad-except
+                # raised again, column by column
+                return None
+            if isinstance(res, pd.DataFrame):
+                if not (
+                    res.index.equals(X.index)
+                    and res.columns.equals(group.columns)
+                ):
+                    return None
+                for i, pos in enumerate(positions):
+                    results[pos] = res.iloc[:, i]
+            elif isinstance(res, pd.Series) and res.index.equals(
+                group.columns
+            ):
+                for i, pos in enumerate(positions):
+                    results[pos] = self._broadcast(res.iloc[i], X)
+                    if results[pos] is None:
+                        return None
+            else:
+                return None
+        return pd.concat(results, axis=1, ignore_index=True)
+
+    @staticmethod
+    def _broadcast(res, X):
+        """Return a column of the given aggregation result, if possible."""
+        if isinstance(res, pd.Series):
+            if res.index.equals(X.index):
+                return res
+            return None
+        if np.ndim(res) != 0:
+            return None
+        # broadcast, as by column assignment
+        return pd.Series(res, index=X.index)
+
 
 class Log(ColumnsBasedPipelineStage):
     """A pipeline stage that log-transforms numeric data.
@@ -1309,86 +1694,161 @@ class Log(ColumnsBasedPipelineStage):
     def _transformation(self, X, verbose, fit):
         raise NotImplementedError
 
-    def _fit_transform(self, X, verbose):
-        columns_to_transform = self._get_columns(X, fit=True)
-        if verbose:
-            columns_to_transform = tqdm(columns_to_transform)
-        inter_X = X
-        for colname in columns_to_transform:
-            source_col = X[colname]
-            loc = X.columns.get_loc(colname) + 1
-            new_name = colname + "_log"
-            if self._drop:
-                inter_X = inter_X.drop(colname, axis=1)
-                new_name = colname
-                loc -= 1
-            new_col = source_col
-            if self._non_neg:
+    def _log(self, values):
+        if self._suppress_warnings:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                return np.log(values)
+        return np.log(values)
+
+    def _shifted_log_column(self, series, colname, fit):
+        new_col = series
+        if self._non_neg:
+            if fit:
                 minval = min(new_col)
                 if minval < 0:
                     new_col = new_col + abs(minval)
                     self._col_to_minval[colname] = abs(minval)
                 else:
                     self._col_to_minval[colname] = 0
+            else:
+                new_col = new_col + self._col_to_minval[colname]
+        # must check not None as neg numbers eval to False
+        if self._const_shift is not None:
+            new_col = new_col + self._const_shift
+        return self._log(new_col)
+
+    def _fitted_min_values(self, block):
+        """Return the minimal values of the columns of a 2D array.
+
+        Matches the built-in min function, with which a column starting with
+        a NaN value has a NaN minimum, and other NaN values are ignored.
+
+        """
+        with warnings.catch_warnings():
+            # all-NaN columns
+            warnings.simplefilter("ignore", RuntimeWarning)
+            minvals = np.nanmin(block, axis=0)
+        if block.dtype.kind == "f":
+            minvals[np.isnan(block[0])] = np.nan
+        return minvals.tolist()
+
+    def _shifted_log_block(self, X, labels, fit):
+        """Log-transform numeric columns of the same numpy dtype at once."""
+        block = X[labels].to_numpy()
+        if fit and self._non_neg:
+            shifts = []
+            for colname, minval in zip(labels, self._fitted_min_values(block)):
+                if minval < 0:
+                    shifts.append(abs(minval))
+                    self._col_to_minval[colname] = abs(minval)
+                else:
+                    shifts.append(None)
+                    self._col_to_minval[colname] = 0
+        elif self._non_neg:
+            shifts = [self._col_to_minval[colname] for colname in labels]
+        else:
+            shifts = [None] * len(labels)
+        # columns are shifted as when shifted one by one by scalars, which
+        # might promote their dtypes differently
+        res = [None] * len(labels)
+        groups = {}
+        for i, shift in enumerate(shifts):
+            if shift is None:
+                groups.setdefault(None, []).append(i)
+            else:
+                dtype = np.result_type(block.dtype, shift)
+                groups.setdefault(dtype, []).append(i)
+        for dtype, positions in groups.items():
+            values = block[:, positions]
+            if dtype is not None:
+                values = values + np.array(
+                    [shifts[i] for i in positions], dtype=dtype
+                )
             # must check not None as neg numbers eval to False
             if self._const_shift is not None:
-                new_col = new_col + self._const_shift
-            if self._suppress_warnings:
-                with warnings.catch_warnings():
-                    warnings.simplefilter("ignore")
-                    new_col = np.log(new_col)
-            else:
-                new_col = np.log(new_col)
-            inter_X = out_of_place_col_insert(
-                X=inter_X, series=new_col, loc=loc, column_name=new_name
+                values = values + self._const_shift
+            values = self._log(values)
+            for i, pos in enumerate(positions):
+                res[pos] = pd.Series(
+                    values[:, i], index=X.index, name=labels[pos]
+                )
+        return res
+
+    def _log_transformation(self, X, columns, fit, verbose):
+        if self._drop:
+            result_columns = columns
+        else:
+            result_columns = [colname + "_log" for colname in columns]
+        layout = _transformed_layout(
+            X.columns, columns, result_columns, self._drop
+        )
+        if layout is None:
+            inter_X = X
+            names = zip(columns, result_columns)
+            if verbose:
+                names = tqdm(names, total=len(columns))
+            for colname, new_name in names:
+                loc = X.columns.get_loc(colname) + 1
+                if self._drop:
+                    inter_X = inter_X.drop(colname, axis=1)
+                    loc -= 1
+                new_col = self._shifted_log_column(X[colname], colname, fit)
+                inter_X = out_of_place_col_insert(
+                    X=inter_X, series=new_col, loc=loc, column_name=new_name
+                )
+            return inter_X
+        # numeric columns of numpy dtypes are transformed as 2D blocks
+        transformed = [None] * len(columns)
+        progress = tqdm(total=len(columns), disable=not verbose)
+        for positions in _dtype_groups(X, columns):
+            dtype = X[columns[positions[0]]].dtype
+            labels = [columns[i] for i in positions]
+            block_wise = (
+                isinstance(dtype, np.dtype)
+                and dtype.kind in "biuf"
+                and len(set(labels)) == len(labels)
+                # the built-in min of an empty column raises an error
+                and not (fit and self._non_neg and len(X) == 0)
             )
+            if block_wise:
+                new_cols = self._shifted_log_block(X, labels, fit)
+            else:
+                new_cols = [
+                    self._shifted_log_column(X[lbl], lbl, fit)
+                    for lbl in labels
+                ]
+            for pos, new_col in zip(positions, new_cols):
+                transformed[pos] = new_col
+            progress.update(len(positions))
+        progress.close()
+        transformed = pd.concat(transformed, axis=1, ignore_index=True)
+        transformed.columns = result_columns
+        return _assemble_transformed(X, layout, transformed)
+
+    def _fit_transform(self, X, verbose):
+        columns = self._get_columns(X, fit=True)
+        inter_X = self._log_transformation(
+            X, columns, fit=True, verbose=verbose
+        )
         self.is_fitted = True
         return inter_X
 
     def _transform(self, X, verbose):
-        inter_X = X
-        columns_to_transform = self._get_columns(X, fit=False)
-        if verbose:
-            columns_to_transform = tqdm(columns_to_transform)
-        for colname in columns_to_transform:
-            try:
-                source_col = X[colname]
-            except KeyError:  # pragma: no cover
+        columns = self._get_columns(X, fit=False)
+        for colname in columns:
+            if colname not in X.columns:  # pragma: no cover
                 raise PipelineApplicationError(
                     (
                         "Missig column {} when applying a fitted "
                         "Log pipeline stage by class {} !"
                     ).format(colname, self.__class__)
                 )
-            loc = X.columns.get_loc(colname) + 1
-            new_name = colname + "_log"
-            if self._drop:
-                inter_X = inter_X.drop(colname, axis=1)
-                new_name = colname
-                loc -= 1
-            new_col = source_col
-            if self._non_neg:
-                if colname in self._col_to_minval:
-                    absminval = self._col_to_minval[colname]
-                    new_col = new_col + absminval
-                else:  # pragma: no cover
-                    raise PipelineApplicationError(
-                        (
-                            "Missig fitted parameter for column {} when "
-                            "applying fitted Log pipeline stage by class {}!"
-                        ).format(colname, self.__class__)
-                    )
-            # must check not None as neg numbers eval to False
-            if self._const_shift is not None:
-                new_col = new_col + self._const_shift
-
-            if self._suppress_warnings:
-                with warnings.catch_warnings():
-                    warnings.simplefilter("ignore")
-                    new_col = np.log(new_col)
-            else:
-                new_col = np.log(new_col)
-            inter_X = out_of_place_col_insert(
-                X=inter_X, series=new_col, loc=loc, column_name=new_name
-            )
-        return inter_X
+            if self._non_neg and colname not in self._col_to_minval:
+                raise PipelineApplicationError(  # pragma: no cover
+                    (
+                        "Missig fitted parameter for column {} when "
+                        "applying fitted Log pipeline stage by class {}!"
+                    ).format(colname, self.__class__)
+                )
+        return self._log_transformation(X, columns, fit=False, verbose=verbose)
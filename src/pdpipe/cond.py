@@ -2,6 +2,7 @@
 
 import pandas
 
+from .frame_stats import frame_stats
 from .shared import _list_str
 
 
@@ -541,7 +542,7 @@ class HasAtMostMissingValues(Condition):
             self.n_missing = n_missing
 
         def __call__(self, X):
-            nmiss = X.isna().sum().sum()
+            nmiss = frame_stats(X).n_missing()
             return bool(nmiss <= self.n_missing)
 
     class _FloatMissingValuesFunc(object):
@@ -549,8 +550,8 @@ class HasAtMostMissingValues(Condition):
             self.n_missing = n_missing
 
         def __call__(self, X):
-            nmiss = X.isna().sum().sum()
-            return bool((nmiss / X.size) <= self.n_missing)
+            stats = frame_stats(X)
+            return bool((stats.n_missing() / stats.size) <= self.n_missing)
 
     def __init__(self, n_missing, **kwargs):
         self._n_missing = n_missing
@@ -4,8 +4,12 @@ import abc
 import collections
 import contextlib
 import copy
+import importlib
 import inspect
+import json
+import pickle
 import re
+import struct
 import sys
 import textwrap
 import time
@@ -25,7 +29,12 @@ except ImportError:
 from .cfg import (
     LOAD_STAGE_ATTRIBUTES,
 )
-from .cq import AllColumns, is_fittable_column_qualifier
+from .cq import (
+    AllColumns,
+    QualifierMemo,
+    is_fittable_column_qualifier,
+    qualifier_memo,
+)
 from .exceptions import (
     FailedPostconditionError,
     FailedPreconditionError,
@@ -68,17 +77,33 @@ def __load_stage_attribute__(class_obj: object) -> None:
     # setattr(class_obj, class_obj.__name__, unbound_method)
 
 
-def __load_stage_attributes_from_module__(module_name: object) -> None:
+# maps stage class names to the modules defining them; the corresponding
+# stage attributes are only attached to PdPipelineStage on first access
+_LAZY_STAGE_ATTRIBUTES = {}
+
+
+def __register_lazy_stage_attributes__(
+    module_name: str, class_names: Iterable[str]
+) -> None:
     if not LOAD_STAGE_ATTRIBUTES:
         return  # pragma: no cover
+    for class_name in class_names:
+        _LAZY_STAGE_ATTRIBUTES[class_name] = module_name
+
+
+def __register_lazy_stage_attributes_from_module__(module_name: str) -> None:
     module_obj = sys.modules[module_name]
-    for name, obj in inspect.getmembers(module_obj):
-        if inspect.isclass(obj) and obj.__module__ == module_name:
-            class_obj = getattr(module_obj, name)
-            if issubclass(class_obj, PdPipelineStage) and (
-                class_obj.__name__ != "PdPipelineStage"
-            ):
-                __load_stage_attribute__(class_obj)
+    __register_lazy_stage_attributes__(
+        module_name,
+        [
+            name
+            for name, obj in vars(module_obj).items()
+            if isinstance(obj, type)
+            and obj.__module__ == module_name
+            and issubclass(obj, PdPipelineStage)
+            and obj is not PdPipelineStage
+        ],
+    )
 
 
 # === basic classes ===
@@ -106,6 +131,8 @@ class PdpApplicationContext:
         self._locked = False
         self._fit_context = fit_context
         self._dict = {}
+        # column qualifier results, memoized over the application
+        self.qualifier_memo = QualifierMemo()
 
     def __getitem__(self, key: object) -> object:
         return self._dict[key]
@@ -268,9 +295,14 @@ class AppContextMgr:
         self.stage._is_being_applied = True
         if self.fit:
             self.stage._is_being_fitted = True
+        self._memo_mgr = qualifier_memo(
+            getattr(self.stage.application_context, "qualifier_memo", None)
+        )
+        self._memo_mgr.__enter__()
         return None
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self._memo_mgr.__exit__(exc_type, exc_val, exc_tb)
         self.stage._is_being_applied = False
         self.stage._is_being_fitted = False
 
@@ -1158,6 +1190,19 @@ class PdPipelineStage(abc.ABC):
                     return X, y
                 return X
 
+    def __getattr__(self, name):
+        # stage attributes (e.g. stage.ColDrop) are attached on first access,
+        # importing the module defining the stage class only then
+        try:
+            module_name = _LAZY_STAGE_ATTRIBUTES[name]
+        except KeyError:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            ) from None
+        module_obj = importlib.import_module(module_name)
+        __load_stage_attribute__(getattr(module_obj, name))
+        return getattr(self, name)
+
     def __add__(self, other):
         if isinstance(other, PdPipeline):
             return PdPipeline([self, *other._stages])
@@ -1393,6 +1438,202 @@ class ColumnsBasedPipelineStage(PdPipelineStage):
         return self._transformation(X, verbose, fit=False)
 
 
+class _RowFilterStage:
+    """A mixin for pipeline stages which only drop rows of input dataframes.
+
+    Such stages determine the rows to keep by a boolean mask. A pipeline
+    applies runs of consecutive row-filtering stages together: each stage
+    contributes its mask, and rows are dropped just once, after the last
+    stage of the run (see `_FusedRowFilters`).
+
+    """
+
+    def _row_mask(
+        self,
+        X: pandas.DataFrame,
+        keep: Optional[numpy.ndarray],
+        fit: bool,
+    ) -> numpy.ndarray:
+        """Return a boolean mask of the rows of the given dataframe to keep.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame
+            The input dataframe.
+        keep : numpy.ndarray, optional
+            A boolean mask of the rows of X kept by preceding stages, if any.
+            The returned mask must select the rows this stage would keep if
+            applied to `X[keep]`, out of the rows of X.
+        fit : bool
+            Whether this stage is being fitted.
+
+        Returns
+        -------
+        numpy.ndarray
+            A boolean mask of the rows of X to keep.
+
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _and_masks(
+        keep: Optional[numpy.ndarray],
+        mask: numpy.ndarray,
+    ) -> numpy.ndarray:
+        if keep is None:
+            return mask
+        return numpy.logical_and(keep, mask, out=mask)
+
+    @staticmethod
+    def _row_independent_columns(col_arg: object) -> bool:
+        # the resolution of column qualifiers other than AllColumns might
+        # depend on the rows dropped by preceding stages
+        return not callable(col_arg) or isinstance(col_arg, AllColumns)
+
+    def _is_fusable_row_filter(self) -> bool:
+        """Return True if this stage can be applied as part of a run."""
+        return _FusedStages._is_fusable(self)
+
+    def _filter_rows(self, X: pandas.DataFrame, fit: bool) -> pandas.DataFrame:
+        return X[self._row_mask(X, None, fit)]
+
+
+class _FusedStages:
+    """A run of consecutive stages of a pipeline, applied together.
+
+    Subclasses implement `_apply_stage`, applying a single stage of the run
+    to an intermediate state of it, and `_finish`, producing the output
+    dataframe of the run from its final state.
+
+    Parameters
+    ----------
+    stages : list of PdPipelineStage
+        The stages of the run.
+    start : int
+        The index of the first stage of the run in its pipeline.
+
+    """
+
+    def __init__(self, stages: list, start: int) -> None:
+        self.stages = stages
+        self.start = start
+        self.fit_context = None
+        self.application_context = None
+        self.failed = None
+
+    def __str__(self) -> str:
+        return ", ".join(str(stage) for stage in self.stages)
+
+    @staticmethod
+    def _is_fusable(stage) -> bool:
+        """Return True if the given stage can be applied as part of a run."""
+        return not (
+            stage._prec_arg
+            or stage._post_arg
+            or stage._skip
+            or stage._dynamics
+            or stage._contextual_params
+        )
+
+    @staticmethod
+    def _with_columns(X, columns: dict) -> pandas.DataFrame:
+        """Return a copy of X with the given columns, by label, replaced."""
+        res_X = X.copy(deep=False)
+        for label, series in columns.items():
+            res_X[label] = series
+        return res_X
+
+    def _run_stage(self, stage, X, y, state, exraise, verbose, fit):
+        with AppContextMgr(stage, fit=fit):
+            if exraise is None:
+                exraise = stage._exraise
+            if not stage._compound_prec(X, y, fit=fit):
+                if exraise:
+                    stage._raise_precondition_error()
+                return state, False
+            if not fit and stage._is_fittable() and not stage.is_fitted:
+                raise UnfittedPipelineStageError(
+                    "transform of an unfitted pipeline stage was called!"
+                )
+            if verbose:
+                msg = "- " + "\n  ".join(textwrap.wrap(stage._appmsg))
+                print(msg, flush=True)
+            state = self._apply_stage(stage, X, state, verbose, fit)
+            if fit:
+                stage.is_fitted = True
+            return state, exraise
+
+    def _apply_stage(self, stage, X, state, verbose, fit):
+        raise NotImplementedError
+
+    def _finish(self, X, y, state):
+        raise NotImplementedError
+
+    def _apply(self, X, y, exraise, verbose, fit):
+        if y is not None:
+            y = PdPipelineStage._cast_y_to_series(X, y)
+        state = None
+        to_post = []
+        for index, stage in enumerate(self.stages, self.start):
+            stage.fit_context = self.fit_context
+            stage.application_context = self.application_context
+            try:
+                state, check_post = self._run_stage(
+                    stage, X, y, state, exraise, verbose, fit
+                )
+            except Exception:
+                self.failed = (index, stage)
+                raise
+            finally:
+                stage.application_context = None
+            if check_post:
+                to_post.append((index, stage))
+        res_X, res_y = self._finish(X, y, state)
+        for index, stage in to_post:
+            if not stage._compound_post(X=res_X, y=res_y, fit=fit):
+                self.failed = (index, stage)
+                stage._raise_postcondition_error()
+        if y is not None:
+            return res_X, res_y
+        return res_X
+
+    def fit_transform(self, X, y=None, exraise=None, verbose=False):
+        return self._apply(X, y, exraise, verbose, fit=True)
+
+    def transform(self, X, y=None, exraise=None, verbose=False):
+        return self._apply(X, y, exraise, verbose, fit=False)
+
+
+class _FusedRowFilters(_FusedStages):
+    """A run of consecutive row-filtering stages of a pipeline, fused.
+
+    Each stage in the run contributes a boolean mask of rows to keep, computed
+    over the input dataframe of the run, given the rows already dropped by
+    preceding stages of the run. Rows are dropped just once, by the combined
+    mask, saving the intermediate copies of the dataframe.
+
+    Parameters
+    ----------
+    stages : list of PdPipelineStage
+        The stages of the run, all of which are row-filtering stages.
+    start : int
+        The index of the first stage of the run in its pipeline.
+
+    """
+
+    def _apply_stage(self, stage, X, keep, verbose, fit):
+        before_count = len(X) if keep is None else keep.sum()
+        keep = stage._row_mask(X, keep, fit)
+        if verbose:
+            print(f"{before_count - keep.sum()} rows dropped.")
+        return keep
+
+    def _finish(self, X, y, keep):
+        res_X = X if keep is None else X[keep]
+        res_y = y if (y is None or keep is None) else y[keep]
+        return res_X, res_y
+
+
 class AdHocStage(PdPipelineStage):
     """An ad-hoc stage of a pandas DataFrame-processing pipeline.
 
@@ -1491,6 +1732,93 @@ class AdHocStage(PdPipelineStage):
         return self._adhoc_transform(X, **kwargs)
 
 
+# === pipeline serialization ===
+
+_PIPELINE_FILE_MAGIC = b"PDPIPE\x00\x01"
+_PIPELINE_FILE_ALIGNMENT = 64
+# buffers smaller than this are kept inside the pickle payload
+_MIN_OUT_OF_BAND_NBYTES = 2**16
+_FOOTER_STRUCT = struct.Struct("<Q")
+
+
+def _padding(offset: int) -> int:
+    return -offset % _PIPELINE_FILE_ALIGNMENT
+
+
+def _write_pipeline_file(obj: object, path: str) -> None:
+    """Write an object to a pdpipe pipeline file.
+
+    The object graph is pickled with protocol 5, while every large contiguous
+    buffer (numpy arrays and the arrays backing pandas objects) is written
+    out-of-band, aligned, after the pickle payload. A JSON footer records the
+    offset and length of every segment.
+
+    """
+    buffers = []
+
+    def _buffer_callback(buf: pickle.PickleBuffer) -> bool:
+        if buf.raw().nbytes < _MIN_OUT_OF_BAND_NBYTES:
+            return True  # serialize in-band
+        buffers.append(buf)
+        return False
+
+    payload = pickle.dumps(obj, protocol=5, buffer_callback=_buffer_callback)
+    with open(path, "wb") as f:
+        f.write(_PIPELINE_FILE_MAGIC)
+        offset = len(_PIPELINE_FILE_MAGIC)
+
+        def _write_segment(data: memoryview) -> list:
+            nonlocal offset
+            pad = _padding(offset)
+            f.write(b"\x00" * pad)
+            offset += pad
+            segment = [offset, data.nbytes]
+            f.write(data)
+            offset += data.nbytes
+            return segment
+
+        header = {
+            "pickle": _write_segment(memoryview(payload)),
+            "buffers": [_write_segment(buf.raw()) for buf in buffers],
+        }
+        header_bytes = json.dumps(header).encode("utf-8")
+        f.write(header_bytes)
+        f.write(_FOOTER_STRUCT.pack(len(header_bytes)))
+        f.write(_PIPELINE_FILE_MAGIC)
+
+
+def _read_pipeline_file(path: str, mmap: bool) -> object:
+    """Read an object written by `_write_pipeline_file`.
+
+    If `mmap` is True, out-of-band buffers are backed by a copy-on-write
+    memory map of the file, so array data is only paged in when first used
+    and is shared between processes loading the same file.
+
+    """
+    if mmap:
+        data = numpy.memmap(path, dtype=numpy.uint8, mode="c")
+    else:
+        with open(path, "rb") as f:
+            data = memoryview(bytearray(f.read()))
+    magic_len = len(_PIPELINE_FILE_MAGIC)
+    footer_len = _FOOTER_STRUCT.size + magic_len
+    if (
+        len(data) < magic_len + footer_len
+        or bytes(data[:magic_len]) != _PIPELINE_FILE_MAGIC
+        or bytes(data[-magic_len:]) != _PIPELINE_FILE_MAGIC
+    ):
+        raise ValueError(f"{path} is not a pdpipe pipeline file.")
+    header_end = len(data) - footer_len
+    footer_end = header_end + _FOOTER_STRUCT.size
+    (header_len,) = _FOOTER_STRUCT.unpack(bytes(data[header_end:footer_end]))
+    header_start = header_end - header_len
+    header = json.loads(bytes(data[header_start:header_end]).decode("utf-8"))
+    buffers = [data[off:][:n] for off, n in header["buffers"]]
+    start, length = header["pickle"]
+    pickle_end = start + length
+    return pickle.loads(data[start:pickle_end], buffers=buffers)
+
+
 class PdPipeline(PdPipelineStage, collections.abc.Sequence):
     """A pipeline for processing pandas DataFrame objects.
 
@@ -1584,8 +1912,54 @@ class PdPipeline(PdPipelineStage, collections.abc.Sequence):
         self.application_context = None
         self.fit_context.lock()
 
+    def _application_units(self):
+        """Yield the stages of this pipeline to apply, with their indices.
+
+        Runs of consecutive row-filtering stages, of consecutive
+        token-filtering stages, and of consecutive stages naming the same
+        fused run type, are yielded as a single `_FusedStages` object - e.g.
+        `_FusedRowFilters` - indexed by the first stage of the run.
+
+        """
+        run = []
+        run_type = None
+        for index, stage in enumerate(self._stages):
+            fused_type = self._fused_type(stage)
+            if run and fused_type is not run_type:
+                yield from self._run_units(run, run_type, index)
+                run = []
+            run_type = fused_type
+            if fused_type is None:
+                yield index, stage
+            else:
+                run.append(stage)
+        yield from self._run_units(run, run_type, len(self._stages))
+
+    @staticmethod
+    def _fused_type(stage):
+        if (
+            isinstance(stage, _RowFilterStage)
+            and stage._is_fusable_row_filter()
+        ):
+            return _FusedRowFilters
+        # other stages may name the type of runs they can be fused into
+        fused_run_type = getattr(stage, "_fused_run_type", None)
+        if fused_run_type is not None:
+            return fused_run_type()
+        return None
+
+    @staticmethod
+    def _run_units(run, run_type, end):
+        start = end - len(run)
+        if len(run) > 1:
+            yield start, run_type(run, start)
+        else:
+            yield from zip(range(start, end), run)
+
     @staticmethod
     def _stage_application_error_message(index, stage, error):
+        # fused runs of stages record the stage which failed
+        index, stage = getattr(stage, "failed", None) or (index, stage)
         msg = f"Exception raised in stage [ {index}] {stage}"
         detail = str(error)
         if detail:
@@ -1796,7 +2170,7 @@ class PdPipeline(PdPipelineStage, collections.abc.Sequence):
         self.fit_context = PdpApplicationContext()
         self.fit_context.update(fit_context)
         if y is None:
-            for i, stage in enumerate(self._stages):
+            for i, stage in self._application_units():
                 try:
                     stage.fit_context = self.fit_context
                     stage.application_context = self.application_context
@@ -1813,7 +2187,7 @@ class PdPipeline(PdPipelineStage, collections.abc.Sequence):
                         self._stage_application_error_message(i, stage, e)
                     ) from e
         else:
-            for i, stage in enumerate(self._stages):
+            for i, stage in self._application_units():
                 try:
                     stage.fit_context = self.fit_context
                     stage.application_context = self.application_context
@@ -2018,7 +2392,7 @@ class PdPipeline(PdPipelineStage, collections.abc.Sequence):
         self.application_context = PdpApplicationContext()
         self.application_context.update(application_context)
         if y is None:
-            for i, stage in enumerate(self._stages):
+            for i, stage in self._application_units():
                 try:
                     stage.fit_context = self.fit_context
                     stage.application_context = self.application_context
@@ -2035,7 +2409,7 @@ class PdPipeline(PdPipelineStage, collections.abc.Sequence):
                         self._stage_application_error_message(i, stage, e)
                     ) from e
         else:
-            for i, stage in enumerate(self._stages):
+            for i, stage in self._application_units():
                 try:
                     stage.fit_context = self.fit_context
                     stage.application_context = self.application_context
@@ -2419,6 +2793,71 @@ class PdPipeline(PdPipelineStage, collections.abc.Sequence):
         except TypeError:  # pragma: no cover
             return self
 
+    def save(self, path: str) -> None:
+        """Save this pipeline to a file.
+
+        The pipeline is pickled using pickle protocol 5, with large numpy
+        buffers - like the ones holding fitted vocabularies, decomposition
+        components or scaler statistics - written out-of-band to aligned
+        segments of the same file, so `PdPipeline.load` can memory-map them.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file to write the pipeline to.
+
+        Examples
+        --------
+        >>> import os, tempfile; import pandas as pd; import pdpipe as pdp;
+        >>> df = pd.DataFrame([[3, 'a'], [5, 'b']], [1, 2], ['num', 'char'])
+        >>> pipeline = pdp.ColDrop('char') + pdp.Scale('MinMaxScaler')
+        >>> _ = pipeline.fit(df)
+        >>> path = os.path.join(tempfile.mkdtemp(), 'pipeline.pdp')
+        >>> pipeline.save(path)
+        >>> pdp.PdPipeline.load(path).transform(df)
+           num
+        1  0.0
+        2  1.0
+
+        """
+        _write_pipeline_file(self, path)
+
+    @staticmethod
+    def load(path: str, mmap: Optional[bool] = True) -> "PdPipeline":
+        """Load a pipeline saved with `PdPipeline.save`.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file to load the pipeline from.
+        mmap : bool, default True
+            If True, array data stored out-of-band is memory-mapped
+            (copy-on-write) rather than read into memory. Array pages are
+            then only read from disk when first used, and are shared between
+            all processes loading the same file. If False, the whole file is
+            read into memory.
+
+        Returns
+        -------
+        pdpipe.PdPipeline
+            The loaded pipeline.
+
+        Raises
+        ------
+        ValueError
+            If the given file is not a pdpipe pipeline file.
+        TypeError
+            If the object stored in the given file is not a pipeline.
+
+        """
+        pipeline = _read_pipeline_file(path, mmap=mmap)
+        if not isinstance(pipeline, PdPipeline):
+            raise TypeError(
+                f"{path} holds a {type(pipeline).__name__} object rather "
+                "than a pdpipe pipeline."
+            )
+        return pipeline
+
     # def drop(self, index):
     #     """Return this pipeline with the stage of the given index removed.
     #     Arguments
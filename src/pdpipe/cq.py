@@ -1,10 +1,17 @@
 """Column qualifiers for pdpipe."""
 
-from typing import List
+import contextlib
+from typing import List, Optional
 
 import numpy as np
 import pandas
 
+from .frame_stats import (
+    FrameStatsCache,
+    active_frame_stats_cache,
+    frame_stats,
+    frame_stats_cache,
+)
 from .shared import _list_str
 
 
@@ -13,6 +20,95 @@ class UnfittedColumnQualifierError(Exception):
     qualifier."""
 
 
+# === per-application memoization of qualifier results ===
+
+
+class QualifierMemo(FrameStatsCache):
+    """Memoizes the results of column qualifiers per input dataframe.
+
+    Results are kept with the statistics of each dataframe, so a result is
+    reused only for the very same dataframe object, and only as long as both
+    its column index and its dtypes are unchanged. See
+    `pdpipe.frame_stats.FrameStatsCache` for details.
+
+    Examples
+    --------
+    >>> import pandas as pd; import pdpipe as pdp;
+    >>> df = pd.DataFrame([[8, None], [5, 2]], [1, 2], ['a', 'b'])
+    >>> cq = pdp.cq.WithoutMissingValues(fittable=False)
+    >>> with pdp.cq.qualifier_memo() as memo:
+    ...     cq(df)
+    ...     cq(df)
+    ...     memo.hits
+    ['a']
+    ['a']
+    1
+
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, func, X):
+        """Return the result of calling the given qualifier function on X."""
+        try:
+            results = self.get(X).qualifier_results
+        except AttributeError:
+            # not a dataframe
+            return func(X)
+        key = id(func)
+        try:
+            res_func, res = results[key]
+            if res_func is func:
+                self.hits += 1
+                return list(res)
+        except KeyError:
+            pass
+        self.misses += 1
+        res = func(X)
+        # the function is held to keep its id from being reused
+        results[key] = (func, list(res))
+        return res
+
+
+def _memoized_call(func, X):
+    memo = active_frame_stats_cache()
+    if isinstance(memo, QualifierMemo):
+        return memo(func, X)
+    return func(X)
+
+
+@contextlib.contextmanager
+def qualifier_memo(memo: Optional[QualifierMemo] = None):
+    """Memoize column qualifier results over the enclosed code block.
+
+    Pipeline stages memoize qualifier results over every pipeline
+    application, so the precondition and the transformation of a stage, and
+    subsequent stages applied to the same dataframe, evaluate each qualifier
+    only once.
+
+    Parameters
+    ----------
+    memo : QualifierMemo, optional
+        The memo to use. If not given, an already active memo is used, if
+        there is one; otherwise, a new memo is created.
+
+    Yields
+    ------
+    QualifierMemo
+        The active memo.
+
+    """
+    if memo is None:
+        memo = active_frame_stats_cache()
+        if not isinstance(memo, QualifierMemo):
+            memo = QualifierMemo()
+    with frame_stats_cache(memo):
+        yield memo
+
+
 class ColumnQualifier(object):
     """A fittable qualifier that returns column labels from an input dataframe.
 
@@ -88,7 +184,7 @@ class ColumnQualifier(object):
             A list of labels of the qualified columns for the input dataframe.
 
         """
-        self._columns = self._cqfunc(X)
+        self._columns = _memoized_call(self._cqfunc, X)
         return self._columns
 
     def fit(self, X: pandas.DataFrame) -> None:
@@ -122,7 +218,7 @@ class ColumnQualifier(object):
 
         """
         if not self._fittable:
-            return self._cqfunc(X)
+            return _memoized_call(self._cqfunc, X)
         try:
             if self._subset:
                 return [x for x in self._columns if x in X.columns]
@@ -142,24 +238,43 @@ class ColumnQualifier(object):
     def _x_inorderof_y(x, y):
         return [i for i in y if i in x]
 
-    class _AndQualifierFunc(object):
-        """A pickle-able AND qualifier class."""
+    @staticmethod
+    def _operands(func, func_type):
+        """Flatten nested compound qualifier functions of the given type."""
+        if type(func) is func_type:
+            return func.operands
+        return (func,)
 
-        def __init__(self, first, second):
-            self.first = first
-            self.second = second
+    class _CompoundQualifierFunc(object):
+        """A pickle-able base for n-ary compound qualifier classes."""
+
+        def __init__(self, *operands):
+            self.operands = operands
+
+        def __setstate__(self, state):
+            # support compound qualifiers pickled as binary operations
+            if "operands" not in state:
+                state = {"operands": (state["first"], state["second"])}
+            self.__dict__.update(state)
+
+    class _AndQualifierFunc(_CompoundQualifierFunc):
+        """A pickle-able AND qualifier class."""
 
         def __call__(self, X):
-            return ColumnQualifier._x_inorderof_y(
-                x=set(self.first(X)).intersection(self.second(X)),
-                y=X.columns,
-            )
+            operands = iter(self.operands)
+            res = set(_memoized_call(next(operands), X))
+            for operand in operands:
+                if not res:
+                    return []
+                res.intersection_update(_memoized_call(operand, X))
+            return ColumnQualifier._x_inorderof_y(x=res, y=X.columns)
 
     def __and__(self, other):
         try:
-            res_func = ColumnQualifier._AndQualifierFunc(
-                first=self._cqfunc,
-                second=other._cqfunc,
+            and_func = ColumnQualifier._AndQualifierFunc
+            res_func = and_func(
+                *ColumnQualifier._operands(self._cqfunc, and_func),
+                *ColumnQualifier._operands(other._cqfunc, and_func),
             )
             res_func.__doc__ = (
                 f"{self._cqfunc.__doc__ or 'Anonymous qualifier 1'} AND "
@@ -169,24 +284,21 @@ class ColumnQualifier(object):
         except AttributeError:
             return NotImplemented
 
-    class _XorQualifierFunc(object):
+    class _XorQualifierFunc(_CompoundQualifierFunc):
         """A pickle-able XOR qualifier class."""
 
-        def __init__(self, first, second):
-            self.first = first
-            self.second = second
-
         def __call__(self, X):
-            return ColumnQualifier._x_inorderof_y(
-                x=set(self.first(X)).symmetric_difference(self.second(X)),
-                y=X.columns,
-            )
+            res = set()
+            for operand in self.operands:
+                res.symmetric_difference_update(_memoized_call(operand, X))
+            return ColumnQualifier._x_inorderof_y(x=res, y=X.columns)
 
     def __xor__(self, other):
         try:
-            res_func = ColumnQualifier._XorQualifierFunc(
-                first=self._cqfunc,
-                second=other._cqfunc,
+            xor_func = ColumnQualifier._XorQualifierFunc
+            res_func = xor_func(
+                *ColumnQualifier._operands(self._cqfunc, xor_func),
+                *ColumnQualifier._operands(other._cqfunc, xor_func),
             )
             res_func.__doc__ = (
                 f"{self._cqfunc.__doc__ or 'Anonymous qualifier 1'} XOR "
@@ -196,24 +308,24 @@ class ColumnQualifier(object):
         except AttributeError:
             return NotImplemented
 
-    class _OrQualifierFunc(object):
+    class _OrQualifierFunc(_CompoundQualifierFunc):
         """A pickle-able OR qualifier class."""
 
-        def __init__(self, first, second):
-            self.first = first
-            self.second = second
-
         def __call__(self, X):
-            return ColumnQualifier._x_inorderof_y(
-                x=set(self.first(X)).union(self.second(X)),
-                y=X.columns,
-            )
+            n_columns = len(X.columns)
+            res = set()
+            for operand in self.operands:
+                res.update(_memoized_call(operand, X))
+                if len(res) == n_columns:
+                    return list(X.columns)
+            return ColumnQualifier._x_inorderof_y(x=res, y=X.columns)
 
     def __or__(self, other):
         try:
-            res_func = ColumnQualifier._OrQualifierFunc(
-                first=self._cqfunc,
-                second=other._cqfunc,
+            or_func = ColumnQualifier._OrQualifierFunc
+            res_func = or_func(
+                *ColumnQualifier._operands(self._cqfunc, or_func),
+                *ColumnQualifier._operands(other._cqfunc, or_func),
             )
             res_func.__doc__ = (
                 f"{self._cqfunc.__doc__ or 'Anonymous qualifier 1'} OR "
@@ -223,24 +335,30 @@ class ColumnQualifier(object):
         except AttributeError:
             return NotImplemented
 
-    class _SubQualifierFunc(object):
-        """A pickle-able SUB qualifier class."""
+    class _SubQualifierFunc(_CompoundQualifierFunc):
+        """A pickle-able SUB qualifier class.
 
-        def __init__(self, first, second):
-            self.first = first
-            self.second = second
+        Qualifies the columns of the first operand which are qualified by none
+        of the rest.
+
+        """
 
         def __call__(self, X):
-            return ColumnQualifier._x_inorderof_y(
-                x=set(self.first(X)).difference(self.second(X)),
-                y=X.columns,
-            )
+            operands = iter(self.operands)
+            res = set(_memoized_call(next(operands), X))
+            for operand in operands:
+                if not res:
+                    return []
+                res.difference_update(_memoized_call(operand, X))
+            return ColumnQualifier._x_inorderof_y(x=res, y=X.columns)
 
     def __sub__(self, other):
         try:
-            res_func = ColumnQualifier._SubQualifierFunc(
-                first=self._cqfunc,
-                second=other._cqfunc,
+            sub_func = ColumnQualifier._SubQualifierFunc
+            # (a - b) - c is a - b - c, but a - (b - c) is not
+            res_func = sub_func(
+                *ColumnQualifier._operands(self._cqfunc, sub_func),
+                other._cqfunc,
             )
             res_func.__doc__ = (
                 f"{self._cqfunc.__doc__ or 'Anonymous qualifier 1'} NOT IN "
@@ -257,10 +375,8 @@ class ColumnQualifier(object):
             self.cq = cq
 
         def __call__(self, X):
-            return ColumnQualifier._x_inorderof_y(
-                x=set(X.columns).difference(self.cq(X)),
-                y=X.columns,
-            )
+            excluded = set(_memoized_call(self.cq, X))
+            return [lbl for lbl in X.columns if lbl not in excluded]
 
     def __invert__(self):
         res_func = ColumnQualifier._NotQualifierFunc(cq=self._cqfunc)
@@ -569,7 +685,7 @@ class OfDtypes(ColumnQualifier):
             self.dtypes = dtypes
 
         def __call__(self, X):
-            return list(X.select_dtypes(include=self.dtypes).columns)
+            return list(frame_stats(X).select_dtypes(self.dtypes))
 
     def __init__(self, dtypes, **kwargs):
         self._dtypes = dtypes
@@ -643,7 +759,8 @@ class WithAtMostMissingValues(ColumnQualifier):
             self._n_missing = n_missing
 
         def __call__(self, X):
-            return list(X.columns[X.isna().sum() <= self._n_missing])
+            null_counts = frame_stats(X).null_counts()
+            return list(X.columns[null_counts <= self._n_missing])
 
     def __init__(self, n_missing, **kwargs):
         self._n_missing = n_missing
@@ -722,7 +839,7 @@ class WithAtMostMissingValueRate(ColumnQualifier):
             self._rate = rate
 
         def __call__(self, X):
-            return list(X.columns[(X.isna().sum() / len(X)) <= self._rate])
+            return list(X.columns[frame_stats(X).null_rates() <= self._rate])
 
     def __init__(self, rate, **kwargs):
         self._rate = rate
@@ -771,7 +888,7 @@ class WithAtLeastMissingValueRate(ColumnQualifier):
             self._rate = rate
 
         def __call__(self, X):
-            return list(X.columns[(X.isna().sum() / len(X)) >= self._rate])
+            return list(X.columns[frame_stats(X).null_rates() >= self._rate])
 
     def __init__(self, rate, **kwargs):
         self._rate = rate
@@ -9,6 +9,7 @@ from pandas import DataFrame, Series
 from ..core import PdPipelineStage
 from ..pdp_types import SeriesOperandTypesTuple
 from ..shared import _list_str
+from .expression import ExpressionGraph
 from .func_lists import (
     SERIES_TRANSFORMS_BLACKLIST,
     SERIES_TRANSFORMS_WHITELIST,
@@ -92,8 +93,20 @@ class SeriesFromDfAssigner(PdPipelineStage):
     def _prec(self, df: DataFrame) -> bool:
         return set(self.required_columns).issubset(df.columns)
 
+    def _expression_graph(self) -> Optional[ExpressionGraph]:
+        # compiled on first use; stages pickled before graphs existed have
+        # no graph attribute
+        graph = getattr(self, "_graph", None)
+        if graph is None and isinstance(self.series_from_df, _SeriesFromDf):
+            graph = ExpressionGraph(self.series_from_df)
+            self._graph = graph
+        return graph
+
     def _transform(self, df: DataFrame, verbose=None) -> DataFrame:
-        return df.assign(**{self.assign_to_column: self.series_from_df})
+        graph = self._expression_graph()
+        if graph is None:
+            return df.assign(**{self.assign_to_column: self.series_from_df})
+        return df.assign(**{self.assign_to_column: graph})
 
     # === Binary Operators ===
 
@@ -625,6 +638,22 @@ class _BoundColumnPotential:
         self.series_from_df = series_from_df
         self.required_columns = required_columns
 
+    # === Series methods ===
+
+    def __getattr__(self, name: str) -> object:
+        # series methods are resolved on first access and then cached on the
+        # class, instead of scanning all of them on import
+        handle = _get_series_method_handle(name)
+        if handle is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        setattr(_BoundColumnPotential, name, handle)
+        return handle.__get__(self, type(self))
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()).union(_series_method_names()))
+
     # === Unary operators ===
 
     def __neg__(self) -> "_BoundColumnPotential":
@@ -1262,26 +1291,36 @@ def _has_series_transform_doc(attr_name: str, attr: object) -> bool:
         return False
 
 
-for attr_name in dir(Series):
-    attr = getattr(Series, attr_name)
-    add = False
+def _is_series_transform(attr_name: str, attr: object) -> bool:
     if attr_name in SERIES_TRANSFORMS_WHITELIST:
-        add = True
-    elif attr_name in SERIES_TRANSFORMS_BLACKLIST:
-        add = False
-    else:
-        # check if documented return value points at a series-to-series func
-        add = _has_series_transform_doc(attr_name, attr)
-    if add:
-        handle = _BoundColumnPotentialSeriesMethodTransformerHandle(
-            method_name=attr_name,
-            doc=attr.__doc__,
-        )
-        setattr(
-            _BoundColumnPotential,
-            attr_name,
-            handle,
-        )
+        return True
+    if attr_name in SERIES_TRANSFORMS_BLACKLIST:
+        return False
+    # check if documented return value points at a series-to-series func
+    return _has_series_transform_doc(attr_name, attr)
+
+
+def _get_series_method_handle(
+    attr_name: str,
+) -> Optional[_BoundColumnPotentialSeriesMethodTransformerHandle]:
+    if attr_name.startswith("_"):
+        return None
+    attr = getattr(Series, attr_name, None)
+    if attr is None or not _is_series_transform(attr_name, attr):
+        return None
+    return _BoundColumnPotentialSeriesMethodTransformerHandle(
+        method_name=attr_name,
+        doc=attr.__doc__,
+    )
+
+
+def _series_method_names() -> Set[str]:
+    return {
+        attr_name
+        for attr_name in dir(Series)
+        if not attr_name.startswith("_")
+        and _is_series_transform(attr_name, getattr(Series, attr_name))
+    }
 
 
 # ==== factory method ====
@@ -18,17 +18,34 @@ from .df_transformer import (
 
 class _DfHandle:
     def __init__(self) -> None:
-        for attr_name in dir(DataFrame):
-            attr = getattr(DataFrame, attr_name)
-            if _is_dataframe_transform(attr_name, attr):
-                # print(f"Adding {attr_name} of {attr}")
-                handle = _DfMethodTransformerHandle(
-                    method_name=attr_name,
-                    doc=attr.__doc__,
-                )
-                setattr(self, attr_name, handle)
         self.drop_rows_where = drop_rows_where
         self.keep_rows_where = keep_rows_where
 
+    def __getattr__(self, name: str) -> _DfMethodTransformerHandle:
+        # dataframe methods are resolved on first access and then cached, to
+        # avoid scanning the docstrings of all of them on import
+        attr = getattr(DataFrame, name, None)
+        if attr is None or not _is_dataframe_transform(name, attr):
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        handle = _DfMethodTransformerHandle(
+            method_name=name,
+            doc=attr.__doc__,
+        )
+        setattr(self, name, handle)
+        return handle
+
+    def __dir__(self):
+        return sorted(
+            set(super().__dir__()).union(
+                attr_name
+                for attr_name in dir(DataFrame)
+                if _is_dataframe_transform(
+                    attr_name, getattr(DataFrame, attr_name)
+                )
+            )
+        )
+
     def __getitem__(self, label: object) -> _BoundColumnPotential:
         return get_bound_column_potential_by_label(label)
@@ -0,0 +1,425 @@
+"""Compile pdp.df column expressions into deduplicated expression graphs.
+
+A tree of `_SeriesFromDf` callables, as built by `pdp.df` arithmetic, is
+compiled into a graph of nodes in which identical subtrees are shared, and
+subtrees of constants are folded. Evaluating the graph computes every shared
+subtree once, and operators over numeric columns on the underlying numpy
+arrays rather than through pandas, reusing intermediate arrays in place.
+Graphs made only of such operators are evaluated by numexpr in one pass for
+large enough frames, if it is installed and may use several threads.
+
+Nodes which can't be evaluated this way - series methods, floor division,
+modulo and power, external series, non-numeric columns and the like - are
+evaluated through pandas exactly as the callables they were compiled from.
+
+"""
+
+import operator
+
+import numpy
+from pandas import DataFrame, Series
+
+from ..shared import _numexpr_evaluate, _use_numexpr
+from .series_from_df import (
+    _SeriesFromDf,
+    _SeriesFromDfAbs,
+    _SeriesFromDfAdd,
+    _SeriesFromDfAnd,
+    _SeriesFromDfByLabel,
+    _SeriesFromDfBySeriesMethod,
+    _SeriesFromDfEq,
+    _SeriesFromDfFloorDiv,
+    _SeriesFromDfGe,
+    _SeriesFromDfGt,
+    _SeriesFromDfInvert,
+    _SeriesFromDfLe,
+    _SeriesFromDfLt,
+    _SeriesFromDfMod,
+    _SeriesFromDfMul,
+    _SeriesFromDfNe,
+    _SeriesFromDfNeg,
+    _SeriesFromDfOr,
+    _SeriesFromDfPow,
+    _SeriesFromDfSub,
+    _SeriesFromDfTrueDiv,
+    _SeriesFromDfXor,
+)
+
+# op name: (pandas/python operator, numpy ufunc, numexpr format, array kinds)
+_OPS = {
+    "add": (operator.add, numpy.add, "({} + {})", "iuf"),
+    "sub": (operator.sub, numpy.subtract, "({} - {})", "iuf"),
+    "mul": (operator.mul, numpy.multiply, "({} * {})", "iuf"),
+    "truediv": (operator.truediv, numpy.true_divide, "({} / {})", "iuf"),
+    "floordiv": (operator.floordiv, None, None, ""),
+    "mod": (operator.mod, None, None, ""),
+    "pow": (operator.pow, None, None, ""),
+    "lt": (operator.lt, numpy.less, "({} < {})", "biuf"),
+    "le": (operator.le, numpy.less_equal, "({} <= {})", "biuf"),
+    "eq": (operator.eq, numpy.equal, "({} == {})", "biuf"),
+    "ne": (operator.ne, numpy.not_equal, "({} != {})", "biuf"),
+    "ge": (operator.ge, numpy.greater_equal, "({} >= {})", "biuf"),
+    "gt": (operator.gt, numpy.greater, "({} > {})", "biuf"),
+    "and": (operator.and_, numpy.logical_and, "({} & {})", "b"),
+    "or": (operator.or_, numpy.logical_or, "({} | {})", "b"),
+    "xor": (operator.xor, numpy.logical_xor, "({} != {})", "b"),
+    "neg": (operator.neg, numpy.negative, "(-{})", "iuf"),
+    "abs": (operator.abs, numpy.absolute, "abs({})", "iuf"),
+    "invert": (operator.invert, numpy.logical_not, "(~{})", "b"),
+}
+
+_OP_NAMES = {
+    _SeriesFromDfAdd: "add",
+    _SeriesFromDfSub: "sub",
+    _SeriesFromDfMul: "mul",
+    _SeriesFromDfTrueDiv: "truediv",
+    _SeriesFromDfFloorDiv: "floordiv",
+    _SeriesFromDfMod: "mod",
+    _SeriesFromDfPow: "pow",
+    _SeriesFromDfLt: "lt",
+    _SeriesFromDfLe: "le",
+    _SeriesFromDfEq: "eq",
+    _SeriesFromDfNe: "ne",
+    _SeriesFromDfGe: "ge",
+    _SeriesFromDfGt: "gt",
+    _SeriesFromDfAnd: "and",
+    _SeriesFromDfOr: "or",
+    _SeriesFromDfXor: "xor",
+    _SeriesFromDfNeg: "neg",
+    _SeriesFromDfAbs: "abs",
+    _SeriesFromDfInvert: "invert",
+}
+
+_REAL_TYPES = (bool, int, float, numpy.bool_, numpy.integer, numpy.floating)
+# column dtypes numexpr evaluates just as numpy does
+_NUMEXPR_DTYPES = (
+    numpy.dtype(bool),
+    numpy.dtype(numpy.int64),
+    numpy.dtype(numpy.float64),
+)
+
+
+def _scalar_kind(value: object) -> str:
+    if isinstance(value, _REAL_TYPES):
+        return numpy.asarray(value).dtype.kind
+    return None
+
+
+def _weak_scalar(value: object) -> object:
+    # pandas unwraps numpy scalar operands, which are thus weakly typed too
+    if isinstance(value, numpy.generic):
+        return value.item()
+    return value
+
+
+def _ufunc_operand_dtype(value: object) -> object:
+    if isinstance(value, numpy.ndarray):
+        return value.dtype
+    if isinstance(value, bool):
+        return numpy.asarray(value).dtype
+    # python scalars are weakly typed
+    return type(value)
+
+
+class _Node:
+    """A node of a compiled expression graph.
+
+    Parameters
+    ----------
+    kind : str
+        One of 'col', 'const', 'op', 'call' and 'method'.
+    payload : object
+        A column label for 'col' nodes, a value for 'const' nodes, an op name
+        for 'op' nodes, a callable for 'call' nodes and the original callable
+        for 'method' nodes.
+    children : tuple of int
+        Indices of the operands of this node in the graph.
+
+    """
+
+    def __init__(self, kind: str, payload: object, children: tuple) -> None:
+        self.kind = kind
+        self.payload = payload
+        self.children = children
+        self.n_uses = 0
+
+
+class ExpressionGraph:
+    """A deduplicated, constant-folded graph of a column expression.
+
+    Parameters
+    ----------
+    series_from_df : _SeriesFromDf, pandas.Series or scalar
+        The expression to compile, as built through `pdp.df`.
+
+    Examples
+    --------
+    >>> import pandas as pd; import pdpipe as pdp;
+    >>> from pdpipe.df.expression import ExpressionGraph
+    >>> df = pd.DataFrame([[3, 1], [5, 2]], [1, 2], ['a', 'b'])
+    >>> diff = pdp.df['a'] - pdp.df['b']
+    >>> expr = (diff * diff) / (diff + 1)
+    >>> graph = ExpressionGraph(expr.series_from_df)
+    >>> len(graph.nodes)
+    7
+    >>> graph(df)
+    1    1.333333
+    2    2.250000
+    dtype: float64
+
+    """
+
+    def __init__(self, series_from_df: object) -> None:
+        self.nodes = []
+        self._keys = {}
+        self.root = self._add(series_from_df)
+        for node in self.nodes:
+            for child in node.children:
+                self.nodes[child].n_uses += 1
+        self._numexpr_ready = all(
+            node.kind in ("col", "const")
+            or (node.kind == "op" and _OPS[node.payload][2] is not None)
+            for node in self.nodes
+        )
+
+    # --- compilation ---
+
+    def _intern(self, key: object, node: _Node) -> int:
+        if key is not None:
+            try:
+                return self._keys[key]
+            except KeyError:
+                pass
+            except TypeError:
+                # unhashable key
+                key = None
+        self.nodes.append(node)
+        index = len(self.nodes) - 1
+        if key is not None:
+            self._keys[key] = index
+        return index
+
+    def _truncate(self, n_nodes: int) -> None:
+        """Drop the nodes added since the graph had the given size."""
+        del self.nodes[n_nodes:]
+        self._keys = {
+            key: index for key, index in self._keys.items() if index < n_nodes
+        }
+
+    def _add(self, obj: object) -> int:
+        if isinstance(obj, _SeriesFromDfByLabel):
+            label = obj.column_label
+            return self._intern(("col", label), _Node("col", label, ()))
+        op_name = _OP_NAMES.get(type(obj))
+        if op_name is not None:
+            if op_name in ("neg", "abs", "invert"):
+                operands = (obj.first,)
+            else:
+                operands = (obj.first, obj.second)
+            n_nodes = len(self.nodes)
+            children = tuple(self._add(operand) for operand in operands)
+            if all(self.nodes[i].kind == "const" for i in children):
+                try:
+                    value = _OPS[op_name][0](
+                        *(self.nodes[i].payload for i in children)
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    # left to raise on evaluation, as it did before
+                    pass
+                else:
+                    self._truncate(n_nodes)
+                    return self._add(value)
+            return self._intern(
+                ("op", op_name, children), _Node("op", op_name, children)
+            )
+        if isinstance(obj, _SeriesFromDfBySeriesMethod):
+            # series methods are not assumed to be deterministic, so only
+            # their operands are shared
+            children = [self._add(obj.source)]
+            for arg in list(obj.args) + list(obj.kwargs.values()):
+                if isinstance(arg, _SeriesFromDf):
+                    children.append(self._add(arg))
+            return self._intern(None, _Node("method", obj, tuple(children)))
+        if isinstance(obj, (_SeriesFromDf, Series)) or callable(obj):
+            # external series are kept by identity
+            kind = "const" if isinstance(obj, Series) else "call"
+            return self._intern((kind, id(obj)), _Node(kind, obj, ()))
+        return self._intern(("const", type(obj), obj), _Node("const", obj, ()))
+
+    # --- evaluation ---
+
+    def __call__(self, df: DataFrame) -> object:
+        """Evaluate this expression graph over the given dataframe."""
+        values = [None] * len(self.nodes)
+        owned = set()
+        if self._numexpr_ready and _use_numexpr(len(df)):
+            res = self._evaluate_numexpr(df, values)
+            if res is not None:
+                return Series(res, index=df.index)
+        res = self._evaluate(self.root, df, values, owned)
+        if isinstance(res, numpy.ndarray):
+            return Series(res, index=df.index)
+        return res
+
+    @staticmethod
+    def _column(df: DataFrame, label: object) -> object:
+        column = df[label]
+        if isinstance(column, Series):
+            dtype = column.dtype
+            if isinstance(dtype, numpy.dtype) and dtype.kind in "biuf":
+                return column.to_numpy()
+        return column
+
+    @staticmethod
+    def _as_pandas(value: object, df: DataFrame) -> object:
+        if isinstance(value, numpy.ndarray):
+            return Series(value, index=df.index)
+        return value
+
+    def _evaluate(
+        self, index: int, df: DataFrame, values: list, owned: set
+    ) -> object:
+        value = values[index]
+        if value is not None:
+            return value
+        node = self.nodes[index]
+        if node.kind == "col":
+            value = self._column(df, node.payload)
+        elif node.kind == "const":
+            value = node.payload
+        elif node.kind == "call":
+            value = node.payload(df)
+        elif node.kind == "method":
+            value = self._evaluate_method(node, df, values, owned)
+        else:
+            operands = [
+                self._evaluate(child, df, values, owned)
+                for child in node.children
+            ]
+            value = self._evaluate_op(node, operands, owned)
+            if value is None:
+                value = _OPS[node.payload][0](
+                    *(self._as_pandas(operand, df) for operand in operands)
+                )
+            else:
+                owned.add(id(value))
+        values[index] = value
+        return value
+
+    def _evaluate_method(
+        self, node: _Node, df: DataFrame, values: list, owned: set
+    ) -> object:
+        method_node = node.payload
+        evaluated = {}
+        for child in node.children:
+            evaluated[child] = self._as_pandas(
+                self._evaluate(child, df, values, owned), df
+            )
+        children = iter(node.children)
+        source = evaluated[next(children)]
+
+        def _operand(arg):
+            if isinstance(arg, _SeriesFromDf):
+                return evaluated[next(children)]
+            return arg
+
+        args = [_operand(arg) for arg in method_node.args]
+        kwargs = {
+            key: _operand(arg) for key, arg in method_node.kwargs.items()
+        }
+        return getattr(source, method_node.method_name)(*args, **kwargs)
+
+    def _evaluate_op(
+        self, node: _Node, operands: list, owned: set
+    ) -> numpy.ndarray:
+        """Evaluate an op over numpy arrays, or return None if it can't."""
+        _, ufunc, _, kinds = _OPS[node.payload]
+        if ufunc is None:
+            return None
+        has_array = False
+        for operand in operands:
+            if isinstance(operand, numpy.ndarray):
+                has_array = True
+                kind = operand.dtype.kind
+            else:
+                kind = _scalar_kind(operand)
+            if kind is None or kind not in kinds:
+                return None
+        if not has_array:
+            return None
+        operands = [_weak_scalar(operand) for operand in operands]
+        try:
+            dtypes = tuple(_ufunc_operand_dtype(op) for op in operands)
+            out_dtype = ufunc.resolve_dtypes(dtypes + (None,))[-1]
+            out = None
+            # reuse an intermediate array no other node uses as output
+            for child, operand in zip(node.children, operands):
+                if (
+                    isinstance(operand, numpy.ndarray)
+                    and id(operand) in owned
+                    and self.nodes[child].n_uses == 1
+                    and operand.dtype == out_dtype
+                ):
+                    out = operand
+                    break
+            with numpy.errstate(all="ignore"):
+                return ufunc(*operands, out=out)
+        except (TypeError, ValueError, OverflowError):
+            return None
+
+    def _evaluate_numexpr(self, df: DataFrame, values: list) -> object:
+        local_dict = {}
+        names = {}
+        kinds = {}
+        for index, node in enumerate(self.nodes):
+            if node.kind == "col":
+                value = self._column(df, node.payload)
+                if (
+                    not isinstance(value, numpy.ndarray)
+                    or value.dtype not in _NUMEXPR_DTYPES
+                ):
+                    return None
+                kind = value.dtype.kind
+            elif node.kind == "const":
+                value = _weak_scalar(node.payload)
+                kind = _scalar_kind(value)
+                if kind is None or kind == "u":
+                    return None
+            else:
+                _, _, template, op_kinds = _OPS[node.payload]
+                child_kinds = [kinds[child] for child in node.children]
+                if any(kind not in op_kinds for kind in child_kinds):
+                    return None
+                if op_kinds != "b" and "b" in child_kinds:
+                    # numexpr doesn't order or do arithmetic on booleans
+                    return None
+                if node.payload == "abs" and child_kinds != ["f"]:
+                    return None
+                if node.payload in ("lt", "le", "eq", "ne", "ge", "gt"):
+                    kind = "b"
+                elif node.payload == "truediv" or "f" in child_kinds:
+                    kind = "f"
+                else:
+                    kind = child_kinds[0]
+                kinds[index] = kind
+                names[index] = template.format(
+                    *(names[child] for child in node.children)
+                )
+                continue
+            kinds[index] = kind
+            names[index] = f"v{index}"
+            local_dict[names[index]] = value
+        if self.nodes[self.root].kind != "op":
+            return None
+        try:
+            return _numexpr_evaluate(names[self.root], local_dict)
+        except (
+            TypeError,
+            ValueError,
+            KeyError,
+            NotImplementedError,
+        ):  # pragma: no cover
+            return None
+
+    def __repr__(self) -> str:
+        return f"<ExpressionGraph with {len(self.nodes)} nodes>"
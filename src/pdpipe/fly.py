@@ -54,15 +54,25 @@ For example:
 
 from typing import List, Set, Union
 
+import numpy
 import pandas
 
 from . import rq
-from .core import PdPipelineStage
+from .core import PdPipelineStage, _RowFilterStage
 
 # === Auxiliary pipeline stages ===
 
 
-class KeepRowsByQualifier(PdPipelineStage):
+def _is_row_local(qualifier: object) -> bool:
+    # only such qualifiers give the same answer for rows of a dataframe and
+    # for the same rows in a subset of it
+    try:
+        return qualifier._is_row_local()
+    except AttributeError:
+        return False
+
+
+class KeepRowsByQualifier(_RowFilterStage, PdPipelineStage):
     """A pipeline stage that keeps rows by a row qualifier.
 
     All rows which the qualifier qualifies (i.e. return a boolean series with
@@ -100,6 +110,15 @@ class KeepRowsByQualifier(PdPipelineStage):
     def _prec(self, X: pandas.DataFrame) -> bool:
         return True
 
+    def _is_fusable_row_filter(self) -> bool:
+        return super()._is_fusable_row_filter() and _is_row_local(
+            self._keeprowsby_rq
+        )
+
+    def _row_mask(self, X, keep, fit):
+        mask = numpy.array(self._keeprowsby_rq(X), dtype=bool)
+        return self._and_masks(keep, mask)
+
     def _transform(self, X, verbose=None):
         before_count = len(X)
         bool_ix = self._keeprowsby_rq(X)
@@ -134,7 +153,7 @@ class KeepRowsByQualifier(PdPipelineStage):
         return type(self)(qualifier=not_rq)
 
 
-class DropRowsByQualifier(PdPipelineStage):
+class DropRowsByQualifier(_RowFilterStage, PdPipelineStage):
     """A pipeline stage that drops rows by a row qualifier.
 
     All rows which the qualifier qualifies (i.e. return a boolean series with
@@ -172,6 +191,15 @@ class DropRowsByQualifier(PdPipelineStage):
     def _prec(self, X: pandas.DataFrame) -> bool:
         return True
 
+    def _is_fusable_row_filter(self) -> bool:
+        return super()._is_fusable_row_filter() and _is_row_local(
+            self._droprowsby_rq
+        )
+
+    def _row_mask(self, X, keep, fit):
+        mask = ~numpy.array(self._droprowsby_rq(X), dtype=bool)
+        return self._and_masks(keep, mask)
+
     def _transform(self, X, verbose=None):
         before_count = len(X)
         bool_ix = ~self._droprowsby_rq(X)
@@ -0,0 +1,252 @@
+"""Lazily computed statistics of dataframes, shared over pipeline applications.
+
+Conditions and column qualifiers read the statistics of their input
+dataframes - null counts, dtypes, and the like - through `frame_stats`.
+During a pipeline application, the statistics of each intermediate dataframe
+are computed at most once and shared by the preconditions, postconditions and
+column qualifiers of all stages that inspect it; a stage producing a new
+dataframe starts it off with a fresh statistics object.
+
+"""
+
+import contextlib
+import threading
+import weakref
+from typing import Optional
+
+import pandas
+
+
+class FrameStats(object):
+    """Lazily computed statistics of a dataframe.
+
+    Each statistic is computed on first access and kept for later ones. Only a
+    weak reference to the dataframe is held.
+
+    Parameters
+    ----------
+    X : pandas.DataFrame
+        The dataframe to compute statistics of.
+
+    Examples
+    --------
+    >>> import pandas as pd; import pdpipe as pdp;
+    >>> df = pd.DataFrame([[8, None], [5, 2]], [1, 2], ['a', 'b'])
+    >>> stats = pdp.frame_stats.FrameStats(df)
+    >>> stats.null_counts()
+    a    0
+    b    1
+    dtype: int64
+    >>> stats.n_missing()
+    1
+
+    """
+
+    def __init__(self, X: pandas.DataFrame) -> None:
+        try:
+            self._ref = weakref.ref(X)
+        except TypeError:
+            self._ref = lambda: X
+        self.columns = X.columns
+        self.dtypes = X.dtypes
+        self.qualifier_results = {}
+        self._stats = {}
+
+    def describes(self, X: pandas.DataFrame) -> bool:
+        """Return True if these statistics are up to date for the given frame.
+
+        Statistics are up to date for the very same dataframe object, as long
+        as both its column index and its dtypes are unchanged.
+
+        """
+        return (
+            self._ref() is X
+            and X.columns is self.columns
+            and X.dtypes.equals(self.dtypes)
+        )
+
+    def _frame(self) -> pandas.DataFrame:
+        X = self._ref()
+        if X is None:  # pragma: no cover
+            raise ReferenceError("The described dataframe no longer exists.")
+        return X
+
+    def _get(self, key, compute):
+        try:
+            return self._stats[key]
+        except KeyError:
+            value = compute(self._frame())
+            self._stats[key] = value
+            return value
+
+    @property
+    def n_rows(self) -> int:
+        """The number of rows of the dataframe."""
+        return self._get("n_rows", len)
+
+    @property
+    def size(self) -> int:
+        """The number of cells of the dataframe."""
+        return self.n_rows * len(self.columns)
+
+    def null_counts(self) -> pandas.Series:
+        """Return the number of missing values in each column."""
+        return self._get("null_counts", lambda X: X.isna().sum())
+
+    def null_rates(self) -> pandas.Series:
+        """Return the rate of missing values in each column."""
+        return self._get(
+            "null_rates", lambda X: self.null_counts() / self.n_rows
+        )
+
+    def n_missing(self) -> int:
+        """Return the number of missing values in the dataframe."""
+        return self._get("n_missing", lambda X: int(self.null_counts().sum()))
+
+    def nunique(self) -> pandas.Series:
+        """Return the number of distinct non-missing values in each column."""
+        return self._get("nunique", lambda X: X.nunique())
+
+    def min(self) -> pandas.Series:
+        """Return the minimum of each numeric column."""
+        return self._get("min", lambda X: X.min(numeric_only=True))
+
+    def max(self) -> pandas.Series:
+        """Return the maximum of each numeric column."""
+        return self._get("max", lambda X: X.max(numeric_only=True))
+
+    def select_dtypes(self, include) -> pandas.Index:
+        """Return the labels of the columns of the given dtypes.
+
+        Parameters
+        ----------
+        include : object or list of objects
+            Supports all valid arguments to the `include` parameter of
+            pandas.DataFrame.select_dtypes().
+
+        """
+        key = include
+        if isinstance(include, list):
+            key = tuple(include)
+        try:
+            return self._get(
+                ("select_dtypes", key),
+                lambda X: X.select_dtypes(include=include).columns,
+            )
+        except TypeError:
+            # unhashable include argument
+            return self._frame().select_dtypes(include=include).columns
+
+
+class FrameStatsCache(object):
+    """Keeps the statistics of dataframes for reuse.
+
+    Dataframes are referenced weakly, so cached statistics never extend their
+    lifetime. Dataframes are assumed not to be modified in place, beyond
+    adding, removing or re-typing columns, while the cache is in use.
+
+    """
+
+    def __init__(self) -> None:
+        self._frames = {}
+
+    def get(self, X: pandas.DataFrame) -> FrameStats:
+        """Return the statistics of the given dataframe."""
+        key = id(X)
+        stats = self._frames.get(key)
+        if stats is not None and stats.describes(X):
+            return stats
+        stats = FrameStats(X)
+        frames = self._frames
+
+        def _discard(ref, key=key, stats=stats):
+            if frames.get(key) is stats:
+                del frames[key]
+
+        try:
+            stats._ref = weakref.ref(X, _discard)
+        except TypeError:
+            # not weak-referenceable, so not cached
+            return stats
+        self._frames[key] = stats
+        return stats
+
+    def clear(self) -> None:
+        """Discard all cached statistics."""
+        self._frames.clear()
+
+    def __getstate__(self):
+        # cached statistics are transient, and weak references can't be
+        # pickled
+        state = self.__dict__.copy()
+        state["_frames"] = {}
+        return state
+
+
+_ACTIVE = threading.local()
+
+
+def active_frame_stats_cache() -> Optional[FrameStatsCache]:
+    """Return the active statistics cache, if any; otherwise, None."""
+    return getattr(_ACTIVE, "cache", None)
+
+
+@contextlib.contextmanager
+def frame_stats_cache(cache: Optional[FrameStatsCache] = None):
+    """Cache dataframe statistics over the enclosed code block.
+
+    Parameters
+    ----------
+    cache : FrameStatsCache, optional
+        The cache to use. If not given, an already active cache is used, if
+        there is one; otherwise, a new cache is created.
+
+    Yields
+    ------
+    FrameStatsCache
+        The active cache.
+
+    """
+    prev = active_frame_stats_cache()
+    if cache is None:
+        cache = prev if prev is not None else FrameStatsCache()
+    _ACTIVE.cache = cache
+    try:
+        yield cache
+    finally:
+        _ACTIVE.cache = prev
+
+
+def frame_stats(X: pandas.DataFrame) -> FrameStats:
+    """Return the statistics of the given dataframe.
+
+    Within a `frame_stats_cache` block - and so, during pipeline
+    applications - statistics are shared between all calls for the same
+    dataframe. Otherwise, a new statistics object is returned.
+
+    Parameters
+    ----------
+    X : pandas.DataFrame
+        The dataframe to get statistics of.
+
+    Returns
+    -------
+    FrameStats
+        The statistics of the given dataframe.
+
+    Examples
+    --------
+    >>> import pandas as pd; import pdpipe as pdp;
+    >>> from pdpipe.frame_stats import frame_stats, frame_stats_cache
+    >>> df = pd.DataFrame([[8, None], [5, 2]], [1, 2], ['a', 'b'])
+    >>> with frame_stats_cache():
+    ...     frame_stats(df) is frame_stats(df)
+    True
+    >>> frame_stats(df) is frame_stats(df)
+    False
+
+    """
+    cache = active_frame_stats_cache()
+    if cache is None:
+        return FrameStats(X)
+    return cache.get(X)
@@ -10,17 +10,25 @@ stages.
 
 """
 
+import functools
 import importlib
+import math
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import pandas as pd
 from pandas.api.types import is_object_dtype, is_string_dtype
 from tqdm.autonotebook import tqdm
 
-from pdpipe.col_generation import MapColVals
+from pdpipe.col_generation import MapColVals, _effective_n_jobs
 from pdpipe.core import ColumnsBasedPipelineStage
-from pdpipe.shared import _interpret_columns_param, _list_str
+from pdpipe.shared import (
+    _interpret_columns_param,
+    _keep_tokens_not_in,
+    _list_str,
+)
+from pdpipe.text_stages import _TokenFilterStage
 from pdpipe.util import out_of_place_col_insert
 
 try:
@@ -51,8 +59,111 @@ _NLTK_ERR_MSG = (
     "Install it with: pip install nltk"
 )
 
+_BACKENDS = ("thread", "process")
+_CHUNKS_PER_JOB = 4
+
+# the value map of a worker process, set once by its initializer
+_WORKER_VALUE_MAP = None
+
+
+def _init_map_worker(value_map):
+    global _WORKER_VALUE_MAP
+    _WORKER_VALUE_MAP = value_map
+
+
+def _map_chunk_in_worker(values):
+    return [_WORKER_VALUE_MAP(x) for x in values]
+
+
+class _MapChunk(object):
+    def __init__(self, value_map):
+        self.value_map = value_map
+
+    def __call__(self, values):
+        return [self.value_map(x) for x in values]
+
+
+class _ParallelMapColVals(MapColVals):
+    """A MapColVals stage that can map the values of columns in parallel.
+
+    Columns are split into consecutive chunks of values, mapped by a pool of
+    worker threads or processes, and reassembled in order. A single pool is
+    used by all columns of an application of the stage, and worker processes
+    get the value map just once, on startup, so NLTK resources it loads are
+    loaded once per worker.
+
+    """
+
+    def __init__(self, n_jobs=None, backend="process", **kwargs):
+        _effective_n_jobs(n_jobs)
+        if backend not in _BACKENDS:
+            raise ValueError(
+                f"backend must be one of {_BACKENDS}; got {backend!r}."
+            )
+        self._n_jobs = n_jobs
+        self._backend = backend
+        super().__init__(**kwargs)
+
+    def _get_executor(self, n_jobs):
+        executor = getattr(self, "_executor", None)
+        if executor is not None:
+            return executor
+        value_map = self._applied_value_map
+        if self._backend == "process":
+            executor = ProcessPoolExecutor(
+                max_workers=n_jobs,
+                initializer=_init_map_worker,
+                initargs=(value_map,),
+            )
+            map_chunk = _map_chunk_in_worker
+        else:
+            executor = ThreadPoolExecutor(max_workers=n_jobs)
+            map_chunk = _MapChunk(value_map)
+        self._executor = executor
+        self._map_chunk = map_chunk
+        return executor
+
+    def _parallel_map(self, series, n_jobs):
+        values = series.to_numpy(dtype=object)
+        chunk_size = math.ceil(len(values) / (n_jobs * _CHUNKS_PER_JOB))
+        chunks = [
+            values[i:][:chunk_size] for i in range(0, len(values), chunk_size)
+        ]
+        executor = self._get_executor(n_jobs)
+        results = []
+        for mapped in executor.map(self._map_chunk, chunks):
+            results.extend(mapped)
+        return pd.Series(results, index=series.index, name=series.name)
 
-class TokenizeText(MapColVals):
+    def _transformation(self, X, verbose, fit):
+        try:
+            return super()._transformation(X, verbose, fit)
+        finally:
+            # the pool is shared by all columns, but only for this application
+            executor = getattr(self, "_executor", None)
+            self._executor = None
+            self._map_chunk = None
+            if executor is not None:
+                executor.shutdown()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_executor", None)
+        state.pop("_map_chunk", None)
+        return state
+
+    def _col_transform(self, series, label):
+        n_jobs = _effective_n_jobs(getattr(self, "_n_jobs", None))
+        if (
+            n_jobs == 1
+            or len(series) < 2
+            or getattr(self, "_memoize", None) is not None
+        ):
+            return super()._col_transform(series, label)
+        return self._parallel_map(series, n_jobs)
+
+
+class TokenizeText(_ParallelMapColVals):
     """A pipeline stage that tokenizes a text column into token lists.
 
     Note: The nltk package must be installed for this pipeline stage to work.
@@ -67,6 +178,14 @@ class TokenizeText(MapColVals):
         If set to True, the source columns are dropped after being tokenized,
         and the resulting tokenized columns retain the names of the source
         columns. Otherwise, tokenized columns gain the suffix '_tok'.
+    n_jobs : int, optional
+        If given, values are mapped in parallel by this many workers; if -1,
+        by as many workers as there are CPUs. Each column is split into
+        consecutive chunks, which are reassembled in order.
+    backend : 'process' or 'thread', default 'process'
+        The kind of workers used if n_jobs is given. The NLTK functions used
+        by this stage hold the GIL, so only worker processes run them in
+        parallel; these require the stage to be picklable.
     **kwargs : object
         All PdPipelineStage constructor parameters are supported.
 
@@ -101,7 +220,9 @@ class TokenizeText(MapColVals):
             os.makedirs(dpath, exist_ok=True)
             nltk.download("punkt")
 
-    def __init__(self, columns, drop=True, **kwargs):
+    def __init__(
+        self, columns, drop=True, n_jobs=None, backend="process", **kwargs
+    ):
         if not _NLTK_INSTALLED:
             raise ImportError(_NLTK_ERR_MSG)
         self.__check_punkt()
@@ -117,7 +238,7 @@ class TokenizeText(MapColVals):
         }
         super_kwargs.update(**kwargs)
         super_kwargs["none_columns"] = "error"
-        super().__init__(**super_kwargs)
+        super().__init__(n_jobs=n_jobs, backend=backend, **super_kwargs)
 
     def _prec(self, X):
         return super()._prec(X) and all(
@@ -126,7 +247,7 @@ class TokenizeText(MapColVals):
         )
 
 
-class UntokenizeText(MapColVals):
+class UntokenizeText(_ParallelMapColVals):
     """A pipeline stage that joins token lists to whitespace-separated strings.
 
     Target columns must be series of token lists; i.e. every cell in the series
@@ -144,6 +265,14 @@ class UntokenizeText(MapColVals):
         If set to True, the source columns are dropped after being untokenized,
         and the resulting columns retain the names of the source columns.
         Otherwise, untokenized columns gain the suffix '_untok'.
+    n_jobs : int, optional
+        If given, values are mapped in parallel by this many workers; if -1,
+        by as many workers as there are CPUs. Each column is split into
+        consecutive chunks, which are reassembled in order.
+    backend : 'process' or 'thread', default 'process'
+        The kind of workers used if n_jobs is given. The NLTK functions used
+        by this stage hold the GIL, so only worker processes run them in
+        parallel; these require the stage to be picklable.
     **kwargs : object
         All PdPipelineStage constructor parameters are supported.
 
@@ -168,7 +297,9 @@ class UntokenizeText(MapColVals):
     def _untokenize_list(token_list):
         return " ".join(token_list)
 
-    def __init__(self, columns, drop=True, **kwargs):
+    def __init__(
+        self, columns, drop=True, n_jobs=None, backend="process", **kwargs
+    ):
         if not _NLTK_INSTALLED:
             raise ImportError(_NLTK_ERR_MSG)
         self._columns = _interpret_columns_param(columns)
@@ -183,7 +314,7 @@ class UntokenizeText(MapColVals):
         }
         super_kwargs.update(**kwargs)
         super_kwargs["none_columns"] = "error"
-        super().__init__(**super_kwargs)
+        super().__init__(n_jobs=n_jobs, backend=backend, **super_kwargs)
 
     def _prec(self, X):
         return super()._prec(X) and all(
@@ -191,7 +322,7 @@ class UntokenizeText(MapColVals):
         )
 
 
-class RemoveStopwords(MapColVals):
+class RemoveStopwords(_TokenFilterStage, _ParallelMapColVals):
     """A pipeline stage that removes stopwords from a tokenized list.
 
     Target columns must be series of token lists; i.e. every cell in the series
@@ -214,6 +345,14 @@ class RemoveStopwords(MapColVals):
         If set to True, the source columns are dropped after stopword removal,
         and the resulting columns retain the names of the source columns.
         Otherwise, resulting columns gain the suffix '_nostop'.
+    n_jobs : int, optional
+        If given, values are mapped in parallel by this many workers; if -1,
+        by as many workers as there are CPUs. Each column is split into
+        consecutive chunks, which are reassembled in order.
+    backend : 'process' or 'thread', default 'process'
+        The kind of workers used if n_jobs is given. The NLTK functions used
+        by this stage hold the GIL, so only worker processes run them in
+        parallel; these require the stage to be picklable.
     **kwargs : object
         All PdPipelineStage constructor parameters are supported.
 
@@ -243,6 +382,9 @@ class RemoveStopwords(MapColVals):
         def __call__(self, word_list):
             return [w for w in word_list if w not in self.stopwords_list]
 
+        def keep_tokens(self, vocabulary):
+            return _keep_tokens_not_in(vocabulary, self.stopwords_list)
+
     @staticmethod
     def __stopwords_by_language(language):
         try:
@@ -260,7 +402,15 @@ class RemoveStopwords(MapColVals):
 
             return stopwords.words(language)
 
-    def __init__(self, language, columns, drop=True, **kwargs):
+    def __init__(
+        self,
+        language,
+        columns,
+        drop=True,
+        n_jobs=None,
+        backend="process",
+        **kwargs,
+    ):
         if not _NLTK_INSTALLED:
             raise ImportError(_NLTK_ERR_MSG)
         self._language = language
@@ -287,15 +437,24 @@ class RemoveStopwords(MapColVals):
         }
         super_kwargs.update(**kwargs)
         super_kwargs["none_columns"] = "error"
-        super().__init__(**super_kwargs)
+        super().__init__(n_jobs=n_jobs, backend=backend, **super_kwargs)
 
     def _prec(self, X):
         return super()._prec(X) and all(
             is_object_dtype(col_type) for col_type in X.dtypes[self._columns]
         )
 
+    def _token_mask(self, tokens, label, fit):
+        return self._applied_value_map.keep_tokens(tokens.vocabulary)
+
+    def _filter_token_col(self, series, label, fit):
+        return super()._col_transform(series, label)
 
-class SnowballStem(MapColVals):
+    def _col_transform(self, series, label):
+        return self._filter_tokens(series, label, fit=False)
+
+
+class SnowballStem(_ParallelMapColVals):
     """A pipeline stage that stems tokens in a list using the Snowball stemmer.
 
     Target columns must be series of token lists; i.e. every cell in the series
@@ -320,6 +479,19 @@ class SnowballStem(MapColVals):
         If provided, tokens shorter than this length are not stemmed.
     max_len : int, optional
         If provided, tokens longer than this length are not stemmed.
+    cache_size : int, default 65536
+        The maximum number of distinct tokens whose stems are kept in a least
+        recently used cache, shared by all stemmed columns; tokens are then
+        stemmed once, rather than on each occurrence. If 0, stems are not
+        cached. See `cache_info`.
+    n_jobs : int, optional
+        If given, values are mapped in parallel by this many workers; if -1,
+        by as many workers as there are CPUs. Each column is split into
+        consecutive chunks, which are reassembled in order.
+    backend : 'process' or 'thread', default 'process'
+        The kind of workers used if n_jobs is given. The NLTK functions used
+        by this stage hold the GIL, so only worker processes run them in
+        parallel; these require the stage to be picklable.
     **kwargs : object
         All PdPipelineStage constructor parameters are supported.
 
@@ -337,6 +509,8 @@ class SnowballStem(MapColVals):
     >>> remove_stopwords(df)
        freq       content
     1   3.2  [kick, boat]
+    >>> remove_stopwords.cache_info()['misses']
+    2
 
     """
 
@@ -369,9 +543,48 @@ class SnowballStem(MapColVals):
         def __call__(self, x):
             return (len(x) >= self.min_len) and (len(x) <= self.max_len)
 
+    class _StemCache(object):
+        """A bounded LRU cache of the stems of tokens.
+
+        The cache itself is not pickled; unpickled copies - like those of
+        worker processes - start with an empty one.
+
+        """
+
+        def __init__(self, stemmer, maxsize):
+            self.stemmer = stemmer
+            self.maxsize = maxsize
+            self._stem = None
+
+        def get_stem(self):
+            """Return the cached stem function."""
+            if self._stem is None:
+                self._stem = functools.lru_cache(maxsize=self.maxsize)(
+                    self.stemmer.stem
+                )
+            return self._stem
+
+        def info(self):
+            """Return the statistics of the cache, as a dict."""
+            hits, misses, maxsize, size = self.get_stem().cache_info()
+            n_calls = hits + misses
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / n_calls if n_calls else 0.0,
+                "size": size,
+                "maxsize": maxsize,
+            }
+
+        def __getstate__(self):
+            state = self.__dict__.copy()
+            state["_stem"] = None
+            return state
+
     class _TokenListStemmer(object):
-        def __init__(self, stemmer, min_len=None, max_len=None):
+        def __init__(self, stemmer, min_len=None, max_len=None, cache=None):
             self.stemmer = stemmer
+            self.cache = cache
             self.cond = None
             if min_len:
                 if max_len:
@@ -389,13 +602,19 @@ class SnowballStem(MapColVals):
         def __call__(self, token_list):
             return self.__stem__(token_list)
 
+        def _get_stem(self):
+            cache = getattr(self, "cache", None)
+            if cache is None:
+                return self.stemmer.stem
+            return cache.get_stem()
+
         def __uncond_stem__(self, token_list):
-            return [self.stemmer.stem(w) for w in token_list]
+            stem = self._get_stem()
+            return [stem(w) for w in token_list]
 
         def __cond_stem__(self, token_list):
-            return [
-                self.stemmer.stem(w) if self.cond(w) else w for w in token_list
-            ]
+            stem, cond = self._get_stem(), self.cond
+            return [stem(w) if cond(w) else w for w in token_list]
 
     @staticmethod
     def __stemmer_by_name(stemmer_name):
@@ -420,14 +639,27 @@ class SnowballStem(MapColVals):
         drop=True,
         min_len=None,
         max_len=None,
+        n_jobs=None,
+        backend="process",
+        cache_size=65536,
         **kwargs,
     ):
         if not _NLTK_INSTALLED:
             raise ImportError(_NLTK_ERR_MSG)
+        if not isinstance(cache_size, int) or cache_size < 0:
+            raise ValueError("cache_size must be a non-negative integer.")
         self._stemmer_name = stemmer_name
         self.stemmer = SnowballStem.__safe_stemmer_by_name(stemmer_name)
+        self._stem_cache = None
+        if cache_size:
+            self._stem_cache = SnowballStem._StemCache(
+                stemmer=self.stemmer, maxsize=cache_size
+            )
         self._list_stemmer = SnowballStem._TokenListStemmer(
-            stemmer=self.stemmer, min_len=min_len, max_len=max_len
+            stemmer=self.stemmer,
+            min_len=min_len,
+            max_len=max_len,
+            cache=self._stem_cache,
         )
         self._columns = _interpret_columns_param(columns)
         col_str = _list_str(self._columns)
@@ -449,15 +681,34 @@ class SnowballStem(MapColVals):
         }
         super_kwargs.update(**kwargs)
         super_kwargs["none_columns"] = "error"
-        super().__init__(**super_kwargs)
+        super().__init__(n_jobs=n_jobs, backend=backend, **super_kwargs)
 
     def _prec(self, X):
         return super()._prec(X) and all(
             is_object_dtype(col_type) for col_type in X.dtypes[self._columns]
         )
 
+    def cache_info(self):
+        """Return the statistics of the stem cache of this stage.
+
+        Stems computed by worker processes, when n_jobs is used with the
+        'process' backend, are cached - and counted - by the workers only.
+
+        Returns
+        -------
+        dict
+            A dict with the number of cache 'hits' and 'misses', their
+            'hit_rate', and the current 'size' and 'maxsize' of the cache; or
+            None if this stage does not cache stems.
+
+        """
+        cache = getattr(self, "_stem_cache", None)
+        if cache is None:
+            return None
+        return cache.info()
+
 
-class DropRareTokens(ColumnsBasedPipelineStage):
+class DropRareTokens(_TokenFilterStage, ColumnsBasedPipelineStage):
     """A pipeline stage that drop rare tokens from token lists.
 
     Target columns must be series of token lists; i.e. every cell in the series
@@ -515,6 +766,9 @@ class DropRareTokens(ColumnsBasedPipelineStage):
         def __call__(self, tokens):
             return [w for w in tokens if w not in self.rare_words]
 
+        def keep_tokens(self, vocabulary):
+            return _keep_tokens_not_in(vocabulary, self.rare_words.index)
+
     @staticmethod
     def __get_rare_remover(series, threshold):
         token_list = [item for sublist in series for item in sublist]
@@ -523,38 +777,28 @@ class DropRareTokens(ColumnsBasedPipelineStage):
         rare_words = freq_series[freq_series <= threshold]
         return DropRareTokens._RareRemover(rare_words)
 
-    def _fit_transform(self, X, verbose):
-        inter_X = X
-        columns_to_transform = self._get_columns(X, fit=True)
-        if verbose:
-            columns_to_transform = tqdm(columns_to_transform)
-        for colname in columns_to_transform:
-            source_col = X[colname]
-            loc = X.columns.get_loc(colname) + 1
-            new_name = colname + "_norare"
-            if self._drop:
-                inter_X = inter_X.drop(colname, axis=1)
-                new_name = colname
-                loc -= 1
-            rare_remover = DropRareTokens.__get_rare_remover(
-                source_col, self._threshold
-            )
-            self._rare_removers[colname] = rare_remover
-            inter_X = out_of_place_col_insert(
-                X=inter_X,
-                series=source_col.map(rare_remover),
-                loc=loc,
-                column_name=new_name,
+    def _token_mask(self, tokens, label, fit):
+        if not fit:
+            return self._rare_removers[label].keep_tokens(tokens.vocabulary)
+        counts = tokens.token_counts()
+        # tokens dropped by preceding stages of a fused run are absent
+        rare = (counts > 0) & (counts <= self._threshold)
+        rare_words = pd.Series(
+            counts[rare], index=pd.Index(tokens.vocabulary[rare])
+        )
+        self._rare_removers[label] = DropRareTokens._RareRemover(rare_words)
+        return ~rare
+
+    def _filter_token_col(self, series, label, fit):
+        if fit:
+            self._rare_removers[label] = DropRareTokens.__get_rare_remover(
+                series, self._threshold
             )
-        self.is_fitted = True
-        return inter_X
+        return series.map(self._rare_removers[label])
 
     def _transformation(self, X, verbose, fit):
-        raise NotImplementedError
-
-    def _transform(self, X, verbose):
         inter_X = X
-        columns_to_transform = self._get_columns(X, fit=False)
+        columns_to_transform = self._get_columns(X, fit=fit)
         if verbose:
             columns_to_transform = tqdm(columns_to_transform)
         for colname in columns_to_transform:
@@ -565,10 +809,9 @@ class DropRareTokens(ColumnsBasedPipelineStage):
                 inter_X = inter_X.drop(colname, axis=1)
                 new_name = colname
                 loc -= 1
-            rare_remover = self._rare_removers[colname]
             inter_X = out_of_place_col_insert(
                 X=inter_X,
-                series=source_col.map(rare_remover),
+                series=self._filter_tokens(source_col, colname, fit),
                 loc=loc,
                 column_name=new_name,
             )
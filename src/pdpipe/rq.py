@@ -3,7 +3,11 @@
 from numbers import Number
 from typing import List, Set, Union
 
+import numpy as _numpy
 import pandas
+from pandas import Series as _Series
+
+from .shared import _numexpr_evaluate, _use_numexpr, _ValueSet
 
 
 class RowQualifier(object):
@@ -21,10 +25,22 @@ class RowQualifier(object):
 
     def __init__(self, func: callable) -> None:
         self._rqfunc = func
+        self._plan = None
 
     def __call__(self, X: pandas.DataFrame) -> pandas.Series:
+        plan = getattr(self, "_plan", None)
+        if plan is None:
+            plan = self._plan = _compile(self._rqfunc)
+        if plan:
+            res = _evaluate(plan, X)
+            if res is not None:
+                return res
         return self._rqfunc(X)
 
+    def _is_row_local(self) -> bool:
+        """Return True if this qualifies each row only by its own values."""
+        return _is_row_local_func(self._rqfunc)
+
     def __repr__(self):
         if self._rqfunc.__doc__:  # pragma: no cover
             return f"<RowQualifier: Qualify rows with {self._rqfunc.__doc__}>"
@@ -136,6 +152,8 @@ class ColValGt(RowQualifier):
     class _GtRowFunc(object):
         """A pickle-able gt callable class."""
 
+        _op = "gt"
+
         def __init__(self, label: object, value: Number) -> None:
             self.label = label
             self.value = value
@@ -165,6 +183,8 @@ class ColValGe(RowQualifier):
     class _GeRowFunc(object):
         """A pickle-able ge callable class."""
 
+        _op = "ge"
+
         def __init__(self, label: object, value: Number) -> None:
             self.label = label
             self.value = value
@@ -194,6 +214,8 @@ class ColValLt(RowQualifier):
     class _LtRowFunc(object):
         """A pickle-able lt callable class."""
 
+        _op = "lt"
+
         def __init__(self, label: object, value: Number) -> None:
             self.label = label
             self.value = value
@@ -224,6 +246,8 @@ class ColValLe(RowQualifier):
     class _LeRowFunc(object):
         """A pickle-able le callable class."""
 
+        _op = "le"
+
         def __init__(self, label: object, value: Number) -> None:
             self.label = label
             self.value = value
@@ -253,6 +277,8 @@ class ColValEq(RowQualifier):
     class _EqRowFunc(object):
         """A pickle-able eq callable class."""
 
+        _op = "eq"
+
         def __init__(self, label: object, value: Number) -> None:
             self.label = label
             self.value = value
@@ -282,6 +308,8 @@ class ColValNe(RowQualifier):
     class _NeRowFunc(object):
         """A pickle-able ne callable class."""
 
+        _op = "ne"
+
         def __init__(self, label: object, value: Number) -> None:
             self.label = label
             self.value = value
@@ -311,6 +339,8 @@ class ColValIsIn(RowQualifier):
     class _IsInRowFunc(object):
         """A pickle-able isin callable class."""
 
+        _op = "isin"
+
         def __init__(
             self,
             label: object,
@@ -318,10 +348,18 @@ class ColValIsIn(RowQualifier):
         ) -> None:
             self.label = label
             self.value_list = value_list
+            self.value_set = _ValueSet(value_list)
             self.__doc__ = f"X[{label}] is in {value_list}"
 
         def __call__(self, X: pandas.DataFrame) -> pandas.Series:
-            return X[self.label].isin(self.value_list)
+            column = X[self.label]
+            value_set = getattr(self, "value_set", None)
+            if value_set is None:
+                # pickled before value sets were precompiled
+                value_set = self.value_set = _ValueSet(self.value_list)
+            return _Series(
+                value_set.isin(column), index=column.index, name=column.name
+            )
 
     def __init__(
         self,
@@ -346,6 +384,8 @@ class ColValIsNa(RowQualifier):
     class _IsNaRowFunc(object):
         """A pickle-able isna callable class."""
 
+        _op = "isna"
+
         def __init__(
             self,
             label: object,
@@ -376,6 +416,8 @@ class ColValNotNa(RowQualifier):
     class _NotNaRowFunc(object):
         """A pickle-able notna callable class."""
 
+        _op = "notna"
+
         def __init__(
             self,
             label: object,
@@ -393,5 +435,226 @@ class ColValNotNa(RowQualifier):
         super().__init__(func=ColValNotNa._NotNaRowFunc(label))
 
 
+# === compilation of qualifier trees ===
+
+# Qualifier trees built from the qualifiers above are compiled into plans of
+# nested tuples, which are evaluated directly over the underlying numpy arrays
+# of the columns involved: by numexpr, in one multi-threaded pass with no
+# temporary masks, for large enough frames, if it is installed and may use
+# several threads; otherwise, by numpy, combining masks in place. Trees
+# including other callables, and columns or values of non-numeric types, fall
+# back to the regular pandas path.
+
+# isin leaves with more values than this aren't expanded into equalities
+_NUMEXPR_MAX_ISIN_VALUES = 8
+
+_CMP_UFUNCS = {
+    "gt": _numpy.greater,
+    "ge": _numpy.greater_equal,
+    "lt": _numpy.less,
+    "le": _numpy.less_equal,
+    "eq": _numpy.equal,
+    "ne": _numpy.not_equal,
+}
+_CMP_SYMBOLS = {
+    "gt": ">",
+    "ge": ">=",
+    "lt": "<",
+    "le": "<=",
+    "eq": "==",
+    "ne": "!=",
+}
+_COMPOUND_OPS = {
+    RowQualifier._AndQualifierFunc: "and",
+    RowQualifier._OrQualifierFunc: "or",
+    RowQualifier._XorQualifierFunc: "xor",
+}
+_REAL_TYPES = (int, float, _numpy.integer, _numpy.floating)
+
+
+def _is_row_local_func(func: callable) -> bool:
+    # trees of the column value qualifiers above, of any value types
+    if type(func) in _COMPOUND_OPS:
+        return _is_row_local_func(func.first) and _is_row_local_func(
+            func.second
+        )
+    if type(func) is RowQualifier._NotQualifierFunc:
+        return _is_row_local_func(func.rq)
+    return getattr(type(func), "_op", None) is not None
+
+
+def _is_real(value: object) -> bool:
+    return isinstance(value, _REAL_TYPES) and not _numpy.isnan(value)
+
+
+def _compile_func(func: callable) -> tuple:
+    try:
+        kind = _COMPOUND_OPS[type(func)]
+    except KeyError:
+        pass
+    else:
+        # flatten nested compounds of the same kind into one n-ary node
+        operands = []
+        for operand in (func.first, func.second):
+            plan = _compile_func(operand)
+            if plan[0] == kind:
+                operands.extend(plan[1:])
+            else:
+                operands.append(plan)
+        return (kind, *operands)
+    if type(func) is RowQualifier._NotQualifierFunc:
+        return ("not", _compile_func(func.rq))
+    op = getattr(type(func), "_op", None)
+    if op in _CMP_UFUNCS:
+        if not _is_real(func.value):
+            raise ValueError(f"Can't compile comparison with {func.value!r}")
+        return ("cmp", op, func.label, func.value)
+    if op == "isin":
+        values = tuple(func.value_list)
+        if not all(
+            _is_real(value) and not isinstance(value, bool) for value in values
+        ):
+            raise ValueError("Can't compile isin with non-numeric values")
+        return ("isin", func.label, values)
+    if op in ("isna", "notna"):
+        return (op, func.label)
+    raise ValueError(f"Can't compile {func!r}")
+
+
+def _compile(func: callable) -> Union[tuple, bool]:
+    """Compile a row qualifier function into a plan, or return False."""
+    try:
+        return _compile_func(func)
+    except (ValueError, TypeError, AttributeError):
+        return False
+
+
+def _plan_leaves(plan: tuple):
+    if plan[0] in ("and", "or", "xor", "not"):
+        for operand in plan[1:]:
+            yield from _plan_leaves(operand)
+    else:
+        yield plan
+
+
+def _leaf_label(leaf: tuple) -> object:
+    return leaf[2] if leaf[0] == "cmp" else leaf[1]
+
+
+def _evaluate_numpy(plan: tuple, arrays: dict) -> _numpy.ndarray:
+    kind = plan[0]
+    if kind == "cmp":
+        _, op, label, value = plan
+        return _CMP_UFUNCS[op](arrays[label], value)
+    if kind == "isin":
+        return _numpy.isin(arrays[plan[1]], plan[2])
+    if kind in ("isna", "notna"):
+        arr = arrays[plan[1]]
+        if arr.dtype.kind == "f":
+            res = _numpy.isnan(arr)
+        else:
+            res = _numpy.zeros(len(arr), dtype=bool)
+        if kind == "notna":
+            _numpy.logical_not(res, out=res)
+        return res
+    if kind == "not":
+        res = _evaluate_numpy(plan[1], arrays)
+        return _numpy.logical_not(res, out=res)
+    ufunc = {
+        "and": _numpy.logical_and,
+        "or": _numpy.logical_or,
+        "xor": _numpy.logical_xor,
+    }[kind]
+    res = _evaluate_numpy(plan[1], arrays)
+    for operand in plan[2:]:
+        ufunc(res, _evaluate_numpy(operand, arrays), out=res)
+    return res
+
+
+def _numexpr_expression(plan: tuple, names: dict, constants: dict) -> str:
+    kind = plan[0]
+    if kind == "cmp":
+        _, op, label, value = plan
+        const = f"k{len(constants)}"
+        constants[const] = value
+        return f"({names[label]} {_CMP_SYMBOLS[op]} {const})"
+    if kind == "isin":
+        _, label, values = plan
+        if not values or len(values) > _NUMEXPR_MAX_ISIN_VALUES:
+            raise ValueError("Can't expand isin into equalities")
+        terms = []
+        for value in values:
+            const = f"k{len(constants)}"
+            constants[const] = value
+            terms.append(f"({names[label]} == {const})")
+        return f"({' | '.join(terms)})"
+    if kind in ("isna", "notna"):
+        name = names[plan[1]]
+        return f"({name} {'!=' if kind == 'isna' else '=='} {name})"
+    if kind == "not":
+        return f"(~{_numexpr_expression(plan[1], names, constants)})"
+    terms = [
+        _numexpr_expression(operand, names, constants) for operand in plan[1:]
+    ]
+    if kind == "xor":
+        expression = terms[0]
+        for term in terms[1:]:
+            expression = f"({expression} != {term})"
+        return expression
+    symbol = " & " if kind == "and" else " | "
+    return f"({symbol.join(terms)})"
+
+
+def _evaluate(plan: tuple, X: pandas.DataFrame) -> pandas.Series:
+    """Evaluate a plan over X, or return None if it can't be evaluated."""
+    arrays = {}
+    for leaf in _plan_leaves(plan):
+        label = _leaf_label(leaf)
+        if label in arrays:
+            continue
+        try:
+            column = X[label]
+        except (KeyError, TypeError):
+            # let the regular path raise the appropriate error
+            return None
+        if not isinstance(column, _Series):
+            # duplicate column labels
+            return None
+        dtype = column.dtype
+        if not isinstance(dtype, _numpy.dtype) or dtype.kind not in "biuf":
+            return None
+        arrays[label] = column.to_numpy()
+    try:
+        res = None
+        use_numexpr = (
+            _use_numexpr(len(X))
+            and all(arr.dtype.kind in "if" for arr in arrays.values())
+            # NaN checks are compiled as self-inequality of float columns
+            and not any(
+                leaf[0] in ("isna", "notna")
+                and arrays[leaf[1]].dtype.kind != "f"
+                for leaf in _plan_leaves(plan)
+            )
+        )
+        if use_numexpr:
+            names = {label: f"c{i}" for i, label in enumerate(arrays)}
+            constants = {}
+            try:
+                expression = _numexpr_expression(plan, names, constants)
+            except ValueError:
+                pass
+            else:
+                local_dict = {
+                    names[label]: arr for label, arr in arrays.items()
+                }
+                local_dict.update(constants)
+                res = _numexpr_evaluate(expression, local_dict)
+        if res is None:
+            res = _evaluate_numpy(plan, arrays)
+    except (TypeError, ValueError, OverflowError):  # pragma: no cover
+        return None
+    return _Series(res, index=X.index, dtype=bool)
+
+
 del pandas
 del Number
@@ -1,14 +1,226 @@
 """Shared inner functionalities for pdpipe."""
 
 import inspect
+import itertools
 import re
-from typing import Iterable, List
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import numexpr as _numexpr
+
+    _NUMEXPR_INSTALLED = True
+except ImportError:  # pragma: no cover
+    _NUMEXPR_INSTALLED = False
 
 POS_ARG_MISMTCH_PAT = re.compile(
     r"\d positional argument[s]? but \d (were|was) given"
 )
 
 
+# frames with less rows are evaluated by numpy, as numexpr has fixed overheads
+_NUMEXPR_MIN_ROWS = 2**17
+
+
+def _use_numexpr(n_rows: int) -> bool:
+    """Return True if numexpr should evaluate expressions over n_rows rows."""
+    return (
+        _NUMEXPR_INSTALLED
+        and n_rows >= _NUMEXPR_MIN_ROWS
+        # single-threaded, numexpr is slower than in-place numpy
+        and _numexpr.get_num_threads() > 1
+    )
+
+
+def _numexpr_evaluate(expression: str, local_dict: dict) -> object:
+    return _numexpr.evaluate(expression, local_dict=local_dict)
+
+
+def _is_numeric_dtype(dtype: object) -> bool:
+    return isinstance(dtype, np.dtype) and dtype.kind in "iuf"
+
+
+def _is_text_dtype(dtype: object) -> bool:
+    return dtype == object or isinstance(dtype, pd.StringDtype)
+
+
+class _ValueSet(object):
+    """A set of values, hashed once for repeated membership checks.
+
+    Membership is checked as by pandas.Series.isin(), which hashes the given
+    values anew on every call. Here, they are hashed into an index on first
+    use, which later checks reuse. Columns of dtypes for which index lookups
+    might match values differently than isin are checked by isin.
+
+    Parameters
+    ----------
+    values : iterable
+        The values to check membership in.
+
+    """
+
+    def __init__(self, values: Iterable[object]) -> None:
+        self.values = values
+        self._index = None
+        self._has_na = False
+
+    def _get_index(self) -> Optional[pd.Index]:
+        if self._index is None:
+            try:
+                index = pd.Index(list(self.values), tupleize_cols=False)
+                self._index = index.unique()
+                self._has_na = bool(self._index.hasnans)
+            except (TypeError, ValueError):
+                # unhashable values; isin will complain, if anyone
+                self._index = False
+        if self._index is False:
+            return None
+        return self._index
+
+    def _can_lookup(self, index: pd.Index, series: pd.Series) -> bool:
+        # isin tells None and NaN apart in some dtypes, and indices don't
+        if self._has_na:
+            return False
+        if _is_numeric_dtype(series.dtype):
+            return _is_numeric_dtype(index.dtype)
+        return _is_text_dtype(series.dtype) and _is_text_dtype(index.dtype)
+
+    def isin(self, series: pd.Series) -> np.ndarray:
+        """Return a boolean array of which values of a series are in the set.
+
+        Parameters
+        ----------
+        series : pandas.Series
+            The series to check the values of.
+
+        Returns
+        -------
+        numpy.ndarray
+            A boolean array, True for values in the set.
+
+        """
+        index = self._get_index()
+        if index is not None and self._can_lookup(index, series):
+            try:
+                return index.get_indexer(series) != -1
+            except TypeError:
+                # unhashable values
+                pass
+        return series.isin(self.values).to_numpy(dtype=bool)
+
+    def __getstate__(self):
+        # hash tables aren't pickled with indices anyway
+        state = self.__dict__.copy()
+        state["_index"] = None
+        return state
+
+
+class _FlatTokenLists(object):
+    """A series of token lists, flattened into token ids and offsets.
+
+    The tokens of all lists are factorized into a single array of integer
+    ids into a vocabulary of distinct tokens, and the lists are delimited by
+    an array of offsets into it; the tokens of list i are those in
+    [offsets[i], offsets[i+1]). Tokens can then be filtered by a vectorized
+    mask over the vocabulary, with conversion from and to lists only on the
+    way in and out.
+
+    Parameters
+    ----------
+    codes : numpy.ndarray
+        The vocabulary id of each token.
+    offsets : numpy.ndarray
+        The offsets of all lists into codes, followed by the number of tokens.
+    vocabulary : numpy.ndarray
+        An object array of distinct tokens.
+    index : pandas.Index
+        The index of the series of token lists.
+    name : object
+        The name of the series of token lists.
+
+    """
+
+    def __init__(self, codes, offsets, vocabulary, index, name):
+        self.codes = codes
+        self.offsets = offsets
+        self.vocabulary = vocabulary
+        self.index = index
+        self.name = name
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> Optional["_FlatTokenLists"]:
+        """Flatten a series of token lists, or return None if impossible.
+
+        Cells need not be lists, but must be sized iterables of tokens, all of
+        which are exactly of type str; tokens of other types might be equal
+        but distinct, like 1 and True, while lists are rebuilt from a single
+        token of each class of equal ones.
+
+        """
+        values = series.to_numpy(dtype=object)
+        try:
+            lengths = np.fromiter(
+                map(len, values), dtype=np.int64, count=len(values)
+            )
+            offsets = np.zeros(len(values) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            tokens = np.fromiter(
+                itertools.chain.from_iterable(values),
+                dtype=object,
+                count=int(offsets[-1]),
+            )
+        except (TypeError, ValueError):
+            # unsized cells
+            return None
+        if not set(map(type, tokens)) <= {str}:
+            return None
+        codes, vocabulary = pd.factorize(tokens)
+        return cls(codes, offsets, vocabulary, series.index, series.name)
+
+    def filter(self, keep: np.ndarray) -> "_FlatTokenLists":
+        """Return these token lists, with only tokens kept by a mask.
+
+        Parameters
+        ----------
+        keep : numpy.ndarray
+            A boolean array, True for each vocabulary token to keep.
+
+        """
+        mask = keep[self.codes]
+        n_kept = np.zeros(len(mask) + 1, dtype=np.int64)
+        np.cumsum(mask, out=n_kept[1:])
+        return _FlatTokenLists(
+            codes=self.codes[mask],
+            offsets=n_kept[self.offsets],
+            vocabulary=self.vocabulary,
+            index=self.index,
+            name=self.name,
+        )
+
+    def token_counts(self) -> np.ndarray:
+        """Return the number of occurrences of each vocabulary token."""
+        return np.bincount(self.codes, minlength=len(self.vocabulary))
+
+    def to_series(self) -> pd.Series:
+        """Return a series of the token lists, as Python lists."""
+        tokens = self.vocabulary.take(self.codes).tolist()
+        offsets = self.offsets.tolist()
+        lists = [
+            tokens[start:stop] for start, stop in zip(offsets, offsets[1:])
+        ]
+        return pd.Series(lists, index=self.index, name=self.name, dtype=object)
+
+
+def _keep_tokens_not_in(vocabulary: np.ndarray, tokens: object) -> object:
+    """Return a mask of vocabulary tokens not in tokens, or None if unable."""
+    try:
+        return ~pd.Index(vocabulary, dtype=object).isin(tokens)
+    except TypeError:
+        return None
+
+
 def _interpret_columns_param(columns: object) -> List[object]:
     if isinstance(columns, str):
         return [columns]
@@ -10,16 +10,27 @@ pipeline stages.
 
 """
 
+import numbers
+
 import numpy as np
 import pandas as pd
 
+try:
+    # used to build sparse columns without validating their indices again
+    from pandas._libs.sparse import IntIndex
+except ImportError:  # pragma: no cover
+    IntIndex = None
+
 try:
     import sklearn.preprocessing
     from sklearn.base import clone
     from sklearn.feature_extraction.text import (
+        HashingVectorizer,
+        TfidfTransformer,
         TfidfVectorizer,
     )
     from sklearn.impute import SimpleImputer
+    from sklearn.utils import gen_batches
     from skutil.preprocessing import scaler_by_params
 
     _SKLEARN_INSTALLED = True
@@ -33,11 +44,9 @@ from pdpipe.shared import (
     _get_args_list,
     _identity_function,
     _interpret_columns_param,
+    _is_numeric_dtype,
 )
-from pdpipe.util import (
-    out_of_place_col_insert,
-    per_column_values_sklearn_transform,
-)
+from pdpipe.util import out_of_place_col_insert, replace_column_block
 
 from .exceptions import (
     PipelineApplicationError,
@@ -52,6 +61,187 @@ _SKLEARN_ERR_MSG = (
 )
 
 
+def _columns_by_dtype(X, columns):
+    """Return a dict mapping each dtype to the given columns of it."""
+    groups = {}
+    for lbl, dtype in zip(columns, X[columns].dtypes):
+        groups.setdefault(dtype, []).append(lbl)
+    return groups
+
+
+_EPS_SCALE = 10 * np.finfo(np.float64).eps
+
+
+def _nonzero_scale(scale):
+    # as sklearn does for features of constant values
+    if scale < _EPS_SCALE:
+        return 1.0
+    return scale
+
+
+def _fit_joint_affine_scaler(scaler, values):
+    """Fit an affine scaler to all given values, as those of a single feature.
+
+    The fitted attributes of the scaler are set as its own fit method would,
+    from statistics reduced over the whole 2D block, without flattening it.
+    Returns False, and leaves the scaler unfitted, for other scalers.
+
+    """
+    params = scaler.get_params()
+    if isinstance(scaler, sklearn.preprocessing.StandardScaler):
+        mean, var = np.nanmean(values), np.nanvar(values)
+        scaler.mean_ = np.array([mean]) if params["with_mean"] else None
+        if params["with_std"]:
+            scaler.var_ = np.array([var])
+            scaler.scale_ = np.array([_nonzero_scale(np.sqrt(var))])
+        else:
+            scaler.var_ = scaler.scale_ = None
+        scaler.n_samples_seen_ = int(np.count_nonzero(~np.isnan(values)))
+    elif isinstance(scaler, sklearn.preprocessing.MinMaxScaler):
+        low, high = params["feature_range"]
+        data_min, data_max = np.nanmin(values), np.nanmax(values)
+        data_range = data_max - data_min
+        scale = (high - low) / _nonzero_scale(data_range)
+        scaler.data_min_ = np.array([data_min])
+        scaler.data_max_ = np.array([data_max])
+        scaler.data_range_ = np.array([data_range])
+        scaler.scale_ = np.array([scale])
+        scaler.min_ = np.array([low - data_min * scale])
+        scaler.n_samples_seen_ = int(np.count_nonzero(~np.isnan(values)))
+    elif isinstance(scaler, sklearn.preprocessing.MaxAbsScaler):
+        max_abs = np.nanmax(np.abs(values))
+        scaler.max_abs_ = np.array([max_abs])
+        scaler.scale_ = np.array([_nonzero_scale(max_abs)])
+        scaler.n_samples_seen_ = int(np.count_nonzero(~np.isnan(values)))
+    elif isinstance(scaler, sklearn.preprocessing.RobustScaler):
+        q_min, q_max = params["quantile_range"]
+        scaler.center_ = None
+        scaler.scale_ = None
+        if params["with_centering"]:
+            scaler.center_ = np.array([np.nanmedian(values)])
+        if params["with_scaling"]:
+            low, high = np.nanpercentile(values, [q_min, q_max])
+            scale = _nonzero_scale(high - low)
+            if params["unit_variance"]:
+                from scipy.stats import norm
+
+                scale /= norm.ppf(q_max / 100.0) - norm.ppf(q_min / 100.0)
+            scaler.scale_ = np.array([scale])
+    else:
+        return False
+    scaler.n_features_in_ = 1
+    return True
+
+
+def _joint_affine_transform(scaler, values):
+    """Transform a 2D block with an affine scaler fitted to a single feature.
+
+    Returns None for scalers other than affine ones.
+
+    """
+    if isinstance(scaler, sklearn.preprocessing.StandardScaler):
+        center, scale = scaler.mean_, scaler.scale_
+    elif isinstance(scaler, sklearn.preprocessing.RobustScaler):
+        center, scale = scaler.center_, scaler.scale_
+    elif isinstance(scaler, sklearn.preprocessing.MinMaxScaler):
+        res = np.multiply(values, float(scaler.scale_[0]))
+        res += float(scaler.min_[0])
+        if scaler.get_params()["clip"]:
+            np.clip(res, *scaler.feature_range, out=res)
+        return res
+    elif isinstance(scaler, sklearn.preprocessing.MaxAbsScaler):
+        return np.divide(values, float(scaler.scale_[0]))
+    else:
+        return None
+    if center is not None:
+        res = np.subtract(values, float(center[0]))
+    elif values.dtype.kind == "f":
+        res = values.copy()
+    else:
+        res = values.astype(np.float64)
+    if scale is not None:
+        res /= float(scale[0])
+    return res
+
+
+def _zero_fill_sparse_arrays(matrix):
+    """Return a dict of sparse arrays of zero fill, one per matrix column.
+
+    Each array is built once, directly from the sparse values and indices of
+    the corresponding column of the matrix, through pandas internals.
+
+    """
+    matrix = matrix.tocsc()
+    matrix.sort_indices()
+    n_rows = matrix.shape[0]
+    dtype = pd.SparseDtype(matrix.dtype, matrix.dtype.type(0).item())
+    indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+    return {
+        i: pd.arrays.SparseArray._simple_new(
+            data[start:stop],
+            IntIndex(n_rows, indices[start:stop], check_integrity=False),
+            dtype,
+        )
+        for i, (start, stop) in enumerate(zip(indptr[:-1], indptr[1:]))
+    }
+
+
+def _sparse_frame(matrix, index, columns):
+    """Return a dataframe of sparse columns of zero fill from a sparse matrix.
+
+    Columns are built directly from the sparse matrix where pandas internals
+    allow it. Otherwise, they are built by
+    pandas.DataFrame.sparse.from_spmatrix(), which some pandas versions have
+    use the default fill value of the matrix dtype - NaN for floats - in
+    which case columns are then rebuilt, on the same sparse values and
+    indices, with a fill value of zero.
+
+    """
+    try:
+        arrays = _zero_fill_sparse_arrays(matrix)
+    except (AttributeError, TypeError, ValueError):  # pragma: no cover
+        # pandas internals differ
+        arrays = None
+    if arrays is not None:
+        res = pd.DataFrame(arrays, index=index, copy=False)
+        res.columns = columns
+        return res
+    res = pd.DataFrame.sparse.from_spmatrix(matrix, index=index)
+    fill_value = matrix.dtype.type(0).item()
+    if len(res.columns) and res.dtypes.iloc[0].fill_value != fill_value:
+        arrays = {
+            i: pd.arrays.SparseArray(
+                col.array.sp_values,
+                sparse_index=col.array.sp_index,
+                fill_value=fill_value,
+            )
+            for i, (_, col) in enumerate(res.items())
+        }
+        res = pd.DataFrame(arrays, index=index, copy=False)
+    res.columns = columns
+    return res
+
+
+def _fill_dtype(dtype, value):
+    """Return the dtype to cast a column to, to be filled with a value."""
+    if (
+        isinstance(dtype, pd.api.extensions.ExtensionDtype)
+        and pd.api.types.is_integer_dtype(dtype)
+        and isinstance(value, numbers.Real)
+    ):
+        if float(value).is_integer():
+            return dtype
+        return "Float64"
+    return object
+
+
+def _is_nan_marker(value):
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
 class Encode(ColumnsBasedPipelineStage):
     """A pipeline stage that encodes categorical columns to integer values.
 
@@ -171,6 +361,12 @@ class Imputer(ColumnsBasedPipelineStage):
     This stage uses scikit-learn's SimpleImputer to handle missing values
     (NaN, None) in the specified columns with a chosen strategy.
 
+    Imputation values are fitted separately for the columns of each dtype, so
+    columns of different dtypes are never converted to a common one, and
+    column dtypes are kept whenever imputation values fit them. Otherwise,
+    nullable integer columns imputed with fractional values are cast to
+    Float64, and other columns to object.
+
     Parameters
     ----------
     strategy : str, default 'mean'
@@ -199,8 +395,11 @@ class Imputer(ColumnsBasedPipelineStage):
 
     Attributes
     ----------
-    imputer_ : sklearn.impute.SimpleImputer
-        A scikit-learn SimpleImputer object.
+    imputers_ : list of sklearn.impute.SimpleImputer
+        The scikit-learn SimpleImputer objects fitted to the imputed columns;
+        one for each dtype among them.
+    statistics_ : dict
+        A dict mapping each imputed column to its imputation value.
 
     Examples
     --------
@@ -245,64 +444,141 @@ class Imputer(ColumnsBasedPipelineStage):
     def _transformation(self, X, verbose, fit):
         raise NotImplementedError
 
-    def _fit_transform(self, X, verbose):
-        self._columns_to_impute = self._get_columns(X, fit=True)
-        unimputed_cols = [
-            x for x in X.columns if x not in self._columns_to_impute
-        ]
-        col_order = list(X.columns)
-        inter_X = X[self._columns_to_impute].copy()
+    def _missing_values(self):
+        return self._kwargs.get("missing_values", np.nan)
 
+    def _fit_statistics(self, X):
         imputer_kwargs = self._kwargs.copy()
         if self.fill_value is not None:
             imputer_kwargs["fill_value"] = self.fill_value
+        missing = self._missing_values()
+        na_kwargs = {}
+        if _is_nan_marker(missing):
+            na_kwargs["na_value"] = missing
+        self.imputers_ = []
+        self.statistics_ = {}
+        self._numeric_columns = set()
+        # a constant fill value numeric columns can't hold makes them objects
+        numeric_fill = (
+            self.strategy != "constant"
+            or self.fill_value is None
+            or isinstance(self.fill_value, numbers.Real)
+        )
+        groups = _columns_by_dtype(X, self._columns_to_impute)
+        for dtype, columns in groups.items():
+            if numeric_fill and _is_numeric_dtype(dtype):
+                self._numeric_columns.update(columns)
+                if dtype.kind == "f":
+                    values = X[columns].to_numpy()
+                else:
+                    values = X[columns].to_numpy(dtype=np.float64)
+            else:
+                values = X[columns].to_numpy(
+                    dtype=object, copy=True, **na_kwargs
+                )
+            imputer = SimpleImputer(strategy=self.strategy, **imputer_kwargs)
+            imputer.fit(values)
+            self.imputers_.append(imputer)
+            self.statistics_.update(zip(columns, imputer.statistics_))
 
-        self.imputer_ = SimpleImputer(strategy=self.strategy, **imputer_kwargs)
+    def _get_statistics(self):
         try:
-            inter_X = pd.DataFrame(
-                data=self.imputer_.fit_transform(inter_X.values),
-                index=inter_X.index,
-                columns=inter_X.columns,
-            )
+            return self.statistics_, self._numeric_columns
+        except AttributeError:
+            # stages pickled before imputation by dtype groups
+            stats = self.imputer_.statistics_
+            columns = list(self._columns_to_impute)
+            numeric = set(columns) if stats.dtype != object else set()
+            return dict(zip(columns, stats)), numeric
+
+    def _impute_numeric(self, X, columns, dtype, statistics):
+        values = X[columns].to_numpy()
+        missing = self._missing_values()
+        if _is_nan_marker(missing):
+            if dtype.kind != "f":
+                return None
+            mask = np.isnan(values)
+        else:
+            mask = values == missing
+        if not mask.any():
+            return None
+        stats = np.array([statistics[lbl] for lbl in columns], dtype=float)
+        res = np.where(mask, stats, values)
+        if dtype.kind == "f":
+            res = res.astype(dtype, copy=False)
+        else:
+            cast = res.astype(dtype)
+            if (cast == res).all():
+                res = cast
+        return pd.DataFrame(res, index=X.index, columns=columns, copy=False)
+
+    def _impute_other(self, X, columns, statistics):
+        sub_X = X[columns]
+        missing = self._missing_values()
+        fill = {lbl: statistics[lbl] for lbl in columns}
+        if _is_nan_marker(missing):
+            try:
+                return sub_X.fillna(fill)
+            except (TypeError, ValueError):
+                # a fill value the dtype can't hold
+                dtypes = {
+                    lbl: _fill_dtype(dtype, fill[lbl])
+                    for lbl, dtype in sub_X.dtypes.items()
+                }
+                return sub_X.astype(dtypes).fillna(fill)
+        fill = pd.Series(fill, dtype=object)
+        return sub_X.astype(object).mask(sub_X == missing, fill, axis=1)
+
+    def _impute(self, X):
+        statistics, numeric_columns = self._get_statistics()
+        filled = []
+        groups = _columns_by_dtype(X, self._columns_to_impute)
+        for dtype, columns in groups.items():
+            if _is_numeric_dtype(dtype):
+                numeric = [lbl for lbl in columns if lbl in numeric_columns]
+                other = [lbl for lbl in columns if lbl not in numeric_columns]
+                if numeric:
+                    filled.append(
+                        self._impute_numeric(X, numeric, dtype, statistics)
+                    )
+                if other:
+                    filled.append(self._impute_other(X, other, statistics))
+                continue
+            mismatched = [lbl for lbl in columns if lbl in numeric_columns]
+            if mismatched:
+                raise ValueError(
+                    f"Columns {mismatched} were imputed as numeric columns, "
+                    f"but are now of dtype {dtype}."
+                )
+            filled.append(self._impute_other(X, columns, statistics))
+        filled = [frame for frame in filled if frame is not None]
+        if not filled:
+            return X
+        filled = pd.concat(filled, axis=1)
+        return replace_column_block(X, filled.columns, filled)
+
+    def _fit_transform(self, X, verbose):
+        self._columns_to_impute = self._get_columns(X, fit=True)
+        try:
+            self._fit_statistics(X)
+            res = self._impute(X)
         except Exception as e:
             raise PipelineApplicationError(
                 "Exception raised when Imputer applied to columns"
                 f" {self._columns_to_impute} by class {self.__class__}"
             ) from e
-
-        if len(unimputed_cols) > 0:
-            unimputed = X[unimputed_cols]
-            inter_X = pd.concat([inter_X, unimputed], axis=1)
-            inter_X = inter_X[col_order]
-
         self.is_fitted = True
-        return inter_X
+        return res
 
     def _transform(self, X, verbose):
-        unimputed_cols = [
-            x for x in X.columns if x not in self._columns_to_impute
-        ]
-        col_order = list(X.columns)
-        inter_X = X[self._columns_to_impute].copy()
         try:
-            inter_X = pd.DataFrame(
-                data=self.imputer_.transform(inter_X.values),
-                index=inter_X.index,
-                columns=inter_X.columns,
-            )
+            return self._impute(X)
         except Exception as e:
             raise PipelineApplicationError(
                 "Exception raised when Imputer applied to columns"
                 f" {self._columns_to_impute} by class {self.__class__}"
             ) from e
 
-        if len(unimputed_cols) > 0:
-            unimputed = X[unimputed_cols]
-            inter_X = pd.concat([inter_X, unimputed], axis=1)
-            inter_X = inter_X[col_order]
-
-        return inter_X
-
 
 class Scale(ColumnsBasedPipelineStage):
     """A pipeline stage that scales data.
@@ -327,6 +603,10 @@ class Scale(ColumnsBasedPipelineStage):
         If set to True, all scaled columns will be scaled as a single value
         set (meaning, only the single largest value among all input columns
         will be scaled to 1, and not the largest one for each column).
+        For the affine scalers - 'StandardScaler', 'MinMaxScaler',
+        'MaxAbsScaler' and 'RobustScaler' - joint statistics are reduced over
+        the block of scaled columns directly, which is then scaled in a single
+        vectorized operation.
     **kwargs : extra keyword arguments
         All valid extra keyword arguments are forwarded to the scaler
         constructor on scaler creation (e.g. 'n_quantiles' for
@@ -378,65 +658,61 @@ class Scale(ColumnsBasedPipelineStage):
     def _transformation(self, X, verbose, fit):
         raise NotImplementedError
 
+    def _replace_scaled(self, X, values):
+        columns = self._columns_to_scale
+        if len(columns) == len(X.columns):
+            # all columns are scaled; they are kept in selection order
+            return replace_column_block(X, columns, values, loc=0)
+        return replace_column_block(X, columns, values)
+
+    @staticmethod
+    def _joint_values(inter_X):
+        values = inter_X.to_numpy()
+        if values.dtype.kind not in "fiub":
+            values = values.astype(np.float64)
+        return values
+
+    def _joint_transform(self, values):
+        res = _joint_affine_transform(self._scaler, values)
+        if res is None:
+            # a scaler transforming each value on its own
+            res = self._scaler.transform(values.reshape(-1, 1))
+            res = res.reshape(values.shape)
+        return res
+
     def _fit_transform(self, X, verbose):
         self._columns_to_scale = self._get_columns(X, fit=True)
-        unscaled_cols = [
-            x for x in X.columns if x not in self._columns_to_scale
-        ]
-        col_order = list(X.columns)
         inter_X = X[self._columns_to_scale]
         self._scaler = scaler_by_params(self.scaler, **self._kwargs)
         try:
             if self._joint:
-                self._scaler.fit(np.array([inter_X.values.flatten()]).T)
-                inter_X = per_column_values_sklearn_transform(
-                    X=inter_X, transform=self._scaler.transform
-                )
+                values = self._joint_values(inter_X)
+                if not _fit_joint_affine_scaler(self._scaler, values):
+                    self._scaler.fit(values.reshape(-1, 1))
+                values = self._joint_transform(values)
             else:
-                inter_X = pd.DataFrame(
-                    data=self._scaler.fit_transform(inter_X.values),
-                    index=inter_X.index,
-                    columns=inter_X.columns,
-                )
+                values = self._scaler.fit_transform(inter_X.values)
         except Exception as e:
             raise PipelineApplicationError(
                 "Exception raised when Scale applied to columns"
                 f" {self._columns_to_scale} by class {self.__class__}"
             ) from e
-        if len(unscaled_cols) > 0:
-            unscaled = X[unscaled_cols]
-            inter_X = pd.concat([inter_X, unscaled], axis=1)
-            inter_X = inter_X[col_order]
         self.is_fitted = True
-        return inter_X
+        return self._replace_scaled(X, values)
 
     def _transform(self, X, verbose):
-        unscaled_cols = [
-            x for x in X.columns if x not in self._columns_to_scale
-        ]
-        col_order = list(X.columns)
         inter_X = X[self._columns_to_scale]
         try:
             if self._joint:
-                inter_X = per_column_values_sklearn_transform(
-                    X=inter_X, transform=self._scaler.transform
-                )
+                values = self._joint_transform(self._joint_values(inter_X))
             else:
-                inter_X = pd.DataFrame(
-                    data=self._scaler.transform(inter_X.values),
-                    index=inter_X.index,
-                    columns=inter_X.columns,
-                )
+                values = self._scaler.transform(inter_X.values)
         except Exception:
             raise PipelineApplicationError(
                 "Exception raised when Scale applied to columns"
                 f" {self._columns_to_scale} by class {self.__class__}"
             )
-        if len(unscaled_cols) > 0:
-            unscaled = X[unscaled_cols]
-            inter_X = pd.concat([inter_X, unscaled], axis=1)
-            inter_X = inter_X[col_order]
-        return inter_X
+        return self._replace_scaled(X, values)
 
 
 class SklearnColumnTransform(ColumnsBasedPipelineStage):
@@ -535,8 +811,11 @@ class SklearnColumnTransform(ColumnsBasedPipelineStage):
         if hasattr(res, "toarray"):
             res = res.toarray()
         if isinstance(res, (pd.DataFrame, pd.Series)):
-            res = res.values
+            # might be a view of the input dataframe
+            res = res.to_numpy(copy=True)
         res = np.asarray(res)
+        if not res.flags.writeable:
+            res = res.copy()
         if res.ndim != 2:
             raise PipelineApplicationError(
                 "SklearnColumnTransform expected a 2-dimensional "
@@ -558,7 +837,7 @@ class SklearnColumnTransform(ColumnsBasedPipelineStage):
             return selected_columns
         return [self._lbl_format.format(i) for i in range(n_output_columns)]
 
-    def _make_result_df(self, res, X, result_columns):
+    def _make_result_block(self, res, X, result_columns):
         arr = self._as_2d_array(res)
         if arr.shape[0] != len(X.index):
             raise PipelineApplicationError(
@@ -573,15 +852,14 @@ class SklearnColumnTransform(ColumnsBasedPipelineStage):
                 f"Expected {len(result_columns)} output columns, got "
                 f"{arr.shape[1]}."
             )
-        return pd.DataFrame(data=arr, index=X.index, columns=result_columns)
+        return arr
 
-    def _insert_result(self, X, selected_columns, result_X):
+    def _insert_result(self, X, selected_columns, result_arr, result_columns):
         if len(selected_columns) == 0:
             return X
-        passthrough_cols = [
-            col for col in X.columns if col not in selected_columns
-        ]
-        result_columns = list(result_X.columns)
+        selected = X.columns.isin(selected_columns)
+        passthrough_cols = set(X.columns[~selected])
+        result_columns = list(result_columns)
         if len(set(result_columns)) != len(result_columns):
             raise PipelineApplicationError(
                 "SklearnColumnTransform result column labels must be unique."
@@ -596,31 +874,22 @@ class SklearnColumnTransform(ColumnsBasedPipelineStage):
                 f"passthrough columns. Colliding labels: {colliding_cols}."
             )
         if self._replace_selected:
-            selected_to_result = dict(zip(selected_columns, result_columns))
-            post_X = X.copy().drop(columns=selected_columns)
-            for selected_col in selected_columns:
-                result_col = selected_to_result[selected_col]
-                post_X[result_col] = result_X[result_col]
-            post_columns = []
-            for col in X.columns:
-                post_columns.append(selected_to_result.get(col, col))
-            return post_X.loc[:, post_columns]
-        first_loc = min(X.columns.get_loc(col) for col in selected_columns)
-        before = [
-            col
-            for col in passthrough_cols
-            if X.columns.get_loc(col) < first_loc
-        ]
-        after = [
-            col
-            for col in passthrough_cols
-            if X.columns.get_loc(col) >= first_loc
-        ]
-        return pd.concat([X[before], result_X, X[after]], axis=1)
+            return replace_column_block(
+                X, selected_columns, result_arr, result_columns
+            )
+        first_loc = int(np.flatnonzero(selected)[0])
+        return replace_column_block(
+            X, selected_columns, result_arr, result_columns, loc=first_loc
+        )
 
     def _validate_transform_columns(self, X):
         missing_cols = [
-            col for col in self._columns_to_transform if col not in X.columns
+            col
+            for col, found in zip(
+                self._columns_to_transform,
+                pd.Index(self._columns_to_transform).isin(X.columns),
+            )
+            if not found
         ]
         if missing_cols:
             raise PipelineApplicationError(
@@ -643,7 +912,7 @@ class SklearnColumnTransform(ColumnsBasedPipelineStage):
             self._replace_selected = result_arr.shape[1] == len(
                 self._columns_to_transform
             )
-            result_X = self._make_result_df(
+            result_arr = self._make_result_block(
                 result_arr,
                 X,
                 result_columns=self._result_columns_,
@@ -657,14 +926,16 @@ class SklearnColumnTransform(ColumnsBasedPipelineStage):
                 f" {self._columns_to_transform} by class {self.__class__}"
             ) from e
         self.is_fitted = True
-        return self._insert_result(X, self._columns_to_transform, result_X)
+        return self._insert_result(
+            X, self._columns_to_transform, result_arr, self._result_columns_
+        )
 
     def _transform(self, X, verbose):
         self._validate_transform_columns(X)
         sub_X = X[self._columns_to_transform]
         try:
             result = self.transformer_.transform(sub_X)
-            result_X = self._make_result_df(
+            result_arr = self._make_result_block(
                 result,
                 X,
                 result_columns=self._result_columns_,
@@ -677,7 +948,9 @@ class SklearnColumnTransform(ColumnsBasedPipelineStage):
                 "columns"
                 f" {self._columns_to_transform} by class {self.__class__}"
             ) from e
-        return self._insert_result(X, self._columns_to_transform, result_X)
+        return self._insert_result(
+            X, self._columns_to_transform, result_arr, self._result_columns_
+        )
 
 
 class TfidfVectorizeTokenLists(PdPipelineStage):
@@ -709,6 +982,24 @@ class TfidfVectorizeTokenLists(PdPipelineStage):
         TfidfVectorizeTokenLists pipeline stages vectorizing two different
         token-list columns, you should set this to true, so tf-idf features
         originating in different text columns do not overwrite one another.
+    sparse : bool, default False
+        If set to True, resulting columns are of a pandas.SparseDtype, built
+        directly from the sparse matrix of tf-idf values, and no dense array
+        of them is ever created.
+    hashing : bool, default False
+        If set to True, tokens are mapped to features by hashing them, with a
+        scikit-learn HashingVectorizer followed by a TfidfTransformer, instead
+        of by a vocabulary learned on fit. This bounds the number of resulting
+        columns, and no vocabulary is stored. Feature names are then feature
+        indices, in the range [0, n_features). In addition to TfidfVectorizer
+        keyword arguments, HashingVectorizer keyword arguments, like
+        'alternate_sign', are supported in this mode, while the vocabulary
+        related 'vocabulary', 'min_df', 'max_df' and 'max_features' keyword
+        arguments are not.
+    n_features : int, default 1024
+        The number of features tokens are hashed to, if hashing is True. This
+        is also the number of resulting columns, each of which is created
+        even if sparse is True, so it should be kept to a few thousands.
     **kwargs : object
         All PdPipelineStage constructor parameters are supported.
 
@@ -722,17 +1013,48 @@ class TfidfVectorizeTokenLists(PdPipelineStage):
        Age      eels  hovercraft   urethra
     1    2  0.579739    0.814802  0.000000
     2    5  0.579739    0.000000  0.814802
+    >>> tfvectorizer = pdp.TfidfVectorizeTokenLists(
+    ...     'tokens', hashing=True, n_features=6)
+    >>> tfvectorizer(df)
+       Age         0    1         2    3         4    5
+    1    2  0.579739  0.0  0.814802  0.0  0.000000  0.0
+    2    5  0.579739  0.0  0.000000  0.0  0.814802  0.0
 
     """
 
     _DEF_CNTVEC_MSG = "Count-vectorizing column {}."
+    _IGNORED_ARGS = ["input", "analyzer", "self"]
+    _VOCABULARY_ARGS = ["vocabulary", "min_df", "max_df", "max_features"]
 
-    def __init__(self, column, drop=True, hierarchical_labels=False, **kwargs):
+    def __init__(
+        self,
+        column,
+        drop=True,
+        hierarchical_labels=False,
+        sparse=False,
+        hashing=False,
+        n_features=2**10,
+        **kwargs,
+    ):
         if not _SKLEARN_INSTALLED:
             raise ImportError(_SKLEARN_ERR_MSG)
+        if hashing:
+            unsupported = [
+                k
+                for k in TfidfVectorizeTokenLists._VOCABULARY_ARGS
+                if k in kwargs
+            ]
+            if unsupported:
+                raise ValueError(
+                    f"Keyword arguments {unsupported} are not supported "
+                    "when hashing is True, as no vocabulary is learned."
+                )
         self._column = column
         self._drop = drop
         self._hierarchical_labels = hierarchical_labels
+        self._sparse = sparse
+        self._hashing = hashing
+        self._hash_n_features = n_features
         msg = TfidfVectorizeTokenLists._DEF_CNTVEC_MSG.format(column)
         super_kwargs = {
             "exmsg": (
@@ -742,16 +1064,15 @@ class TfidfVectorizeTokenLists(PdPipelineStage):
             "desc": msg,
         }
         valid_vectorizer_args = _get_args_list(TfidfVectorizer.__init__)
+        if hashing:
+            valid_vectorizer_args = valid_vectorizer_args + _get_args_list(
+                HashingVectorizer.__init__
+            )
         self._vectorizer_args = {
             k: kwargs[k]
             for k in kwargs
             if k in valid_vectorizer_args
-            and k
-            not in [
-                "input",
-                "analyzer",
-                "self",
-            ]
+            and k not in TfidfVectorizeTokenLists._IGNORED_ARGS
         }
         pipeline_stage_args = {
             k: kwargs[k] for k in kwargs if k in PdPipelineStage._INIT_KWARGS
@@ -762,45 +1083,73 @@ class TfidfVectorizeTokenLists(PdPipelineStage):
     def _prec(self, X):
         return self._column in X.columns
 
-    def _fit_transform(self, X, verbose):
-        self._tfidf_vectorizer = TfidfVectorizer(
+    def _make_hashing_vectorizer(self):
+        tfidf_args = _get_args_list(TfidfTransformer.__init__)
+        hashing_args = {"alternate_sign": False}
+        transformer_args = {}
+        for key, value in self._vectorizer_args.items():
+            if key in tfidf_args:
+                transformer_args[key] = value
+            elif key in _get_args_list(HashingVectorizer.__init__):
+                hashing_args[key] = value
+        self._hashing_vectorizer = HashingVectorizer(
             input="content",
             analyzer=_identity_function,
-            **self._vectorizer_args,
+            n_features=self._hash_n_features,
+            norm=None,
+            **hashing_args,
         )
-        vectorized = self._tfidf_vectorizer.fit_transform(X[self._column])
+        self._tfidf_transformer = TfidfTransformer(**transformer_args)
+
+    def _fit_vectorizer(self, X):
+        if self._hashing:
+            self._make_hashing_vectorizer()
+            counts = self._hashing_vectorizer.transform(X[self._column])
+            vectorized = self._tfidf_transformer.fit_transform(counts)
+            feature_names = range(vectorized.shape[1])
+        else:
+            self._tfidf_vectorizer = TfidfVectorizer(
+                input="content",
+                analyzer=_identity_function,
+                **self._vectorizer_args,
+            )
+            vectorized = self._tfidf_vectorizer.fit_transform(X[self._column])
+            feature_names = self._tfidf_vectorizer.get_feature_names_out()
         self._n_features = vectorized.shape[1]
         if self._hierarchical_labels:
             self._res_col_names = [
-                f"{self._column}_{f}"
-                for f in self._tfidf_vectorizer.get_feature_names_out()
+                f"{self._column}_{f}" for f in feature_names
             ]
         else:
-            self._res_col_names = (
-                self._tfidf_vectorizer.get_feature_names_out()
+            self._res_col_names = feature_names
+        return vectorized
+
+    def _vectorize(self, X):
+        if getattr(self, "_hashing", False):
+            counts = self._hashing_vectorizer.transform(X[self._column])
+            return self._tfidf_transformer.transform(counts)
+        return self._tfidf_vectorizer.transform(X[self._column])
+
+    def _concat_vectorized(self, X, vectorized):
+        if getattr(self, "_sparse", False):
+            vec_X = _sparse_frame(vectorized, X.index, self._res_col_names)
+        else:
+            vec_X = pd.DataFrame(
+                data=vectorized.toarray(),
+                index=X.index,
+                columns=self._res_col_names,
             )
-        vec_X = pd.DataFrame(
-            data=vectorized.toarray(),
-            index=X.index,
-            columns=self._res_col_names,
-        )
-        inter_X = pd.concat([X, vec_X], axis=1)
-        self.is_fitted = True
         if self._drop:
-            return inter_X.drop(self._column, axis=1)
-        return inter_X
+            X = X.drop(self._column, axis=1)
+        return pd.concat([X, vec_X], axis=1)
+
+    def _fit_transform(self, X, verbose):
+        vectorized = self._fit_vectorizer(X)
+        self.is_fitted = True
+        return self._concat_vectorized(X, vectorized)
 
     def _transform(self, X, verbose):
-        vectorized = self._tfidf_vectorizer.transform(X[self._column])
-        vec_X = pd.DataFrame(
-            data=vectorized.toarray(),
-            index=X.index,
-            columns=self._res_col_names,
-        )
-        inter_X = pd.concat([X, vec_X], axis=1)
-        if self._drop:
-            return inter_X.drop(self._column, axis=1)
-        return inter_X
+        return self._concat_vectorized(X, self._vectorize(X))
 
 
 class Decompose(ColumnsBasedPipelineStage):
@@ -830,6 +1179,14 @@ class Decompose(ColumnsBasedPipelineStage):
         An f-string with a single {} slot, used to generated post-decomposition
         column labels. For example, 'pca{:0>3}' will yield columns 'pca000',
         'pca001', etc. If not provided, the default 'mdc{}' is used.
+    chunk_size : int, optional
+        If given, the transformer is fitted chunk by chunk, through its
+        `partial_fit` method, to consecutive chunks of rows of this size (the
+        last chunk might be somewhat larger), and rows are also transformed
+        chunk by chunk, into a preallocated result array. Only a chunk of the
+        decomposed columns is ever converted into a numpy array at a time.
+        Supported only for transformers with a `partial_fit` method, like
+        `sklearn.decomposition.IncrementalPCA`. See also `fit_chunks`.
     **kwargs : extra keyword arguments
         PdPipelineStage valid keyword arguments are used to override
         Decompose class defaults. All other extra keyword arguments are
@@ -852,6 +1209,14 @@ class Decompose(ColumnsBasedPipelineStage):
     1 -3.313301 -0.148453
     2  1.432127  1.717269
     3  1.881174 -1.568816
+    >>> from sklearn.decomposition import IncrementalPCA
+    >>> ipca_stage = pdp.Decompose(IncrementalPCA(), n_components=1)
+    >>> ipca_stage = ipca_stage.fit_chunks([df.iloc[:2], df.iloc[2:]])
+    >>> ipca_stage(df).round(4)
+         mdc0
+    1 -3.3133
+    2  1.4321
+    3  1.8812
 
     """
 
@@ -862,12 +1227,22 @@ class Decompose(ColumnsBasedPipelineStage):
         exclude_columns=None,
         drop=True,
         lbl_format=None,
+        chunk_size=None,
         **kwargs,
     ):
         if not _SKLEARN_INSTALLED:
             raise ImportError(_SKLEARN_ERR_MSG)
+        if chunk_size is not None:
+            if not hasattr(transformer, "partial_fit"):
+                raise ValueError(
+                    "Decompose with a chunk_size requires a transformer with "
+                    f"a partial_fit method; {transformer} has none."
+                )
+            if chunk_size < 1:
+                raise ValueError("chunk_size must be a positive integer.")
         self.transformer = transformer
         self._drop = drop
+        self._chunk_size = chunk_size
         self._lbl_format = lbl_format
         if lbl_format is None:
             self._lbl_format = "mdc{}"
@@ -888,63 +1263,119 @@ class Decompose(ColumnsBasedPipelineStage):
     def _transformation(self, X, verbose, fit):
         raise NotImplementedError
 
+    def _insert_decomposed(self, X, values):
+        columns = [self._lbl_format.format(i) for i in range(values.shape[1])]
+        if self._drop:
+            replaced = self._columns_to_transform
+            n_untransformed = int((~X.columns.isin(replaced)).sum())
+        else:
+            replaced, n_untransformed = [], len(X.columns)
+        return replace_column_block(
+            X, replaced, values, columns, loc=n_untransformed
+        )
+
+    def _new_transformer(self):
+        transformer = clone(self.transformer)
+        return transformer.set_params(**self._kwargs)
+
+    def _row_chunks(self, n_rows):
+        # partial_fit of some transformers requires at least n_components
+        # rows, so a short last chunk is merged into the one before it
+        min_size = getattr(self._transformer, "n_components", None) or 0
+        return gen_batches(
+            n_rows, self._chunk_size, min_batch_size=min(min_size, n_rows)
+        )
+
+    def _chunked_transform(self, sub_X):
+        res = None
+        for rows in self._row_chunks(len(sub_X)):
+            values = self._transformer.transform(sub_X.iloc[rows].to_numpy())
+            if res is None:
+                res = np.empty(
+                    (len(sub_X), values.shape[1]), dtype=values.dtype
+                )
+            res[rows] = values
+        if res is None:
+            return self._transformer.transform(sub_X.to_numpy())
+        return res
+
+    def _decompose(self, sub_X, fit):
+        if getattr(self, "_chunk_size", None) is None:
+            if fit:
+                return self._transformer.fit_transform(sub_X.values)
+            return self._transformer.transform(sub_X.values)
+        if fit:
+            for rows in self._row_chunks(len(sub_X)):
+                self._transformer.partial_fit(sub_X.iloc[rows].to_numpy())
+        return self._chunked_transform(sub_X)
+
     def _fit_transform(self, X, verbose):
         self._columns_to_transform = self._get_columns(X, fit=True)
-        untransformed_cols = [
-            x for x in X.columns if x not in self._columns_to_transform
-        ]
         sub_X = X[self._columns_to_transform]
-        self._transformer = clone(self.transformer)
-        self._transformer = self._transformer.set_params(**self._kwargs)
+        self._transformer = self._new_transformer()
         try:
-            inter_X = self._transformer.fit_transform(sub_X.values)
-            n_cols = inter_X.shape[1]
-            columns = [self._lbl_format.format(i) for i in range(n_cols)]
-            inter_X = pd.DataFrame(
-                data=inter_X,
-                index=X.index,
-                columns=columns,
-            )
+            values = self._decompose(sub_X, fit=True)
         except Exception as e:
             raise PipelineApplicationError(
                 "Exception raised when Decompose applied to columns"
                 f" {self._columns_to_transform} by class {self.__class__}"
             ) from e
-        if self._drop:
-            if len(untransformed_cols) > 0:
-                untransformed = X[untransformed_cols]
-                inter_X = pd.concat([untransformed, inter_X], axis=1)
-        else:
-            inter_X = pd.concat([X, inter_X], axis=1)
         self.is_fitted = True
-        return inter_X
+        return self._insert_decomposed(X, values)
 
     def _transform(self, X, verbose):
-        untransformed_cols = [
-            x for x in X.columns if x not in self._columns_to_transform
-        ]
         sub_X = X[self._columns_to_transform]
         try:
-            inter_X = self._transformer.transform(sub_X.values)
-            n_cols = inter_X.shape[1]
-            columns = [self._lbl_format.format(i) for i in range(n_cols)]
-            inter_X = pd.DataFrame(
-                data=inter_X,
-                index=X.index,
-                columns=columns,
-            )
+            values = self._decompose(sub_X, fit=False)
         except Exception as e:
             raise PipelineApplicationError(
                 "Exception raised when Decompose applied to columns"
                 f" {self._columns_to_transform} by class {self.__class__}"
             ) from e
-        if self._drop:
-            if len(untransformed_cols) > 0:
-                untransformed = X[untransformed_cols]
-                inter_X = pd.concat([untransformed, inter_X], axis=1)
-        else:
-            inter_X = pd.concat([X, inter_X], axis=1)
-        return inter_X
+        return self._insert_decomposed(X, values)
+
+    def fit_chunks(self, chunks):
+        """Fit this stage to the rows of a sequence of dataframes.
+
+        The transformer is fitted to each dataframe in turn, through its
+        `partial_fit` method, so only one of them has to be in memory at a
+        time. Decomposed columns are chosen by the first dataframe.
+
+        Parameters
+        ----------
+        chunks : iterable of pandas.DataFrame
+            The dataframes to fit this stage to. Each should have at least as
+            many rows as the number of components of the transformer.
+
+        Returns
+        -------
+        Decompose
+            This stage, fitted.
+
+        """
+        if not hasattr(self.transformer, "partial_fit"):
+            raise ValueError(
+                "Decompose.fit_chunks requires a transformer with a "
+                f"partial_fit method; {self.transformer} has none."
+            )
+        transformer = self._new_transformer()
+        columns = None
+        for chunk in chunks:
+            if columns is None:
+                columns = self._get_columns(chunk, fit=True)
+            try:
+                transformer.partial_fit(chunk[columns].to_numpy())
+            except Exception as e:
+                raise PipelineApplicationError(
+                    "Exception raised when Decompose fitted to columns"
+                    f" {columns} by class {self.__class__}"
+                ) from e
+        if columns is None:
+            raise ValueError("Decompose.fit_chunks got no dataframes.")
+        self._columns_to_transform = columns
+        self._transformer = transformer
+        self.is_fitted = True
+        return self
 
 
 class EncodeLabel(PdPipelineStage):
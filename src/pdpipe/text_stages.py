@@ -1,15 +1,500 @@
 """Text processing pdpipe pipeline stages."""
 
 import re
-from typing import Optional
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype
 
 from pdpipe.col_generation import ApplyByCols
+from pdpipe.core import _FusedStages
 from pdpipe.pdp_types import ColumnLabelsType, ColumnsParamType
+from pdpipe.shared import _FlatTokenLists, _keep_tokens_not_in
+
+
+class _TokenFilterStage:
+    """A mixin for pipeline stages which only drop tokens from token lists.
+
+    Such stages transform columns of token lists in place, keeping some of
+    the tokens of each list, in order. Where possible, they do so over the
+    flattened representation of token-list columns, by a boolean mask over
+    their vocabulary (see `pdpipe.shared._FlatTokenLists`). A pipeline applies
+    runs of consecutive token-filtering stages together, converting columns
+    to their flattened representation and back just once for the whole run
+    (see `_FusedTokenFilters`).
+
+    """
+
+    def _token_mask(
+        self,
+        tokens: _FlatTokenLists,
+        label: object,
+        fit: bool,
+    ) -> Optional[np.ndarray]:
+        """Return a boolean mask of the vocabulary tokens to keep.
+
+        Parameters
+        ----------
+        tokens : pdpipe.shared._FlatTokenLists
+            The flattened token lists of a column.
+        label : object
+            The label of the column.
+        fit : bool
+            Whether this stage is being fitted.
+
+        Returns
+        -------
+        np.ndarray, optional
+            A boolean mask over tokens.vocabulary, True for tokens to keep,
+            or None if this stage can't filter the given tokens by a mask.
+
+        """
+        raise NotImplementedError
+
+    def _filter_token_col(
+        self,
+        series: pd.Series,
+        label: object,
+        fit: bool,
+    ) -> pd.Series:
+        """Return the given column of token lists with tokens filtered.
+
+        Used for columns which can't be flattened, or filtered by a mask.
+
+        """
+        raise NotImplementedError
+
+    def _filter_tokens(
+        self,
+        series: pd.Series,
+        label: object,
+        fit: bool,
+    ) -> pd.Series:
+        flat = _FlatTokenLists.from_series(series)
+        if flat is not None:
+            keep = self._token_mask(flat, label, fit)
+            if keep is not None:
+                return flat.filter(keep).to_series()
+        return self._filter_token_col(series, label, fit)
+
+    def _fused_run_type(self):
+        if (
+            getattr(self, "_drop", True)
+            and getattr(self, "_result_columns", None) is None
+            and _FusedStages._is_fusable(self)
+        ):
+            return _FusedTokenFilters
+        return None
+
+
+class _FusedTokenFilters(_FusedStages):
+    """A run of consecutive token-filtering stages of a pipeline, fused.
+
+    Each column filtered by stages of the run is flattened once, filtered by
+    the masks of all stages transforming it, and converted back to a column
+    of lists once, after the last stage of the run.
+
+    Parameters
+    ----------
+    stages : list of PdPipelineStage
+        The stages of the run, all of which are token-filtering stages.
+    start : int
+        The index of the first stage of the run in its pipeline.
+
+    """
+
+    def _apply_stage(self, stage, X, columns, verbose, fit):
+        if columns is None:
+            columns = {}
+        for label in stage._get_columns(X, fit=fit):
+            tokens = columns.get(label)
+            if tokens is None:
+                tokens = _FlatTokenLists.from_series(X[label])
+                if tokens is None:
+                    tokens = X[label]
+            if isinstance(tokens, _FlatTokenLists):
+                keep = stage._token_mask(tokens, label, fit)
+                if keep is None:
+                    tokens = tokens.to_series()
+                else:
+                    tokens = tokens.filter(keep)
+            if isinstance(tokens, pd.Series):
+                tokens = stage._filter_token_col(tokens, label, fit)
+            columns[label] = tokens
+        return columns
+
+    def _finish(self, X, y, columns):
+        if not columns:
+            return X, y
+        for label, tokens in columns.items():
+            if isinstance(tokens, _FlatTokenLists):
+                columns[label] = tokens.to_series()
+        return self._with_columns(X, columns), y
+
+
+class _TokenFilterByCols(_TokenFilterStage, ApplyByCols):
+    """An ApplyByCols stage filtering the tokens of token-list columns.
+
+    The applied function must have a keep_tokens method, which, given an
+    object array of distinct tokens, returns a boolean array, True for tokens
+    to keep, or None if it can't.
+
+    """
+
+    def _token_mask(self, tokens, label, fit):
+        return self._func.keep_tokens(tokens.vocabulary)
+
+    def _filter_token_col(self, series, label, fit):
+        return super()._col_transform(series, label)
+
+    def _col_transform(
+        self,
+        series,
+        label,
+        fit_context=None,
+        application_context=None,
+    ):
+        return self._filter_tokens(series, label, fit=False)
+
+
+def _token_lengths(vocabulary):
+    return np.fromiter(map(len, vocabulary), dtype=np.int64)
+
+
+def _is_all_str(series: pd.Series) -> bool:
+    """Return True if all values of the given series are strings."""
+    if isinstance(series.dtype, pd.StringDtype):
+        return not series.hasnans
+    return series.dtype == object and infer_dtype(series, skipna=False) in (
+        "string",
+        "empty",
+    )
+
+
+def _is_all_ascii(series: pd.Series) -> bool:
+    """Return True if all strings of the given series are ASCII strings."""
+    if getattr(series.dtype, "storage", None) != "pyarrow":
+        return False
+    return bool(series.str.isascii().all())
+
+
+# regex flags which can be passed inline, at the start of a pattern
+_INLINE_FLAGS = [(re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s")]
+
+# escapes of character classes, which are ASCII-only in RE2; those of
+# whitespace differ even over ASCII strings, and are thus not included
+_CLASS_ESCAPES = frozenset("wWdDbB")
+
+# escapes of single characters, meaning the same in Python's re and in RE2
+_CHAR_ESCAPES = frozenset("afnrtv")
+
+# group references RE2 rewrite strings support as Python's re does
+_GROUP_REFERENCES = frozenset("123456789")
+
+# zero-width assertions; a pattern matching the empty string once these are
+# removed can match the empty string somewhere
+_ASSERTIONS = frozenset(["^", "\\b", "\\B", "\\A", "\\Z"])
+
+# alternations with an empty branch, in patterns with escapes removed
+_EMPTY_BRANCH = re.compile(r"(^|[(|])\||\|($|\))")
+
+
+def _can_match_empty(pattern: str) -> bool:
+    """Return True if a regex pattern might match the empty string."""
+    if _EMPTY_BRANCH.search(re.sub(r"\\.", "x", pattern, flags=re.DOTALL)):
+        return True
+    stripped = re.sub(
+        r"\\.|\^",
+        lambda m: "" if m.group(0) in _ASSERTIONS else m.group(0),
+        pattern,
+        flags=re.DOTALL,
+    )
+    try:
+        return re.fullmatch(stripped, "") is not None
+    except re.error:
+        return True
+
+
+def _is_re2_compatible(pattern: str, replace: str, ascii_only: bool) -> bool:
+    """Return True if a regex replacement is the same in Python's re and RE2.
+
+    pyarrow compute uses RE2 regexes, which differ from those of Python's re
+    in several ways: their character class escapes match only ASCII
+    characters, their `$` matches only at the end of the text, POSIX
+    character classes are supported, empty matches adjacent to previous
+    matches are skipped, lookaround assertions and backreferences are not
+    supported, and replacement strings support only single-digit group
+    references. The check is conservative, so some compatible replacements
+    are reported as not.
+
+    Parameters
+    ----------
+    pattern : str
+        The pattern of the regex replacement.
+    replace : str
+        The replacement string of the regex replacement.
+    ascii_only : bool
+        Whether the replacement is applied only to ASCII strings.
+
+    Returns
+    -------
+    bool
+        True if the regex replacement is known to give the same results when
+        performed by Python's re and by RE2.
+
+    """
+    if "$" in pattern or "(?" in pattern or "[:" in pattern:
+        return False
+    if _can_match_empty(pattern):
+        return False
+    escapes = re.findall(r"\\(.)", pattern, flags=re.DOTALL)
+    for char in escapes:
+        if char in _CLASS_ESCAPES:
+            if not ascii_only:
+                return False
+        elif char.isalnum() and char not in _CHAR_ESCAPES:
+            return False
+    # group references only, of a single digit: not \0 or octal escapes
+    return all(
+        ref in _GROUP_REFERENCES
+        for ref in re.findall(r"\\(\d+|.)", replace, flags=re.DOTALL)
+    )
+
+
+# characters with a special meaning in regex patterns
+_REGEX_SPECIAL_CHARS = frozenset(".^$*+?{}[]\\|()")
+
+
+def _literal_of(replacer) -> Optional[str]:
+    """Return the pattern of a regex replacer, if it replaces a literal."""
+    pattern = replacer.pattern_str
+    if (
+        not pattern
+        or replacer.flags & ~re.UNICODE
+        or "\\" in replacer.replace_text
+        or not _REGEX_SPECIAL_CHARS.isdisjoint(pattern)
+    ):
+        return None
+    return pattern
+
+
+def _can_overlap(first: str, second: str) -> bool:
+    """Return True if occurrences of two literals in a string can overlap."""
+    if first in second or second in first:
+        return True
+    return any(
+        first.endswith(second[:i]) or second.endswith(first[:i])
+        for i in range(1, min(len(first), len(second)))
+    )
+
+
+def _can_join(group: dict, literal: str) -> bool:
+    """Return True if a literal replacement can join a single-pass group.
+
+    Replacing the literals of a group in a single pass, by an alternation, is
+    equivalent to replacing them one after the other if occurrences of
+    different literals can't overlap, and if the replacements of earlier
+    literals can't create occurrences of later ones; i.e. if they are not
+    empty, and share no characters with later literals.
+
+    """
+    return literal not in group and all(
+        replace
+        and set(literal).isdisjoint(replace)
+        and not _can_overlap(other, literal)
+        for other, replace in group.items()
+    )
+
+
+class _LiteralDispatch(object):
+    """A pickle-able replacement function, by a table of literal matches."""
+
+    def __init__(self, table: dict) -> None:
+        self.table = table
+
+    def __call__(self, match) -> str:
+        return self.table[match.group()]
+
+
+# the least number of literal replacements joined into a single alternation;
+# fewer are faster applied one by one, by str.replace
+_MIN_ALTERNATION_SIZE = 16
+
+
+def _compile_passes(replacers: list) -> list:
+    """Compile regex replacers into passes over strings.
+
+    Replacements of plain literals are applied by str.replace. Long runs of
+    consecutive literal replacements are joined into a single alternation,
+    whenever that is equivalent to applying them one after the other; see
+    `_can_join`.
+
+    Parameters
+    ----------
+    replacers : list of RegexReplace._RegexReplacer
+        The regex replacements to apply, in order.
+
+    Returns
+    -------
+    list of tuple
+        The (pattern, replacement) pairs of the passes, in order. Patterns
+        are either compiled regexes or literal strings.
+
+    """
+    passes = []
+    group = {}
+    for replacer in replacers + [None]:
+        literal = None if replacer is None else _literal_of(replacer)
+        if literal is not None and _can_join(group, literal):
+            group[literal] = replacer.replace_text
+            continue
+        if len(group) >= _MIN_ALTERNATION_SIZE:
+            pattern = "|".join(re.escape(other) for other in group)
+            passes.append((re.compile(pattern), _LiteralDispatch(group)))
+        else:
+            passes.extend(group.items())
+        group = {}
+        if literal is not None:
+            group[literal] = replacer.replace_text
+        elif replacer is not None:
+            passes.append((replacer.pattern_obj, replacer.replace_text))
+    return passes
+
+
+class _MultiRegexReplacer(object):
+    """A pickle-able function applying an ordered list of regex replacements.
+
+    Parameters
+    ----------
+    replacers : list of RegexReplace._RegexReplacer
+        The regex replacements to apply, in order.
+
+    """
+
+    def __init__(self, replacers: list) -> None:
+        self.replacers = replacers
+        self.passes = _compile_passes(replacers)
+
+    def __call__(self, string: str):
+        for pattern, replace in self.passes:
+            if isinstance(pattern, str):
+                string = string.replace(pattern, replace)
+            else:
+                string = pattern.sub(replace, string)
+        return string
+
+    def replace_series(self, series: pd.Series) -> Optional[pd.Series]:
+        """Apply all regex replacements to a whole series of strings.
+
+        Returns None if the series holds values other than strings, which
+        are thus left to element-wise replacement.
+
+        """
+        if not _is_all_str(series):
+            return None
+        if getattr(series.dtype, "storage", None) == "pyarrow":
+            ascii_only = _is_all_ascii(series)
+            if all(
+                replacer._is_re2_compatible(ascii_only)
+                for replacer in self.replacers
+            ):
+                # pyarrow compute kernels beat a single pass in Python
+                for replacer in self.replacers:
+                    series = replacer.replace_series(series, ascii_only)
+                return series
+        values = [self(string) for string in series]
+        dtype = None
+        if isinstance(series.dtype, pd.StringDtype):
+            dtype = series.dtype
+        return pd.Series(
+            values, index=series.index, name=series.name, dtype=dtype
+        )
+
+
+class _FusedRegexReplaces(_FusedStages):
+    """A run of consecutive regex-replacing stages of a pipeline, fused.
+
+    The regex replacements of all stages of the run transforming a column are
+    compiled together, and applied to each of its values in a single
+    traversal of the column.
+
+    Parameters
+    ----------
+    stages : list of PdPipelineStage
+        The stages of the run, all of which are regex-replacing stages.
+    start : int
+        The index of the first stage of the run in its pipeline.
+
+    """
+
+    def _apply_stage(self, stage, X, replacers, verbose, fit):
+        if replacers is None:
+            replacers = {}
+        for label in stage._get_columns(X, fit=fit):
+            replacers.setdefault(label, []).extend(stage._replacers())
+        return replacers
+
+    def _finish(self, X, y, replacers):
+        if not replacers:
+            return X, y
+        columns = {}
+        for label, column_replacers in replacers.items():
+            replacer = _MultiRegexReplacer(column_replacers)
+            res = replacer.replace_series(X[label])
+            if res is None:
+                res = X[label].apply(replacer)
+            columns[label] = res
+        return self._with_columns(X, columns), y
+
+
+class _RegexReplaceByCols(ApplyByCols):
+    """An ApplyByCols stage replacing regex occurrences in text columns.
+
+    The applied function must have a replace_series method, transforming a
+    whole series, or returning None if it can't. Runs of consecutive such
+    stages transforming columns in place are fused by pipelines; see
+    `_FusedRegexReplaces`.
+
+    """
+
+    def _replacers(self) -> list:
+        """Return the regex replacements of this stage, in order."""
+        raise NotImplementedError
 
+    def _fused_run_type(self):
+        if (
+            self._drop
+            and self._result_columns is None
+            and _FusedStages._is_fusable(self)
+        ):
+            return _FusedRegexReplaces
+        return None
 
-class RegexReplace(ApplyByCols):
+    def _col_transform(
+        self,
+        series,
+        label,
+        fit_context=None,
+        application_context=None,
+    ):
+        res = self._func.replace_series(series)
+        if res is not None:
+            return res
+        return super()._col_transform(
+            series, label, fit_context, application_context
+        )
+
+
+class RegexReplace(_RegexReplaceByCols):
     """A pipeline stage replacing regex occurrences in a text column.
 
+    Columns holding only strings are transformed as a whole, by the vectorized
+    `Series.str.replace`; for columns of pyarrow-backed strings, pandas then
+    uses the regex kernels of pyarrow compute, unless the replacement might
+    give different results with them than with Python's re. Columns holding
+    other values are transformed value by value.
+
     Parameters
     ----------
     columns : single label, list-like or callable
@@ -74,6 +559,54 @@ class RegexReplace(ApplyByCols):
         def __call__(self, string: str):
             return self.pattern_obj.sub(self.replace_text, string)
 
+        def _is_re2_compatible(self, ascii_only: bool) -> bool:
+            return _is_re2_compatible(
+                self.pattern_str, self.replace_text, ascii_only
+            )
+
+        def _str_replace_args(self, dtype, ascii_only=False):
+            flags = self.flags
+            if getattr(dtype, "storage", None) != "pyarrow":
+                return self.pattern_str, flags
+            if not self._is_re2_compatible(ascii_only):
+                # pandas falls back to Python's re for compiled patterns
+                return self.pattern_obj, 0
+            if not flags:
+                return self.pattern_str, flags
+            # pandas uses pyarrow compute kernels only for patterns given
+            # without flags, so these are passed inline when possible
+            flags &= ~re.UNICODE
+            inline = ""
+            for flag, char in _INLINE_FLAGS:
+                if flags & flag:
+                    inline += char
+                    flags &= ~flag
+            if flags or not inline:
+                return self.pattern_str, self.flags
+            return f"(?{inline}){self.pattern_str}", 0
+
+        def replace_series(
+            self, series: pd.Series, ascii_only: Optional[bool] = None
+        ) -> Optional[pd.Series]:
+            """Replace regex occurrences in a whole series of strings.
+
+            Returns None if the series holds values other than strings, which
+            are thus left to element-wise replacement.
+
+            """
+            if not _is_all_str(series):
+                return None
+            if ascii_only is None:
+                ascii_only = _is_all_ascii(series)
+            pattern, flags = self._str_replace_args(series.dtype, ascii_only)
+            res = series.str.replace(
+                pattern, self.replace_text, flags=flags, regex=True
+            )
+            if series.dtype == object:
+                # as inferred for the results of element-wise replacement
+                return res.infer_objects()
+            return res
+
     def __init__(
         self,
         columns: ColumnsParamType,
@@ -102,8 +635,102 @@ class RegexReplace(ApplyByCols):
         super_kwargs.update(**kwargs)
         super().__init__(**super_kwargs)
 
+    def _replacers(self):
+        return [self._func]
+
+
+class MultiRegexReplace(_RegexReplaceByCols):
+    """A pipeline stage applying several regex replacements to text columns.
+
+    The replacements are applied in order, with the same results as a
+    sequence of RegexReplace stages, but each column is traversed just once,
+    applying all replacements to each value in turn. Replacements of plain
+    literals are applied by str.replace, and long runs of such, which can't
+    affect one another, are joined into a single alternation. Pipelines apply
+    runs of consecutive RegexReplace and MultiRegexReplace stages transforming
+    columns in place this way, too.
+
+    Parameters
+    ----------
+    columns : single label, list-like or callable
+        Column labels in the DataFrame which regex replacement be applied to.
+        Alternatively, this parameter can be assigned a callable returning an
+        iterable of labels from an input pandas.DataFrame. See `pdpipe.cq`.
+    replacements : list-like of tuples, or dict
+        The (pattern, replace) pairs of the regex replacements to apply, in
+        order, each equivalent to re.sub(pattern, replace, string). A dict
+        mapping patterns to replacement strings is also accepted.
+    flags : int, default 0
+        Regex flags that are compatible with Python's `re` module, used for
+        all patterns.
+    result_columns : label or list-like of labels, default None
+        The labels of the new columns resulting from the mapping operation.
+        Must be of the same length as columns. If None, behavior depends on the
+        drop parameter: If drop is True, the label of the source column is
+        used; otherwise, the label of the source column is casted to a string
+        and concatenated with the suffix '_regex'.
+    drop : bool, default True
+        If set to True, source columns are dropped after being transformed.
+    **kwargs : object
+        All PdPipelineStage constructor parameters are supported.
+
+    Examples
+    --------
+    >>> import pandas as pd; import pdpipe as pdp;
+    >>> data = [[4, "more than 12, or 5"], [5, "with 5 more"]]
+    >>> df = pd.DataFrame(data, [1,2], ["age","text"])
+    >>> clean = pdp.MultiRegexReplace(
+    ...    'text', [(r'\\b[0-9]+\\b', 'NUM'), (',', ''), ('more', 'less')]
+    ... )
+    >>> clean(df)
+       age                  text
+    1    4  less than NUM or NUM
+    2    5         with NUM less
+
+    """  # noqa: W605
+
+    def __init__(
+        self,
+        columns: ColumnsParamType,
+        replacements: Union[Iterable[Tuple[str, str]], dict],
+        flags: Optional[int] = 0,
+        result_columns: Optional[ColumnLabelsType] = None,
+        drop: Optional[bool] = True,
+        **kwargs,
+    ):
+        if isinstance(replacements, dict):
+            replacements = replacements.items()
+        self._replacements = [tuple(pair) for pair in replacements]
+        if any(len(pair) != 2 for pair in self._replacements):
+            raise ValueError(
+                "replacements must be (pattern, replace) pairs, or a dict!"
+            )
+        self._flags = flags
+        desc_temp = (
+            f"Applying {len(self._replacements)} regex replacements to "
+            "column {}"
+        )
+        super_kwargs = {
+            "columns": columns,
+            "func": _MultiRegexReplacer(
+                [
+                    RegexReplace._RegexReplacer(pattern, replace, flags)
+                    for pattern, replace in self._replacements
+                ]
+            ),
+            "suffix": "_regex",
+            "result_columns": result_columns,
+            "drop": drop,
+            "desc_temp": desc_temp,
+        }
+        super_kwargs.update(**kwargs)
+        super().__init__(**super_kwargs)
+
+    def _replacers(self):
+        return list(self._func.replacers)
+
 
-class DropTokensByLength(ApplyByCols):
+class DropTokensByLength(_TokenFilterByCols):
     """A pipeline stage removing tokens by length in string-token list columns.
 
     Parameters
@@ -149,6 +776,9 @@ class DropTokensByLength(ApplyByCols):
         def __call__(self, token_list):
             return [x for x in token_list if len(x) >= self.min_len]
 
+        def keep_tokens(self, vocabulary):
+            return _token_lengths(vocabulary) >= self.min_len
+
     class _MinMaxLengthTokenFilter(object):
         def __init__(self, min_len, max_len):
             self.min_len = min_len
@@ -161,6 +791,10 @@ class DropTokensByLength(ApplyByCols):
                 if len(x) >= self.min_len and len(x) <= self.max_len
             ]
 
+        def keep_tokens(self, vocabulary):
+            lengths = _token_lengths(vocabulary)
+            return (lengths >= self.min_len) & (lengths <= self.max_len)
+
     def __init__(
         self,
         columns,
@@ -193,7 +827,7 @@ class DropTokensByLength(ApplyByCols):
         super().__init__(**super_kwargs)
 
 
-class DropTokensByList(ApplyByCols):
+class DropTokensByList(_TokenFilterByCols):
     """A pipeline stage removing specific tokens in string-token list columns.
 
     Parameters
@@ -231,9 +865,24 @@ class DropTokensByList(ApplyByCols):
     class _ListTokenFilter(object):
         def __init__(self, bad_tokens):
             self.bad_tokens = bad_tokens
+            try:
+                self.bad_token_set = frozenset(bad_tokens)
+            except TypeError:  # unhashable tokens
+                self.bad_token_set = bad_tokens
 
         def __call__(self, token_list):
-            return [x for x in token_list if x not in self.bad_tokens]
+            # pickled filters might predate token sets
+            bad_tokens = getattr(self, "bad_token_set", self.bad_tokens)
+            try:
+                return [x for x in token_list if x not in bad_tokens]
+            except TypeError:  # unhashable tokens
+                return [x for x in token_list if x not in self.bad_tokens]
+
+        def keep_tokens(self, vocabulary):
+            bad_tokens = getattr(self, "bad_token_set", None)
+            if not isinstance(bad_tokens, frozenset):
+                return None
+            return _keep_tokens_not_in(vocabulary, list(bad_tokens))
 
     def __init__(
         self, columns, bad_tokens, result_columns=None, drop=True, **kwargs
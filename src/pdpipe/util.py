@@ -1,6 +1,6 @@
 """Utility methods for pdpipe."""
 
-from typing import Callable, List, Optional
+from typing import Callable, Hashable, List, Optional, Sequence, Union
 
 import numpy as np
 import pandas as pd
@@ -56,6 +56,124 @@ def out_of_place_col_insert(
     return inter_X.loc[:, cols]
 
 
+def _position_runs(positions: Sequence[int]) -> List[slice]:
+    """Return slices covering runs of consecutive positions, in order."""
+    runs = []
+    start = stop = None
+    for pos in positions:
+        if start is not None and pos == stop:
+            stop += 1
+            continue
+        if start is not None:
+            runs.append(slice(start, stop))
+        start, stop = pos, pos + 1
+    if start is not None:
+        runs.append(slice(start, stop))
+    return runs
+
+
+def replace_column_block(
+    X: pd.DataFrame,
+    columns: Sequence[Hashable],
+    values: Union[np.ndarray, pd.DataFrame],
+    result_columns: Optional[Sequence[Hashable]] = None,
+    loc: Optional[int] = None,
+) -> pd.DataFrame:
+    """Return a new dataframe with given columns replaced by a 2D block.
+
+    Columns not replaced are not copied; runs of them are sliced out of the
+    given dataframe and put together with the block in a single operation.
+
+    Parameters
+    ----------
+    X : pandas.DataFrame
+        The dataframe in which to replace columns.
+    columns : sequence of labels
+        The labels of the columns to replace.
+    values : numpy.ndarray or pandas.DataFrame
+        A 2D array with a row for each row of X, or a dataframe with the index
+        of X, whose columns are then picked by label. Its columns are used as
+        is, without copying.
+    result_columns : sequence of labels, optional
+        The labels of the columns of the block. If not given, the labels of the
+        replaced columns are used.
+    loc : int, optional
+        If not given, the block must have a column for each replaced column,
+        and each of them replaces its column at its location. If given, the
+        replaced columns are dropped, and the block is inserted at this
+        location among the remaining columns; e.g. 0 for the front, or the
+        number of remaining columns for the end.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The resulting dataframe.
+
+    Examples
+    --------
+        >>> import pandas as pd; import numpy as np; import pdpipe as pdp;
+        >>> data = [[1, 'a', 2], [4, 'b', 3]]
+        >>> df = pd.DataFrame(data, columns=['x', 'g', 'y'])
+        >>> values = np.array([[0.1, 0.2], [0.3, 0.4]])
+        >>> replace_column_block(df, ['x', 'y'], values)
+             x  g    y
+        0  0.1  a  0.2
+        1  0.3  b  0.4
+        >>> replace_column_block(df, ['x', 'y'], values, ['c0', 'c1'], loc=1)
+           g   c0   c1
+        0  a  0.1  0.2
+        1  b  0.3  0.4
+
+    """
+    columns = list(columns)
+    if result_columns is None:
+        result_columns = columns
+    block = pd.DataFrame(
+        values, index=X.index, columns=list(result_columns), copy=False
+    )
+    replaced = X.columns.isin(columns)
+    if loc is None:
+        if len(result_columns) != len(columns):
+            raise ValueError(
+                "A block replacing columns in place must have a column for "
+                "each replaced column."
+            )
+        block_loc = {lbl: i for i, lbl in enumerate(columns)}
+        pieces = []
+        passthrough = []
+        in_block = []
+        for pos, (lbl, is_replaced) in enumerate(zip(X.columns, replaced)):
+            if is_replaced:
+                if passthrough:
+                    pieces.append((X, passthrough))
+                    passthrough = []
+                in_block.append(block_loc[lbl])
+            else:
+                if in_block:
+                    pieces.append((block, in_block))
+                    in_block = []
+                passthrough.append(pos)
+        if passthrough:
+            pieces.append((X, passthrough))
+        if in_block:
+            pieces.append((block, in_block))
+    else:
+        passthrough = np.flatnonzero(~replaced).tolist()
+        pieces = [(X, passthrough[:loc]), None, (X, passthrough[loc:])]
+    frames = []
+    for piece in pieces:
+        if piece is None:
+            frames.append(block)
+            continue
+        frame, positions = piece
+        frames.extend(frame.iloc[:, run] for run in _position_runs(positions))
+    if not frames:
+        return block
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, axis=1)
+
+
 def get_numeric_column_names(X: pd.DataFrame) -> List[str]:
     """Return the names of all columns of numeric type.
 
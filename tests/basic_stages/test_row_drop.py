@@ -5,6 +5,7 @@ import pickle
 import pytest
 import pandas as pd
 
+import pdpipe as pdp
 from pdpipe.basic_stages import RowDrop
 from pdpipe.exceptions import FailedPreconditionError
 
@@ -124,3 +125,102 @@ def test_pickle_rowdrop(pdpipe_tests_dir_path):
     assert 1 not in res_df.index
     assert 2 in res_df.index
     assert 3 in res_df.index
+
+
+DF4 = pd.DataFrame(
+    data=[[1, 2.5, "ab", None], [0, None, "cd", 3], [18, 11.0, "ae", 4]],
+    index=[1, 2, 3],
+    columns=["a", "b", "c", "d"],
+)
+
+
+def _row_apply_drop(df, conditions, reduce="any", columns=None):
+    """The row-by-row semantics of RowDrop, used as reference."""
+    reducer = RowDrop._REDUCERS[reduce]
+    if isinstance(conditions, dict):
+        row_cond = RowDrop._DictRowCond(conditions, reducer)
+        sub_df = df[list(conditions)]
+    else:
+        row_cond = RowDrop._ListRowCond(conditions, reducer)
+        sub_df = df if columns is None else df[columns]
+    return df[~sub_df.apply(row_cond, axis=1)]
+
+
+@pytest.mark.parametrize("reduce", ["any", "all", "xor"])
+@pytest.mark.parametrize(
+    "conditions, columns",
+    [
+        ([lambda x: x < 3], ["a", "b"]),
+        ([lambda x: x < 3, lambda x: x > 10], ["a", "b"]),
+        ([lambda x: x is None], None),
+        ([lambda x: x in [1, 18]], ["a"]),
+        ([lambda x: x != x], ["b", "d"]),
+        ({"a": lambda x: x > 0, "c": lambda x: x.startswith("a")}, None),
+        ({"c": lambda x: len(x) > 1, "b": lambda x: x > 2}, None),
+    ],
+)
+def test_row_drop_matches_row_apply(conditions, columns, reduce):
+    expected = _row_apply_drop(DF4, conditions, reduce, columns)
+    for vectorized in ["auto", False]:
+        res_df = RowDrop(
+            conditions, reduce=reduce, columns=columns, vectorized=vectorized
+        ).apply(DF4)
+        pd.testing.assert_frame_equal(res_df, expected)
+
+
+class _CountingCond:
+    def __init__(self):
+        self.n_calls = 0
+
+    def __call__(self, x):
+        self.n_calls += 1
+        return x < 2
+
+
+def test_row_drop_vectorized_conditions():
+    cond = _CountingCond()
+    res_df = RowDrop([cond], columns=["a", "b"], vectorized=True).apply(DF1)
+    assert list(res_df.index) == [2, 3]
+    assert cond.n_calls == 2
+    res_df = RowDrop(
+        {"c": lambda s: s.str.endswith("e")}, vectorized=True
+    ).apply(DF4)
+    assert list(res_df.index) == [1, 2]
+    # cell conditions are detected
+    res_df = RowDrop(
+        {"c": lambda x: x.endswith("e")}, vectorized="auto"
+    ).apply(DF4)
+    assert list(res_df.index) == [1, 2]
+    # as are series conditions
+    res_df = RowDrop({"b": lambda s: s > s.mean()}, vectorized="auto").apply(
+        DF4
+    )
+    assert list(res_df.index) == [1, 2]
+    # which are called with each cell value by default
+    with pytest.raises(AttributeError):
+        RowDrop({"b": lambda s: s.mean() < s}).apply(DF4)
+
+
+def test_row_drop_row_qualifier_conditions():
+    qualifier = pdp.rq.ColValGt("a", 0) & pdp.rq.ColValLt("b", 5)
+    res_df = RowDrop([qualifier]).apply(DF4)
+    assert list(res_df.index) == [2, 3]
+    res_df = RowDrop(
+        [qualifier, lambda x: x == 11], columns=["b"], reduce="xor"
+    ).apply(DF4)
+    assert list(res_df.index) == [2]
+
+
+def test_row_drop_bad_vectorized():
+    with pytest.raises(ValueError):
+        RowDrop([lambda x: x < 2], vectorized="yes")
+
+
+def test_unpickled_old_rowdrop():
+    stage = RowDrop([_value_less_than_2])
+    del stage.__dict__["_vectorized"]
+    stage._row_cond = RowDrop._ListRowCond([_value_less_than_2], any)
+    stage = pickle.loads(pickle.dumps(stage))
+    assert isinstance(stage._row_cond, RowDrop._ListRowCond)
+    res_df = stage.apply(DF1)
+    assert list(res_df.index) == [2, 3]
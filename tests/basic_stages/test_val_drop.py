@@ -63,3 +63,16 @@ def test_pickle_valdrop(pdpipe_tests_dir_path):
     assert 1 in res_df.index
     assert 2 not in res_df.index
     assert 3 in res_df.index
+
+
+def test_valdrop_value_set_is_reused():
+    df = pd.DataFrame([[1, 4], [4, 5], [18, 11]], [1, 2, 3], ["a", "b"])
+    stage = ValDrop([4, 5], "a")
+    stage(df)
+    value_set = stage._value_set
+    res_df = stage.transform(df)
+    assert stage._value_set is value_set
+    assert res_df.index.tolist() == [1, 3]
+    # stages pickled before value sets were precompiled
+    del stage.__dict__["_value_set"]
+    assert stage.transform(df).index.tolist() == [1, 3]
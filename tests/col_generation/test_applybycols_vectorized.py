@@ -0,0 +1,135 @@
+"""Testing vectorization probing of ApplyByCols pipeline stages."""
+
+import math
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdpipe.col_generation import ApplyByCols
+
+
+class _CountingFunc:
+    def __init__(self, func):
+        self.func = func
+        self.n_calls = 0
+        self.n_series_calls = 0
+
+    def __call__(self, value, *args, **kwargs):
+        self.n_calls += 1
+        if isinstance(value, pd.Series):
+            self.n_series_calls += 1
+        return self.func(value, *args, **kwargs)
+
+
+def _df():
+    return pd.DataFrame(
+        {
+            "f": [3.2, 7.2, np.nan, 12.1, 1.0],
+            "d": [
+                "2020-01-01",
+                "2021-03-04",
+                None,
+                "2019-12-31",
+                "2020-02-02",
+            ],
+            "s": ["ab", "cd", "ef", "gh", "ij"],
+        },
+        index=[5, 3, 8, 1, 2],
+    )
+
+
+def test_vectorized_auto_uses_whole_series():
+    df = _df()
+    func = _CountingFunc(np.sqrt)
+    stage = ApplyByCols("f", func, vectorized="auto")
+    res = stage.fit_transform(df)
+    pd.testing.assert_series_equal(res["f"], np.sqrt(df["f"]))
+    assert stage._vectorized_choice == {"f": True}
+    # one whole-series call and a per-element sample
+    assert func.n_series_calls == 1
+    assert func.n_calls == 1 + len(df)
+    func.n_calls = 0
+    res = stage.transform(df)
+    assert func.n_calls == 1
+    pd.testing.assert_series_equal(res["f"], np.sqrt(df["f"]))
+
+
+def test_vectorized_auto_to_datetime():
+    df = _df()
+    stage = ApplyByCols("d", pd.to_datetime, vectorized="auto")
+    res = stage(df)
+    assert stage._vectorized_choice == {"d": True}
+    pd.testing.assert_series_equal(res["d"], pd.to_datetime(df["d"]))
+
+
+def test_vectorized_auto_falls_back():
+    df = _df()
+    # fails on whole series
+    stage = ApplyByCols("f", math.floor, vectorized="auto")
+    res = stage.fit_transform(df.dropna())
+    assert stage._vectorized_choice == {"f": False}
+    assert res["f"].tolist() == [3, 7, 12, 1]
+    # returns a single value for a whole series
+    stage = ApplyByCols("s", len, vectorized="auto")
+    res = stage(df)
+    assert stage._vectorized_choice == {"s": False}
+    assert res["s"].tolist() == [2] * 5
+    # means something else for a whole series
+    func = _CountingFunc(lambda x: x * 2 if isinstance(x, float) else x)
+    stage = ApplyByCols("f", func, vectorized="auto")
+    res = stage.fit_transform(df)
+    assert stage._vectorized_choice == {"f": False}
+    pd.testing.assert_series_equal(res["f"], df["f"] * 2)
+    func.n_series_calls = 0
+    stage.transform(df)
+    assert func.n_series_calls == 0
+    # a series of a different index
+    func = _CountingFunc(
+        lambda x: x.reset_index(drop=True) if isinstance(x, pd.Series) else x
+    )
+    stage = ApplyByCols("f", func, vectorized="auto")
+    res = stage(df)
+    pd.testing.assert_series_equal(res["f"], df["f"])
+    assert stage._vectorized_choice == {"f": False}
+
+
+def test_vectorized_auto_series_only_function():
+    df = _df()
+    stage = ApplyByCols("s", lambda s: s.str.upper(), vectorized="auto")
+    res = stage(df)
+    assert res["s"].tolist() == ["AB", "CD", "EF", "GH", "IJ"]
+    assert stage._vectorized_choice == {"s": True}
+
+
+def test_vectorized_auto_reprobed_on_fit():
+    df = _df()
+    stage = ApplyByCols("f", np.floor, vectorized="auto")
+    stage.fit(df)
+    stage._vectorized_choice["f"] = False
+    stage.transform(df)
+    assert stage._vectorized_choice == {"f": False}
+    stage.fit_transform(df)
+    assert stage._vectorized_choice == {"f": True}
+
+
+def test_vectorized_true_and_bad_values():
+    df = _df()
+    res = ApplyByCols("f", np.sqrt, vectorized=True)(df)
+    pd.testing.assert_series_equal(res["f"], np.sqrt(df["f"]))
+    with pytest.raises(TypeError):
+        ApplyByCols("f", math.floor, vectorized=True)(df)
+    with pytest.raises(ValueError):
+        ApplyByCols("f", np.sqrt, vectorized="yes")
+
+
+def test_vectorized_pickle_and_old_stages():
+    df = _df()
+    stage = ApplyByCols("f", np.sqrt, vectorized="auto")
+    res = stage(df)
+    stage2 = pickle.loads(pickle.dumps(stage))
+    assert stage2._vectorized_choice == {"f": True}
+    pd.testing.assert_frame_equal(stage2.transform(df), res)
+    del stage2.__dict__["_vectorized"]
+    pd.testing.assert_frame_equal(stage2.transform(df), res)
@@ -0,0 +1,180 @@
+"""Testing block-wise execution of Log, Diff and AggByCols stages."""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pdpipe as pdp
+from pdpipe import col_generation
+
+
+def _df(n_rows=50, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "i": rng.integers(-5, 10, n_rows),
+            "u": rng.integers(0, 10, n_rows).astype(np.uint8),
+            "f": rng.normal(5, 3, n_rows),
+            "g": rng.normal(5, 1, n_rows).astype(np.float32),
+            "b": rng.integers(0, 2, n_rows).astype(bool),
+            "j": rng.integers(1, 9, n_rows),
+            "n": pd.array(rng.integers(0, 9, n_rows), dtype="Int64"),
+            "s": rng.choice(["x", "y", "z"], n_rows),
+        },
+        index=rng.permutation(n_rows) * 2,
+    )
+    df.loc[df.index[::7], "f"] = np.nan
+    return df
+
+
+def _one_by_one(monkeypatch, stage_factory, df, y=None):
+    """Apply a stage, inserting transformed columns one by one."""
+    with monkeypatch.context() as m:
+        m.setattr(col_generation, "_transformed_layout", lambda *a: None)
+        stage = stage_factory()
+        return stage.fit_transform(df), stage.transform(df)
+
+
+def _check(monkeypatch, stage_factory, df):
+    expected_fit, expected = _one_by_one(monkeypatch, stage_factory, df)
+    stage = stage_factory()
+    pd.testing.assert_frame_equal(stage.fit_transform(df), expected_fit)
+    pd.testing.assert_frame_equal(stage.transform(df), expected)
+    return stage
+
+
+LOG_KWARGS = [
+    {},
+    {"drop": True},
+    {"non_neg": True},
+    {"non_neg": True, "drop": True},
+    {"const_shift": 2},
+    {"const_shift": 0.5, "non_neg": True},
+    {"const_shift": -0.5},
+]
+
+
+@pytest.mark.parametrize("kwargs", LOG_KWARGS)
+@pytest.mark.parametrize(
+    "columns", [None, ["f", "i", "g"], ["u", "b", "n"], ["g", "j"]]
+)
+def test_log_matches_one_by_one(monkeypatch, kwargs, columns):
+    df = _df()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        stage = _check(
+            monkeypatch,
+            lambda: pdp.Log(columns, suppress_warnings=True, **kwargs),
+            df,
+        )
+    if kwargs.get("non_neg") and "i" in (columns or ["i"]):
+        assert stage._col_to_minval["i"] == 5
+
+
+def test_log_non_neg_with_leading_nan(monkeypatch):
+    df = pd.DataFrame(
+        {"a": [np.nan, -3.0, 2.0], "b": [1.0, np.nan, -2.0], "c": [1, 2, 3]}
+    )
+    stage = _check(
+        monkeypatch,
+        lambda: pdp.Log(non_neg=True, const_shift=1, suppress_warnings=True),
+        df,
+    )
+    # as by the built-in min function
+    assert stage._col_to_minval == {"a": 0, "b": 2.0, "c": 0}
+
+
+def test_log_empty_dataframe(monkeypatch):
+    df = _df().iloc[:0]
+    _check(monkeypatch, lambda: pdp.Log(["f", "i"]), df)
+    with pytest.raises(ValueError):
+        pdp.Log(["f", "i"], non_neg=True)(df)
+
+
+@pytest.mark.parametrize("periods", [1, 2, -1])
+@pytest.mark.parametrize(
+    "columns", [["f", "i", "g"], ["u", "b", "n"], ["s"], ["j", "f"]]
+)
+def test_diff_matches_one_by_one(monkeypatch, periods, columns):
+    df = _df()
+    if columns == ["s"]:
+        with pytest.raises(TypeError):
+            pdp.Diff(columns, periods=periods)(df)
+        return
+    _check(monkeypatch, lambda: pdp.Diff(columns, periods=periods), df)
+    _check(
+        monkeypatch,
+        lambda: pdp.Diff(columns, periods=periods, drop=False),
+        df,
+    )
+
+
+# pandas ranks pyarrow-backed strings with options recent pyarrow deprecates
+@pytest.mark.filterwarnings("ignore:Specifying null_placement:FutureWarning")
+@pytest.mark.parametrize(
+    "func", ["min", "max", "sum", "mean", "std", "nunique", "cumsum", "rank"]
+)
+@pytest.mark.parametrize(
+    "columns", [["f", "i", "g", "j"], ["u", "b", "n"], ["s", "i"]]
+)
+def test_agg_matches_one_by_one(monkeypatch, func, columns):
+    df = _df()
+    try:
+        expected_fit, _ = _one_by_one(
+            monkeypatch, lambda: pdp.AggByCols(columns, func), df
+        )
+    except TypeError:
+        with pytest.raises(TypeError):
+            pdp.AggByCols(columns, func)(df)
+        return
+    _check(monkeypatch, lambda: pdp.AggByCols(columns, func), df)
+    _check(
+        monkeypatch,
+        lambda: pdp.AggByCols(columns, func, drop=False, suffix="_a"),
+        df,
+    )
+
+
+def test_agg_callable_and_result_columns(monkeypatch):
+    df = _df()
+    _check(monkeypatch, lambda: pdp.AggByCols(["i", "f"], np.cbrt), df)
+    _check(
+        monkeypatch,
+        lambda: pdp.AggByCols(["i", "f"], "min", result_columns=["f", "x"]),
+        df,
+    )
+    _check(
+        monkeypatch,
+        lambda: pdp.AggByCols(
+            ["i", "f"], "max", result_columns=["j", "i"], drop=False
+        ),
+        df,
+    )
+
+
+def test_transformed_layout():
+    labels = pd.Index(["a", "b", "c"])
+    layout = col_generation._transformed_layout
+    assert layout(labels, ["a", "b"], ["a", "b"], True) == ["a", "b", "c"]
+    assert layout(labels, ["a", "b"], ["x", "y"], False) == [
+        "a",
+        "x",
+        "y",
+        "b",
+        "c",
+    ]
+    assert layout(labels, ["a", "b"], ["b", "x"], True) == ["c", "x"]
+    assert layout(pd.Index(["a", "a"]), ["a"], ["b"], True) is None
+    assert layout(labels, ["a"], [1], True) is None
+
+
+def test_assembly_with_duplicate_index():
+    df = pd.DataFrame(
+        {"a": [1.0, 3.0, 6.0], "b": ["x", "y", "z"]}, index=[0, 0, 1]
+    )
+    res = pdp.Diff("a", drop=False)(df)
+    assert res.columns.tolist() == ["a", "a_diff", "b"]
+    assert res["a_diff"].tolist()[1:] == [2.0, 3.0]
+    assert res.index.tolist() == [0, 0, 1]
@@ -7,7 +7,7 @@ import pandas as pd
 import pytest
 from numpy.testing import assert_approx_equal
 
-from pdpipe import Log
+from pdpipe import Log, col_generation
 
 from pdptestutil import random_pickle_path
 
@@ -265,6 +265,23 @@ def test_log_with_verbose():
     assert_approx_equal(res_df["ph_log"][3], 2.493205, significant=5)
 
 
+@pytest.mark.log
+@pytest.mark.parametrize("column_wise", [False, True])
+def test_log_verbose_progress(column_wise, capsys, monkeypatch):
+    df = _some_df()
+    if column_wise:
+        monkeypatch.setattr(
+            col_generation, "_transformed_layout", lambda *args: None
+        )
+    log_stage = Log(drop=True)
+    log_stage(df)
+    assert "2/2" not in capsys.readouterr().err
+    fit_res = log_stage(df, verbose=True)
+    assert "2/2" in capsys.readouterr().err
+    pd.testing.assert_frame_equal(log_stage(df, verbose=True), fit_res)
+    assert "2/2" in capsys.readouterr().err
+
+
 @pytest.mark.log
 def test_log_drop():
     df = _some_df()
@@ -0,0 +1,93 @@
+"""Testing precompiled dict maps of MapColVals pipeline stages."""
+
+import collections
+import itertools
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdpipe.col_generation import MapColVals, _DictLookup
+
+SERIES = {
+    "int": pd.Series([1, 2, 3, 0], name="x"),
+    "float": pd.Series([1.0, np.nan, 2.5, 0.0]),
+    "bool": pd.Series([True, False, True, False]),
+    "str": pd.Series(["a", "b", None, "1"]),
+    "obj": pd.Series(["a", 1, None, 2.5], dtype=object),
+    "obj_na": pd.Series(["a", None, np.nan, None], dtype=object),
+    "cat": pd.Series(["a", "b", "a", None], dtype="category"),
+    "dt": pd.Series(pd.to_datetime(["2020-01-01", "2021-01-01", None])),
+    "Int64": pd.Series([1, None, 3, 0], dtype="Int64"),
+}
+
+MAPS = [
+    {},
+    {1: "a", 2: "b"},
+    {1: 1, 2: 2},
+    {1: 1.5},
+    {"a": 1, "b": 2},
+    {"a": "A"},
+    {np.nan: 0, 1: 1},
+    {None: 5, "a": 1},
+    {None: "n"},
+    {np.nan: "nan"},
+    {True: "t"},
+    {(1, 2): 3},
+    {1: [1], 2: None},
+    {1: True, 2: False},
+    {pd.Timestamp("2020-01-01"): 1},
+    {"a": pd.Timestamp("2020-01-01")},
+]
+
+
+@pytest.mark.parametrize(
+    "label, mapping", list(itertools.product(SERIES, range(len(MAPS))))
+)
+def test_dict_map_matches_pandas(label, mapping):
+    series = SERIES[label]
+    mapping = MAPS[mapping]
+    df = series.rename("col").to_frame()
+    stage = MapColVals("col", mapping)
+    expected = df["col"].map(mapping)
+    res = stage(df)
+    pd.testing.assert_series_equal(res["col"], expected)
+    pd.testing.assert_series_equal(stage.transform(df)["col"], expected)
+
+
+def test_dict_lookup_is_reused():
+    df = pd.DataFrame({"a": [1, 2, 3], "b": [3, 2, 1]})
+    mapping = {1: "x", 2: "y"}
+    stage = MapColVals(["a", "b"], mapping)
+    stage.fit_transform(df)
+    lookup = stage._dict_lookup
+    assert isinstance(lookup, _DictLookup)
+    assert stage.transform(df)["b"].tolist() == [np.nan, "y", "x"]
+    assert stage._dict_lookup is lookup
+    # maps modified in place are recompiled on fit
+    mapping[3] = "z"
+    res = stage.fit_transform(df)
+    assert stage._dict_lookup is not lookup
+    assert res["a"].tolist() == ["x", "y", "z"]
+    # and pickled with their stage
+    loaded = pickle.loads(pickle.dumps(stage))
+    pd.testing.assert_frame_equal(loaded.transform(df), res)
+    del loaded.__dict__["_dict_lookup"]
+    pd.testing.assert_frame_equal(loaded.transform(df), res)
+
+
+def test_dict_with_default_is_mapped_by_pandas():
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    mapping = collections.defaultdict(lambda: "d", {1: "x"})
+    res = MapColVals("a", mapping)(df)
+    assert res["a"].tolist() == ["x", "d", "d"]
+
+
+def test_swapped_dict_map_is_recompiled():
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    stage = MapColVals("a", {1: "x"})
+    stage(df)
+    # as contextual parameters are swapped with their values
+    stage._applied_value_map = {1: "y"}
+    assert stage.transform(df)["a"].tolist() == ["y", np.nan, np.nan]
@@ -0,0 +1,150 @@
+"""Testing unique-value memoized execution of column transformations."""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pdpipe as pdp
+from pdpipe.col_generation import ApplyByCols, MapColVals
+
+
+class _CountingFunc:
+    def __init__(self, func):
+        self.func = func
+        self.n_calls = 0
+
+    def __call__(self, value, *args, **kwargs):
+        self.n_calls += 1
+        return self.func(value, *args, **kwargs)
+
+
+def _df(n_rows=500, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "i": rng.integers(0, 5, n_rows),
+            "f": rng.choice([0.5, 1.5, np.nan], n_rows),
+            "s": rng.choice(["ab", "cd", "ef", None], n_rows),
+        },
+        index=np.arange(n_rows) * 2,
+    )
+    return df
+
+
+@pytest.mark.parametrize(
+    "func",
+    [
+        lambda v: v * 2,
+        lambda v: None if v == 3 else v,
+        lambda v: [v],
+        lambda v: (v, v),
+        lambda v: v > 2,
+        lambda v: str(v),
+        lambda v: {"v": v},
+        lambda v: pd.Timestamp(2020, 1, 1) + pd.Timedelta(days=v),
+    ],
+)
+def test_apply_memoized_matches_apply(func):
+    df = _df()
+    expected = ApplyByCols("i", func).apply(df)
+    counted = _CountingFunc(func)
+    res = ApplyByCols("i", counted, memoize="unique").apply(df)
+    assert counted.n_calls == 5
+    pd.testing.assert_frame_equal(res, expected)
+
+
+def test_apply_memoized_missing_values():
+    df = _df()
+    expected = ApplyByCols(["f", "s"], lambda v: repr(v)).apply(df)
+    counted = _CountingFunc(lambda v: repr(v))
+    res = ApplyByCols(["f", "s"], counted, memoize="unique").apply(df)
+    pd.testing.assert_frame_equal(res, expected)
+    assert counted.n_calls == 3 + 4
+
+
+def test_memoized_mixed_object_values_are_not_merged():
+    df = pd.DataFrame(
+        {"o": pd.Series([1, True, 1.0, None, np.nan], dtype=object)}
+    )
+    expected = ["1", "True", "1.0", "None", "nan"]
+    res = ApplyByCols("o", repr, memoize="unique")(df)
+    assert res["o"].tolist() == expected
+    res = MapColVals("o", repr, memoize="unique")(df)
+    assert res["o"].tolist() == expected
+    df = pd.DataFrame({"o": pd.Series(["a", None, "a"], dtype=object)})
+    res = ApplyByCols("o", repr, memoize="unique")(df)
+    assert res["o"].tolist() == ["'a'", "None", "'a'"]
+
+
+def test_apply_memoized_args_and_kwargs():
+    df = _df()
+    counted = _CountingFunc(lambda v, a, b=0: v * a + b)
+    res = ApplyByCols("i", counted, args=(3,), b=1, memoize="unique")(df)
+    assert counted.n_calls == 5
+    assert res["i"].tolist() == (df["i"] * 3 + 1).tolist()
+
+
+def test_memoized_unhashable_values_fall_back():
+    df = pd.DataFrame({"t": [["a"], ["b", "c"], ["a"]]})
+    res = ApplyByCols("t", len, memoize="unique")(df)
+    assert res["t"].tolist() == [1, 2, 1]
+    res = MapColVals("t", len, memoize="unique")(df)
+    assert res["t"].tolist() == [1, 2, 1]
+
+
+def test_memoized_category_column():
+    df = _df()
+    df["c"] = df["s"].astype("category")
+    expected = ApplyByCols("c", str.upper).apply(df.fillna({"c": "ab"}))
+    counted = _CountingFunc(str.upper)
+    res = ApplyByCols("c", counted, memoize="unique").apply(
+        df.fillna({"c": "ab"})
+    )
+    pd.testing.assert_frame_equal(res, expected)
+    assert isinstance(res["c"].dtype, pd.CategoricalDtype)
+    assert counted.n_calls <= 3
+
+
+def test_map_memoized():
+    df = _df()
+    counted = _CountingFunc(lambda v: v + 1)
+    stage = MapColVals("i", counted, memoize="unique")
+    res = stage(df)
+    assert counted.n_calls == 5
+    pd.testing.assert_frame_equal(res, MapColVals("i", lambda v: v + 1)(df))
+    # dict maps are left to pandas
+    res = MapColVals("i", {1: "a", 2: "b"}, memoize="unique")(df)
+    assert res["i"].tolist() == df["i"].map({1: "a", 2: "b"}).tolist()
+    # method maps
+    res = MapColVals("s", ("upper", {}), memoize="unique")(df[["s"]].dropna())
+    assert res["s"].tolist() == df["s"].dropna().str.upper().tolist()
+
+
+def test_tokenize_text_memoized():
+    nltk = pytest.importorskip("nltk")
+    try:
+        nltk.word_tokenize("a b")
+    except LookupError:
+        pytest.skip("NLTK tokenizer data is not available.")
+    df = pd.DataFrame({"txt": ["a b", "c", "a b", "c", "a b"]})
+    res = pdp.TokenizeText("txt", memoize="unique")(df)
+    assert res["txt"].tolist() == [["a", "b"], ["c"]] * 2 + [["a", "b"]]
+    assert res["txt"][0] is res["txt"][2]
+
+
+def test_bad_memoize():
+    with pytest.raises(ValueError):
+        ApplyByCols("i", abs, memoize="all")
+    with pytest.raises(ValueError):
+        MapColVals("i", abs, memoize=True)
+
+
+def test_memoized_pickle_and_old_stages():
+    df = _df()
+    stage = ApplyByCols("i", abs, memoize="unique")
+    stage2 = pickle.loads(pickle.dumps(stage))
+    pd.testing.assert_frame_equal(stage2(df), stage(df))
+    del stage2.__dict__["_memoize"]
+    pd.testing.assert_frame_equal(stage2(df), stage(df))
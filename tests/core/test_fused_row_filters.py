@@ -0,0 +1,147 @@
+"""Testing the fused application of consecutive row-filtering stages."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pdpipe as pdp
+from pdpipe.core import _FusedRowFilters
+from pdpipe.exceptions import PipelineApplicationError
+
+
+def _df(n_rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "a": rng.integers(0, 10, n_rows),
+            "b": rng.normal(0, 1, n_rows),
+            "c": rng.choice(
+                ["x", "y", "z", "w"], n_rows, p=[0.5, 0.3, 0.15, 0.05]
+            ),
+        },
+        index=rng.permutation(n_rows) * 2,
+    )
+    df.loc[df.index[::9], "b"] = np.nan
+    df.loc[df.index[::13], "a"] = 5
+    return df
+
+
+def _stages():
+    return [
+        pdp.ValDrop([1, 2], "a"),
+        pdp.ValKeep(["x", "y", "w"], "c"),
+        pdp.DropNa(),
+        pdp.FreqDrop(20, "c"),
+        pdp.fly.DropRowsByQualifier(pdp.rq.ColValGt("b", 1.5)),
+        pdp.fly.KeepRowsByQualifier(
+            pdp.rq.ColValNe("c", "z") | pdp.rq.ColValLt("a", 8)
+        ),
+        pdp.ValDrop([7]),
+    ]
+
+
+def _sequential(stages, df, y=None):
+    inter_X, inter_y = df, y
+    for stage in stages:
+        if y is None:
+            inter_X = stage.apply(inter_X)
+        else:
+            inter_X, inter_y = stage.apply(inter_X, inter_y)
+    if y is None:
+        return inter_X
+    return inter_X, inter_y
+
+
+def test_consecutive_row_filters_are_fused():
+    pipeline = pdp.PdPipeline(
+        [pdp.ColRename({"a": "a"})] + _stages() + [pdp.ColDrop("b")]
+    )
+    units = list(pipeline._application_units())
+    assert len(units) == 3
+    index, unit = units[1]
+    assert index == 1
+    assert isinstance(unit, _FusedRowFilters)
+    assert len(unit.stages) == 7
+
+
+def test_fused_run_matches_sequential_application():
+    df = _df()
+    expected = _sequential(_stages(), df)
+    pipeline = pdp.PdPipeline(_stages())
+    res = pipeline.fit_transform(df)
+    pd.testing.assert_frame_equal(res, expected)
+    # frequencies are counted over rows kept by preceding filters
+    assert len(res) < len(_sequential(_stages()[3:], df))
+    pd.testing.assert_frame_equal(pipeline.transform(df), expected)
+    assert all(stage.is_fitted for stage in pipeline)
+
+
+def test_fused_run_with_labels():
+    df = _df()
+    y = pd.Series(np.arange(len(df)), index=df.index)
+    expected_X, expected_y = _sequential(_stages(), df, y)
+    res_X, res_y = pdp.PdPipeline(_stages()).fit_transform(df, y)
+    pd.testing.assert_frame_equal(res_X, expected_X)
+    pd.testing.assert_series_equal(res_y, expected_y)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"how": "all"}, {"thresh": 2}, {"subset": ["b"]}, {"subset": "b"}],
+)
+def test_fused_dropna_variants(kwargs):
+    df = _df()
+    df.loc[df.index[::11], ["a", "b"]] = np.nan
+    stages = [pdp.DropNa(**kwargs), pdp.ValDrop([3], "a")]
+    pd.testing.assert_frame_equal(
+        pdp.PdPipeline(stages).apply(df), _sequential(stages, df)
+    )
+
+
+def test_unfusable_stages_are_applied_separately():
+    stages = [
+        pdp.ValDrop([1], "a"),
+        pdp.ValDrop([2], pdp.cq.WithoutMissingValues()),
+        pdp.fly.DropRowsByQualifier(
+            pdp.rq.RowQualifier(lambda X: X["b"] > X["b"].mean())
+        ),
+        pdp.ValDrop([3], "a", prec=lambda X: True),
+        pdp.ValDrop([4], "a"),
+        pdp.DropNa(axis=1),
+    ]
+    pipeline = pdp.PdPipeline(stages)
+    units = list(pipeline._application_units())
+    assert len(units) == len(stages)
+    df = _df()
+    pd.testing.assert_frame_equal(pipeline.apply(df), _sequential(stages, df))
+
+
+def test_failed_preconditions_in_fused_run():
+    df = _df()
+    stages = [
+        pdp.ValDrop([1], "a"),
+        pdp.FreqDrop(20, "nope", exraise=False),
+        pdp.ValDrop([2], "a"),
+    ]
+    res = pdp.PdPipeline(stages).apply(df)
+    assert not res["a"].isin([1, 2]).any()
+    stages[1] = pdp.FreqDrop(20, "nope")
+    with pytest.raises(PipelineApplicationError, match=r"\[ 1\] .*nope"):
+        pdp.PdPipeline(stages).apply(df)
+
+
+def test_fused_run_verbose(capsys):
+    df = pd.DataFrame({"a": [1, 2, 3, 4], "b": [1.0, None, 3.0, 4.0]})
+    pdp.PdPipeline([pdp.ValDrop([1], "a"), pdp.DropNa()]).apply(
+        df, verbose=True
+    )
+    out = capsys.readouterr().out
+    assert out.count("1 rows dropped.") == 2
+
+
+def test_val_drop_multiple_columns():
+    df = pd.DataFrame([[1, 4], [4, 5], [18, 11], [5, 1]], columns=["a", "b"])
+    res = pdp.ValDrop([4, 1]).apply(df)
+    assert res.index.tolist() == [2]
+    res = pdp.ValKeep([4, 5, 1, 11]).apply(df)
+    assert res.index.tolist() == [0, 1, 3]
@@ -0,0 +1,72 @@
+"""Test lazy loading of optional modules and stage attributes."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import pdpipe as pdp
+from pdpipe.core import _LAZY_STAGE_ATTRIBUTES
+
+
+def _run_python(code):
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={
+            **os.environ,
+            "PYTHONPATH": os.path.dirname(os.path.dirname(pdp.__file__)),
+        },
+    ).stdout.strip()
+
+
+def test_import_does_not_load_optional_libraries():
+    out = _run_python(
+        "import sys; import pdpipe; "
+        "print(any(m in sys.modules for m in ["
+        "'sklearn', 'nltk', 'pdpipe.sklearn_stages', 'pdpipe.nltk_stages', "
+        "'pdpipe.skintegrate']))"
+    )
+    assert out == "False"
+
+
+def test_lazy_module_attributes():
+    out = _run_python(
+        "import sys; import pdpipe as pdp; "
+        "scale = pdp.Scale; "
+        "print('pdpipe.sklearn_stages' in sys.modules, "
+        "'pdpipe.nltk_stages' in sys.modules, "
+        "scale.__module__)"
+    )
+    assert out == "True False pdpipe.sklearn_stages"
+
+
+def test_lazy_stage_attributes():
+    out = _run_python(
+        "import sys; import pdpipe as pdp; "
+        "pline = pdp.ColDrop('a').ValDrop([1], 'b').Scale('MinMaxScaler'); "
+        "print(len(pline), 'pdpipe.sklearn_stages' in sys.modules)"
+    )
+    assert out == "3 True"
+
+
+def test_stage_attributes_registry():
+    for name in ["ColDrop", "Scale", "TokenizeText", "FitOnly", "Log"]:
+        assert name in _LAZY_STAGE_ATTRIBUTES
+    assert "PdPipelineStage" not in _LAZY_STAGE_ATTRIBUTES
+
+
+def test_missing_attributes():
+    with pytest.raises(AttributeError, match="no attribute 'NotAStage'"):
+        pdp.ColDrop("a").NotAStage  # noqa: B018
+    with pytest.raises(AttributeError, match="no attribute 'NotAStage'"):
+        pdp.NotAStage  # noqa: B018
+
+
+def test_dir_lists_lazy_attributes():
+    names = dir(pdp)
+    for name in ["Scale", "TokenizeText", "skintegrate", "ColDrop"]:
+        assert name in names
@@ -0,0 +1,86 @@
+"""Test saving and loading pipelines to files."""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.decomposition import PCA
+
+import pdpipe as pdp
+from pdpipe.core import _MIN_OUT_OF_BAND_NBYTES
+
+
+def _big_df():
+    rng = np.random.default_rng(42)
+    n_cols = 100
+    n_rows = 2 * _MIN_OUT_OF_BAND_NBYTES // (8 * n_cols)
+    return pd.DataFrame(
+        rng.normal(size=(n_rows, n_cols)),
+        columns=[f"c{i}" for i in range(n_cols)],
+    )
+
+
+def _fitted_pipeline(df):
+    pipeline = pdp.PdPipeline(
+        [
+            pdp.Scale("StandardScaler"),
+            pdp.Decompose(PCA(), n_components=90),
+        ]
+    )
+    pipeline.fit(df)
+    return pipeline
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load(tmp_path, mmap):
+    df = _big_df()
+    pipeline = _fitted_pipeline(df)
+    path = str(tmp_path / "pipeline.pdp")
+    pipeline.save(path)
+    loaded = pdp.PdPipeline.load(path, mmap=mmap)
+    assert isinstance(loaded, pdp.PdPipeline)
+    assert loaded.is_fitted
+    assert len(loaded) == len(pipeline)
+    pd.testing.assert_frame_equal(loaded.transform(df), pipeline.transform(df))
+
+
+def test_load_mmaps_large_arrays(tmp_path):
+    df = _big_df()
+    pipeline = _fitted_pipeline(df)
+    path = str(tmp_path / "pipeline.pdp")
+    pipeline.save(path)
+    loaded = pdp.PdPipeline.load(path)
+    components = loaded[1]._transformer.components_
+    base = components
+    while not isinstance(base, np.memmap):
+        base = base.obj if isinstance(base, memoryview) else base.base
+    assert isinstance(base, np.memmap)
+    # copy-on-write mapping: loaded state is writable but the file is not
+    components[0, 0] = 1000
+    reloaded = pdp.PdPipeline.load(path)
+    assert reloaded[1]._transformer.components_[0, 0] != 1000
+
+
+def test_save_load_small_pipeline(tmp_path):
+    df = pd.DataFrame([[3, "a"], [5, "b"]], [1, 2], ["num", "char"])
+    pipeline = pdp.ColDrop("char") + pdp.Scale("MinMaxScaler")
+    pipeline.fit(df)
+    path = str(tmp_path / "pipeline.pdp")
+    pipeline.save(path)
+    res = pdp.PdPipeline.load(path).transform(df)
+    assert list(res["num"]) == [0, 1]
+
+
+def test_load_bad_file(tmp_path):
+    path = tmp_path / "pipeline.pkl"
+    path.write_bytes(pickle.dumps(pdp.ColDrop("a")))
+    with pytest.raises(ValueError):
+        pdp.PdPipeline.load(str(path))
+
+
+def test_load_non_pipeline(tmp_path):
+    path = str(tmp_path / "stage.pdp")
+    pdp.PdPipeline.save(pdp.ColDrop("a"), path)
+    with pytest.raises(TypeError):
+        pdp.PdPipeline.load(path)
@@ -0,0 +1,160 @@
+"""Tests for memoization and flattening of column qualifiers."""
+
+import pickle
+
+import pandas as pd
+
+import pdpipe as pdp
+from pdpipe.cq import ColumnQualifier, QualifierMemo, qualifier_memo
+
+
+class _CountingCond:
+    def __init__(self):
+        self.n_calls = 0
+
+    def __call__(self, series):
+        self.n_calls += 1
+        return series.isna().sum() == 0
+
+
+def _df():
+    return pd.DataFrame(
+        [[1, None, 3, "a"], [4, 5, 6, "b"]],
+        [1, 2],
+        ["abe", "bee", "cry", "no"],
+    )
+
+
+def test_memo_reuses_results_per_frame():
+    cond = _CountingCond()
+    cq = pdp.cq.ByColumnCondition(cond, fittable=False)
+    df = _df()
+    with qualifier_memo() as memo:
+        assert cq(df) == ["abe", "cry", "no"]
+        assert cq(df) == ["abe", "cry", "no"]
+        assert cond.n_calls == 4
+        assert memo.hits == 1
+        cq(df.copy())
+        assert cond.n_calls == 8
+
+
+def test_memo_results_are_copies():
+    cq = pdp.cq.StartsWith("c", fittable=False)
+    df = _df()
+    with qualifier_memo():
+        res = cq(df)
+        res.append("foo")
+        assert cq(df) == ["cry"]
+
+
+def test_memo_invalidated_by_columns_and_dtypes():
+    cq = pdp.cq.OfNumericDtypes(fittable=False)
+    df = _df()
+    with qualifier_memo():
+        assert cq(df) == ["abe", "bee", "cry"]
+        df["cry"] = df["cry"].astype(str)
+        assert cq(df) == ["abe", "bee"]
+        df["new"] = 7
+        assert cq(df) == ["abe", "bee", "new"]
+
+
+def test_no_memo_outside_of_scope():
+    cond = _CountingCond()
+    cq = pdp.cq.ByColumnCondition(cond, fittable=False)
+    df = _df()
+    cq(df)
+    cq(df)
+    assert cond.n_calls == 8
+
+
+def test_nested_scopes_share_memo():
+    with qualifier_memo() as outer:
+        with qualifier_memo() as inner:
+            assert inner is outer
+        explicit = QualifierMemo()
+        with qualifier_memo(explicit) as inner:
+            assert inner is explicit
+
+
+def test_stage_evaluates_qualifier_once():
+    cond = _CountingCond()
+    cq = pdp.cq.ByColumnCondition(cond)
+    stage = pdp.ColDrop(cq)
+    res = stage(_df())
+    assert list(res.columns) == ["bee"]
+    # once for the precondition and the transformation together
+    assert cond.n_calls == 4
+
+
+def test_pipeline_shares_memo_across_stages():
+    cond = _CountingCond()
+    cq = pdp.cq.ByColumnCondition(cond, fittable=False)
+    pipeline = pdp.PdPipeline(
+        [
+            # fails its precondition, passing on the same dataframe
+            pdp.ColDrop("no", prec=lambda X: len(cq(X)) > 3, exraise=False),
+            pdp.ColDrop(cq),
+        ]
+    )
+    res = pipeline.fit_transform(_df())
+    assert list(res.columns) == ["bee"]
+    assert cond.n_calls == 4
+    assert pipeline.application_context is None
+
+
+def test_compound_qualifiers_are_flattened():
+    cq = (
+        pdp.cq.StartsWith("a")
+        | pdp.cq.StartsWith("b")
+        | pdp.cq.StartsWith("c")
+    )
+    assert len(cq._cqfunc.operands) == 3
+    assert cq(_df()) == ["abe", "bee", "cry"]
+    cq = (
+        ~pdp.cq.StartsWith("n")
+        & pdp.cq.WithoutMissingValues()
+        & (pdp.cq.StartsWith("a") | pdp.cq.StartsWith("c"))
+    )
+    assert len(cq._cqfunc.operands) == 3
+    assert cq(_df()) == ["abe", "cry"]
+    cq = pdp.cq.AllColumns() - pdp.cq.StartsWith("a") - pdp.cq.StartsWith("n")
+    assert len(cq._cqfunc.operands) == 3
+    assert cq(_df()) == ["bee", "cry"]
+    cq = pdp.cq.AllColumns() - (
+        pdp.cq.StartsWith("a") - pdp.cq.StartsWith("n")
+    )
+    assert len(cq._cqfunc.operands) == 2
+    assert cq(_df()) == ["bee", "cry", "no"]
+    cq = (
+        pdp.cq.StartsWith("a")
+        ^ pdp.cq.WithoutMissingValues()
+        ^ pdp.cq.StartsWith("n")
+    )
+    assert len(cq._cqfunc.operands) == 3
+    assert cq(_df()) == ["cry"]
+
+
+def test_compound_qualifier_pickling():
+    cq = pdp.cq.StartsWith("a") | pdp.cq.StartsWith("c")
+    cq2 = pickle.loads(pickle.dumps(cq))
+    assert cq2(_df()) == ["abe", "cry"]
+    # compound qualifiers pickled as binary operations are still supported
+    func = ColumnQualifier._OrQualifierFunc.__new__(
+        ColumnQualifier._OrQualifierFunc
+    )
+    func.__setstate__(
+        {
+            "first": pdp.cq.StartsWith("a")._cqfunc,
+            "second": pdp.cq.StartsWith("b")._cqfunc,
+        }
+    )
+    assert func(_df()) == ["abe", "bee"]
+
+
+def test_memo_pickling():
+    memo = QualifierMemo()
+    with qualifier_memo(memo):
+        pdp.cq.AllColumns(fittable=False)(_df())
+    memo2 = pickle.loads(pickle.dumps(memo))
+    assert memo2.misses == 1
+    assert memo2._frames == {}
@@ -556,3 +556,14 @@ def test_col_bound_potential_complex():
     assert res["a_add_b_kwarg"].equals(
         rdf["a"].add(other=rdf["b"], fill_value=0)
     )
+
+
+def test_lazy_series_method_resolution():
+    potential = df["a"]
+    assert "fillna" in dir(potential)
+    assert "map" in dir(potential)
+    assert callable(potential.fillna)
+    with pytest.raises(AttributeError):
+        potential.not_a_series_method  # noqa: B018
+    with pytest.raises(AttributeError):
+        potential.__not_a_dunder__  # noqa: B018
@@ -1,6 +1,7 @@
 """Testing pdpipe's df module."""
 
 import pandas as pd
+import pytest
 
 import pdpipe as pdp
 from pdpipe.df.df_transformer import _DataFrameMethodTransformer
@@ -69,3 +70,15 @@ def test_more_df():
     assert "num2" not in res_df.columns
     assert "char" not in res_df.columns
     assert list(res_df.index) == [2, 4]
+
+
+def test_df_handle_lazy_method_resolution():
+    handle = pdp.df.set_index
+    assert pdp.df.set_index is handle  # cached after first access
+    assert handle.__doc__ == pd.DataFrame.set_index.__doc__
+    assert "set_index" in dir(pdp.df)
+    assert "drop_rows_where" in dir(pdp.df)
+    with pytest.raises(AttributeError):
+        pdp.df.not_a_dataframe_method  # noqa: B018
+    with pytest.raises(AttributeError):
+        pdp.df._repr_html_  # noqa: B018
@@ -0,0 +1,220 @@
+"""Testing the compilation of pdp.df column expressions."""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pdpipe as pdp
+from pdpipe import shared
+from pdpipe.df.bound_column_potential import SeriesFromDfAssigner
+from pdpipe.df.expression import ExpressionGraph
+from pdpipe.df.series_from_df import (
+    _SeriesFromDf,
+    _SeriesFromDfAdd,
+    _SeriesFromDfSub,
+    _SeriesFromDfTrueDiv,
+)
+
+
+def _df(n_rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "i": rng.integers(-5, 10, n_rows),
+            "j": rng.integers(1, 4, n_rows).astype(np.int8),
+            "u": rng.integers(0, 10, n_rows).astype(np.uint16),
+            "f": rng.normal(5, 3, n_rows),
+            "g": rng.normal(0, 1, n_rows).astype(np.float32),
+            "b": rng.integers(0, 2, n_rows).astype(bool),
+            "c": rng.integers(0, 2, n_rows).astype(bool),
+            "s": rng.choice(["x", "y", "z"], n_rows),
+        },
+        index=np.arange(n_rows) * 3,
+    )
+    df.loc[df.index[::7], "f"] = np.nan
+    return df
+
+
+def _expressions():
+    i, j, u, f, g = (pdp.df[lbl] for lbl in ["i", "j", "u", "f", "g"])
+    b, c, s = pdp.df["b"], pdp.df["c"], pdp.df["s"]
+    diff = f - i
+    external = pd.Series(np.arange(200) * 3.0, index=np.arange(200) * 3)
+    return [
+        i + f,
+        i - 3,
+        j * 2,
+        u - 4,
+        u * i,
+        f / i,
+        i / 0,
+        g * 2.5 + i,
+        -i + abs(f),
+        abs(-j),
+        i // 2,
+        f % 3,
+        i**2,
+        (diff * diff) / (diff + 1) - diff,
+        (i > 2) & (f < 6),
+        (f >= 5) | b,
+        b ^ c,
+        ~b & (i != 3),
+        (i == 2) | (f <= 4) | (g > 0),
+        u > 3,
+        b == 1,
+        s + "_x",
+        s == "y",
+        f + external,
+        (f * 2).round(1) + i,
+        f.clip(lower=i, upper=i + 5) * 2,
+        f + (2 + 3) * 4,
+        u - np.int64(3),
+        j * np.int64(3),
+        g * np.float64(2.5),
+        i * np.float32(1.5) + f,
+        i - np.int64(2) * np.int64(3),
+        (g > np.float64(0.5)) | b,
+    ]
+
+
+def _expected(expression, df):
+    return expression.series_from_df(df)
+
+
+@pytest.mark.parametrize("index", range(len(_expressions())))
+def test_graph_matches_regular_path(index):
+    expression = _expressions()[index]
+    df = _df()
+    res = ExpressionGraph(expression.series_from_df)(df)
+    pd.testing.assert_series_equal(
+        res, _expected(expression, df), check_names=False
+    )
+
+
+@pytest.mark.parametrize("index", range(len(_expressions())))
+def test_numexpr_matches_regular_path(index, monkeypatch):
+    numexpr = pytest.importorskip("numexpr")
+    monkeypatch.setattr(shared, "_NUMEXPR_MIN_ROWS", 0)
+    monkeypatch.setattr(numexpr, "get_num_threads", lambda: 2)
+    expression = _expressions()[index]
+    df = _df()
+    res = ExpressionGraph(expression.series_from_df)(df)
+    pd.testing.assert_series_equal(
+        res, _expected(expression, df), check_names=False
+    )
+
+
+def test_numpy_scalars_are_weakly_typed():
+    df = pd.DataFrame(
+        {
+            "u": np.array([0, 1, 2, 5], dtype=np.uint8),
+            "i32": np.arange(4, dtype=np.int32),
+        }
+    )
+    res = (pdp.df["y"] << (pdp.df["u"] - np.int64(3)))(df)
+    assert res["y"].tolist() == [253, 254, 255, 2]
+    assert res["y"].dtype == np.uint8
+    res = ExpressionGraph((pdp.df["i32"] * np.int64(3)).series_from_df)(df)
+    assert res.dtype == np.int32
+
+
+class _CountingSeriesFromDf(_SeriesFromDf):
+    def __init__(self, label):
+        self.label = label
+        self.n_calls = 0
+
+    def __call__(self, df):
+        self.n_calls += 1
+        return df[self.label]
+
+
+def test_shared_subexpressions_are_evaluated_once():
+    counted = _CountingSeriesFromDf("f")
+    potential = pdp.df["i"] + 0
+    potential.series_from_df.second = counted
+    diff = potential - pdp.df["i"]
+    expression = (diff * diff) + (diff * diff) / diff
+    graph = ExpressionGraph(expression.series_from_df)
+    # i, counted, i + counted, diff, diff * diff, / and +
+    assert len(graph.nodes) == 7
+    df = _df()
+    expected = _expected(expression, df)
+    counted.n_calls = 0
+    res = graph(df)
+    assert counted.n_calls == 1
+    pd.testing.assert_series_equal(res, expected, check_names=False)
+
+
+def test_constants_are_folded():
+    # f * 2 - (1 - 3)
+    tree = _SeriesFromDfSub(
+        (pdp.df["f"] * 2).series_from_df, _SeriesFromDfSub(1, 3)
+    )
+    graph = ExpressionGraph(tree)
+    assert [node.kind for node in graph.nodes] == [
+        "col",
+        "const",
+        "op",
+        "const",
+        "op",
+    ]
+    assert graph.nodes[3].payload == -2
+    df = _df()
+    pd.testing.assert_series_equal(
+        graph(df), df["f"] * 2 + 2, check_names=False
+    )
+
+
+def test_failing_constants_are_not_folded():
+    tree = _SeriesFromDfAdd(
+        pdp.df["f"].series_from_df, _SeriesFromDfTrueDiv(1, 0)
+    )
+    graph = ExpressionGraph(tree)
+    assert graph.nodes[-2].kind == "op"
+    with pytest.raises(ZeroDivisionError):
+        graph(_df())
+
+
+def test_shared_intermediates_are_not_overwritten():
+    f, i = pdp.df["f"], pdp.df["i"]
+    shared_node = f * 2
+    expression = ((shared_node + 1) * 3) / shared_node + i
+    df = _df()
+    graph = ExpressionGraph(expression.series_from_df)
+    pd.testing.assert_series_equal(
+        graph(df), _expected(expression, df), check_names=False
+    )
+    # columns of input dataframes are never written to
+    before = df.copy()
+    ExpressionGraph(((f + 1) * 2 - 1).series_from_df)(df)
+    pd.testing.assert_frame_equal(df, before)
+
+
+def test_assigner_uses_graph():
+    df = _df()
+    diff = pdp.df["f"] - pdp.df["i"]
+    stage = pdp.df["res"] << (diff * diff) / (diff + 1)
+    res = stage(df)
+    expected = (df["f"] - df["i"]) ** 2 / (df["f"] - df["i"] + 1)
+    pd.testing.assert_series_equal(res["res"], expected, check_names=False)
+    assert isinstance(stage._graph, ExpressionGraph)
+    stage2 = pickle.loads(pickle.dumps(stage))
+    pd.testing.assert_frame_equal(stage2(df), res)
+    # stages pickled before expression graphs existed
+    del stage2.__dict__["_graph"]
+    pd.testing.assert_frame_equal(stage2(df), res)
+
+
+def test_assigner_of_series_is_unchanged():
+    df = _df()
+    series = pd.Series(np.arange(200), index=df.index)
+    stage = SeriesFromDfAssigner(
+        assign_to_column="res",
+        series_from_df=series,
+        required_columns=set(),
+    )
+    res = stage(df)
+    assert res["res"].tolist() == series.tolist()
+    assert getattr(stage, "_graph", None) is None
@@ -0,0 +1,134 @@
+"""Tests for shared dataframe statistics."""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pdpipe as pdp
+from pdpipe.frame_stats import (
+    FrameStats,
+    FrameStatsCache,
+    frame_stats,
+    frame_stats_cache,
+)
+
+
+def _df():
+    return pd.DataFrame(
+        [[1, None, "a"], [4, 5, None], [7, 8, "c"]],
+        [1, 2, 3],
+        ["num", "nan", "chr"],
+    )
+
+
+@pytest.fixture
+def isna_calls(monkeypatch):
+    calls = []
+    isna = pd.DataFrame.isna
+
+    def _counting_isna(self):
+        calls.append(id(self))
+        return isna(self)
+
+    monkeypatch.setattr(pd.DataFrame, "isna", _counting_isna)
+    return calls
+
+
+def test_frame_stats():
+    df = _df()
+    stats = FrameStats(df)
+    assert stats.n_rows == 3
+    assert stats.size == 9
+    assert stats.null_counts().to_dict() == {"num": 0, "nan": 1, "chr": 1}
+    assert stats.null_rates()["nan"] == pytest.approx(1 / 3)
+    assert stats.n_missing() == 2
+    assert stats.nunique().to_dict() == {"num": 3, "nan": 2, "chr": 2}
+    assert stats.min().to_dict() == {"num": 1, "nan": 5}
+    assert stats.max().to_dict() == {"num": 7, "nan": 8}
+    assert list(stats.select_dtypes(np.number)) == ["num", "nan"]
+    assert list(stats.select_dtypes([np.number])) == ["num", "nan"]
+
+
+def test_stats_computed_once(isna_calls):
+    df = _df()
+    stats = FrameStats(df)
+    stats.null_counts()
+    stats.n_missing()
+    stats.null_rates()
+    assert len(isna_calls) == 1
+
+
+def test_cache_invalidation():
+    df = _df()
+    with frame_stats_cache() as cache:
+        stats = frame_stats(df)
+        assert frame_stats(df) is stats
+        assert cache.get(df) is stats
+        df["num"] = df["num"].astype(float)
+        assert frame_stats(df) is not stats
+        stats = frame_stats(df)
+        df["new"] = 2
+        assert frame_stats(df) is not stats
+        assert frame_stats(df.copy()) is not frame_stats(df)
+
+
+def test_cache_does_not_keep_frames_alive():
+    cache = FrameStatsCache()
+    df = _df()
+    cache.get(df)
+    assert len(cache._frames) == 1
+    del df
+    assert len(cache._frames) == 0
+
+
+def test_cache_pickling():
+    cache = FrameStatsCache()
+    df = _df()
+    cache.get(df)
+    cache2 = pickle.loads(pickle.dumps(cache))
+    assert cache2._frames == {}
+    assert len(cache._frames) == 1
+
+
+def test_pipeline_scans_for_nulls_once_per_frame(isna_calls):
+    conditions = [
+        pdp.cond.HasAtMostMissingValues(5),
+        pdp.cond.HasAtMostMissingValues(0.5),
+    ]
+    pipeline = pdp.PdPipeline(
+        [pdp.ConditionValidator(conditions) for _ in range(10)]
+        + [
+            pdp.ColDrop(
+                pdp.cq.WithAtMostMissingValueRate(0.2),
+                prec=pdp.cond.HasAtMostMissingValues(2),
+            ),
+        ]
+        + [pdp.ConditionValidator(conditions) for _ in range(10)]
+    )
+    df = _df()
+    res = pipeline(df)
+    assert list(res.columns) == ["nan", "chr"]
+    # once for the input frame, and once for the new frame of ColDrop
+    assert len(isna_calls) == 2
+    assert isna_calls[0] == id(df)
+
+
+def test_qualifiers_share_stats(isna_calls):
+    df = _df()
+    qualifiers = [
+        pdp.cq.WithoutMissingValues(),
+        pdp.cq.WithAtMostMissingValues(1),
+        pdp.cq.WithAtMostMissingValueRate(0.5),
+        pdp.cq.WithAtLeastMissingValueRate(0.2),
+    ]
+    with frame_stats_cache():
+        results = [qualifier(df) for qualifier in qualifiers]
+    assert results == [
+        ["num"],
+        ["num", "nan", "chr"],
+        ["num", "nan", "chr"],
+        ["nan", "chr"],
+    ]
+    assert len(isna_calls) == 1
@@ -0,0 +1,96 @@
+"""Test parallel value mapping by nltk pipeline stages."""
+
+import pytest
+import pandas as pd
+import pdpipe as pdp
+
+
+def _token_df(n_rows=50):
+    words = ["kicking", "boats", "the", "running", "happily", "cats"]
+    return pd.DataFrame(
+        {
+            "num": range(n_rows),
+            "txt": [
+                [words[(i + j) % len(words)] for j in range(i % 5 + 1)]
+                for i in range(n_rows)
+            ],
+        },
+        index=range(100, 100 + n_rows),
+    )
+
+
+@pytest.mark.parametrize("backend", ["process", "thread"])
+def test_snowball_stem_parallel(backend):
+    df = _token_df()
+    expected = pdp.SnowballStem("EnglishStemmer", "txt", drop=False)(df)
+    stage = pdp.SnowballStem(
+        "EnglishStemmer", "txt", drop=False, n_jobs=3, backend=backend
+    )
+    pd.testing.assert_frame_equal(stage(df), expected)
+    pd.testing.assert_frame_equal(stage(df.iloc[:1]), expected.iloc[:1])
+    pd.testing.assert_frame_equal(stage(df.iloc[:0]), expected.iloc[:0])
+
+
+@pytest.mark.parametrize("backend", ["process", "thread"])
+def test_untokenize_parallel(backend):
+    df = _token_df()
+    expected = pdp.UntokenizeText("txt")(df)
+    stage = pdp.UntokenizeText("txt", n_jobs=2, backend=backend)
+    pd.testing.assert_frame_equal(stage(df), expected)
+
+
+def test_remove_stopwords_parallel():
+    df = _token_df()
+    stopwords = ["the", "cats"]
+    expected = pdp.RemoveStopwords(stopwords, "txt")(df)
+    stage = pdp.RemoveStopwords(stopwords, "txt", n_jobs=2)
+    pd.testing.assert_frame_equal(stage(df), expected)
+
+
+def test_tokenize_parallel():
+    df = pd.DataFrame(
+        {"txt": ["Kick the baby!", "Shake and bake.", "A b c"] * 5}
+    )
+    try:
+        expected = pdp.TokenizeText("txt")(df)
+    except LookupError:  # pragma: no cover
+        pytest.skip("NLTK punkt tokenizer data is not available.")
+    stage = pdp.TokenizeText("txt", n_jobs=2)
+    pd.testing.assert_frame_equal(stage(df), expected)
+
+
+def test_parallel_params_validation():
+    with pytest.raises(ValueError):
+        pdp.SnowballStem("EnglishStemmer", "txt", n_jobs=2, backend="gpu")
+    with pytest.raises(ValueError):
+        pdp.UntokenizeText("txt", n_jobs=0)
+    with pytest.raises(TypeError):
+        pdp.UntokenizeText("txt", n_jobs="2")
+
+
+@pytest.mark.parametrize("backend", ["process", "thread"])
+def test_parallel_pool_is_shared_by_columns(backend, monkeypatch):
+    from pdpipe import nltk_stages
+
+    pool_type = {
+        "process": nltk_stages.ProcessPoolExecutor,
+        "thread": nltk_stages.ThreadPoolExecutor,
+    }[backend]
+    pools = []
+
+    def counting_pool(*args, **kwargs):
+        pool = pool_type(*args, **kwargs)
+        pools.append(pool)
+        return pool
+
+    monkeypatch.setattr(nltk_stages, pool_type.__name__, counting_pool)
+    df = _token_df()
+    df["txt2"] = df["txt"]
+    expected = pdp.UntokenizeText(["txt", "txt2"])(df)
+    stage = pdp.UntokenizeText(["txt", "txt2"], n_jobs=2, backend=backend)
+    pd.testing.assert_frame_equal(stage(df), expected)
+    assert len(pools) == 1
+    pd.testing.assert_frame_equal(stage(df), expected)
+    assert len(pools) == 2
+    assert stage._executor is None
+    assert "_executor" not in stage.__getstate__()
@@ -72,3 +72,53 @@ def test_pickle_snowball_stem(pdpipe_tests_dir_path):
     res_df = loaded_stage(df)
     assert "txt" in res_df.columns
     assert res_df["txt"][1] == ["kick", "boat"]
+
+
+def test_snowball_stem_cache():
+    df = pd.DataFrame(
+        {
+            "a": [["kicking", "boats"], ["kicking", "the", "boats"]],
+            "b": [["boats"], ["running", "kicking"]],
+        }
+    )
+    stem = pdp.SnowballStem("EnglishStemmer", ["a", "b"], min_len=4)
+    res_df = stem(df)
+    assert res_df["a"].tolist() == [["kick", "boat"], ["kick", "the", "boat"]]
+    assert res_df["b"].tolist() == [["boat"], ["run", "kick"]]
+    info = stem.cache_info()
+    # the cache is shared by both columns; "the" is never stemmed
+    assert info["misses"] == 3
+    assert info["hits"] == 4
+    assert info["hit_rate"] == 4 / 7
+    assert info["size"] == 3
+    assert info["maxsize"] == 65536
+
+    uncached = pdp.SnowballStem("EnglishStemmer", ["a", "b"], cache_size=0)
+    pd.testing.assert_frame_equal(uncached(df), stem(df))
+    assert uncached.cache_info() is None
+    with pytest.raises(ValueError):
+        pdp.SnowballStem("EnglishStemmer", "a", cache_size=-1)
+
+
+def test_snowball_stem_cache_is_bounded():
+    df = pd.DataFrame({"a": [["kicking", "boats", "running", "kicking"]]})
+    stem = pdp.SnowballStem("EnglishStemmer", "a", cache_size=2)
+    stem(df)
+    info = stem.cache_info()
+    assert info["size"] == 2
+    assert info["misses"] == 4
+
+
+def test_pickle_snowball_stem_cache():
+    df = pd.DataFrame({"a": [["kicking", "boats", "kicking"]]})
+    stem = pdp.SnowballStem("EnglishStemmer", "a")
+    res_df = stem(df)
+    loaded_stage = pickle.loads(pickle.dumps(stem))
+    assert loaded_stage.cache_info()["size"] == 0
+    pd.testing.assert_frame_equal(loaded_stage(df), res_df)
+    assert loaded_stage.cache_info()["hits"] == 1
+    # stages pickled before stems were cached
+    del loaded_stage._list_stemmer.__dict__["cache"]
+    del loaded_stage.__dict__["_stem_cache"]
+    pd.testing.assert_frame_equal(loaded_stage(df), res_df)
+    assert loaded_stage.cache_info() is None
@@ -0,0 +1,167 @@
+"""Smoke tests for the benchmark suite, so that it does not bit-rot."""
+
+import io
+
+import pandas as pd
+import pytest
+
+from benchmarks.compare import check, compare_results, missing, regressions
+from benchmarks.compare import main as compare_main
+from benchmarks.data import GENERATORS, make_frame
+from benchmarks.runner import read_results, write_baseline, write_results
+from benchmarks.stages import (
+    BENCHMARKS,
+    main,
+    run_stage_benchmarks,
+    select_benchmarks,
+)
+from benchmarks.workloads import WORKLOADS, run_workloads
+
+# these depend on nltk corpora, which might not be downloaded
+_NEEDS_NLTK_DATA = {"TokenizeText", "RemoveStopwords"}
+
+
+def test_data_generators_are_deterministic():
+    for kind in GENERATORS:
+        first = make_frame(kind, 50, 3, seed=7)
+        second = make_frame(kind, 50, 3, seed=7)
+        assert len(first) == 50
+        pd.testing.assert_frame_equal(first, second)
+
+
+def test_select_benchmarks():
+    assert select_benchmarks() == BENCHMARKS
+    scales = select_benchmarks("^Scale")
+    assert {b.name for b in scales} == {"Scale", "Scale[joint]"}
+    fly = select_benchmarks(groups=["fly"])
+    assert fly and all(b.group == "fly" for b in fly)
+
+
+def test_all_stage_benchmarks_run():
+    results = run_stage_benchmarks(rows=[30], cols=[2], repeat=1)
+    names = {res["benchmark"] for res in results}
+    assert names == {b.name for b in BENCHMARKS}
+    for res in results:
+        if res["benchmark"] in _NEEDS_NLTK_DATA:
+            continue
+        assert "error" not in res, res
+        assert res["seconds"] >= 0
+        assert res["peak_bytes"] >= 0
+
+
+def test_main(tmp_path, capsys):
+    output = tmp_path / "res.json"
+    main(
+        [
+            "--rows",
+            "1e1",
+            "--cols",
+            "2",
+            "--filter",
+            "^ColDrop$",
+            "--repeat",
+            "1",
+            "--no-memory",
+            "--output",
+            str(output),
+        ]
+    )
+    assert "ColDrop" in capsys.readouterr().out
+    assert output.exists()
+
+
+def _res(benchmark, seconds, peak_bytes, error=None):
+    res = {
+        "benchmark": benchmark,
+        "group": "g",
+        "phase": "fit",
+        "rows": 100,
+        "cols": 2,
+    }
+    if error:
+        return {**res, "error": error}
+    return {**res, "seconds": seconds, "peak_bytes": peak_bytes}
+
+
+def test_compare_results():
+    mb = 2**20
+    baseline = [
+        _res("same", 1.0, 10 * mb),
+        _res("slower", 1.0, 10 * mb),
+        _res("fatter", 1.0, 10 * mb),
+        _res("faster", 1.0, 10 * mb),
+        _res("noise", 0.0001, 1000),
+        _res("broken", 1.0, 10 * mb),
+        _res("fixed", None, None, error="ValueError"),
+        _res("gone", 1.0, 10 * mb),
+    ]
+    current = [
+        _res("same", 1.1, 10.5 * mb),
+        _res("slower", 2.0, 10 * mb),
+        _res("fatter", 1.0, 20 * mb),
+        _res("faster", 0.5, 10 * mb),
+        _res("noise", 0.0005, 3000),
+        _res("broken", None, None, error="ValueError"),
+        _res("fixed", 1.0, 10 * mb),
+        _res("new", 1.0, 10 * mb),
+    ]
+    comparisons = compare_results(baseline, current)
+    status = {c["key"][0]: c["status"] for c in comparisons}
+    assert status == {
+        "same": "ok",
+        "slower": "regressed",
+        "fatter": "regressed",
+        "faster": "improved",
+        "noise": "ok",
+        "broken": "regressed",
+        "fixed": "fixed",
+        "new": "new",
+        "gone": "missing",
+    }
+    assert {c["key"][0] for c in regressions(comparisons)} == {
+        "slower",
+        "fatter",
+        "broken",
+    }
+    assert [c["key"][0] for c in missing(comparisons)] == ["gone"]
+    assert not check(baseline, current, file=io.StringIO())
+    assert check(baseline, baseline, file=io.StringIO())
+    out = io.StringIO()
+    assert check(baseline, baseline[:-1], file=out)
+    assert "1 baseline result(s) missing" in out.getvalue()
+
+
+def test_compare_main(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    write_results([_res("a", 1.0, 2**20)], str(baseline))
+    write_results([_res("a", 3.0, 2**20)], str(current))
+    compare_main([str(baseline), str(baseline)])
+    with pytest.raises(SystemExit):
+        compare_main([str(baseline), str(current)])
+    compare_main([str(baseline), str(current), "--time-threshold", "3"])
+
+
+def test_write_baseline(tmp_path):
+    path = tmp_path / "baseline.json"
+    with pytest.raises(ValueError):
+        write_baseline(
+            [_res("a", 1.0, 2**20), _res("b", None, None, error="E")],
+            str(path),
+        )
+    assert not path.exists()
+    write_baseline([_res("a", 1.0, 2**20)], str(path))
+    assert read_results(str(path)) == [_res("a", 1.0, 2**20)]
+    nested = tmp_path / "baselines" / "baseline.json"
+    write_baseline([_res("a", 1.0, 2**20)], str(nested))
+    assert read_results(str(nested)) == [_res("a", 1.0, 2**20)]
+
+
+def test_workloads_run():
+    workloads = [w for w in WORKLOADS if w.name != "text_tfidf"]
+    results = run_workloads(
+        rows=[60], workloads=workloads, repeat=1, memory=False
+    )
+    assert len(results) == 2 * len(workloads)
+    for res in results:
+        assert "error" not in res, res
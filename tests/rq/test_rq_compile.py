@@ -0,0 +1,123 @@
+"""Testing the compilation of row qualifier trees."""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdpipe import rq, shared
+
+
+def _df(n_rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "i": rng.integers(0, 10, n_rows),
+            "f": rng.normal(5, 3, n_rows),
+            "b": rng.integers(0, 2, n_rows).astype(bool),
+            "s": rng.choice(["x", "y", "z"], n_rows),
+        },
+        index=np.arange(n_rows) * 2,
+    )
+    df.loc[df.index[::7], "f"] = np.nan
+    return df
+
+
+def _qualifiers():
+    return [
+        rq.ColValGt("i", 4),
+        rq.ColValGe("f", 5.5),
+        rq.ColValLt("f", 2),
+        rq.ColValLe("i", 3),
+        rq.ColValEq("i", 7),
+        rq.ColValNe("f", 5.0),
+        rq.ColValIsIn("i", [1, 3, 5]),
+        rq.ColValIsIn("i", list(range(0, 10, 3)) + [1.0, 5, 7, 9, 11, 13]),
+        rq.ColValIsNa("f"),
+        rq.ColValNotNa("f"),
+        rq.ColValIsNa("i"),
+        rq.ColValNotNa("i"),
+        rq.ColValEq("b", True),
+        (rq.ColValGt("i", 4) & rq.ColValLt("f", 6)) | rq.ColValIsNa("f"),
+        ~(rq.ColValGt("i", 4) ^ rq.ColValLt("f", 6) ^ rq.ColValEq("i", 2)),
+        rq.ColValGt("i", 2)
+        & rq.ColValLt("i", 8)
+        & ~rq.ColValIsIn("i", [4, 5])
+        & rq.ColValNotNa("f"),
+        rq.ColValIsNa("f") | rq.ColValGt("f", 9) | rq.ColValLt("f", 1),
+    ]
+
+
+def _expected(qualifier, df):
+    return qualifier._rqfunc(df)
+
+
+@pytest.mark.parametrize("index", range(len(_qualifiers())))
+def test_compiled_matches_regular_path(index):
+    qualifier = _qualifiers()[index]
+    df = _df()
+    res = qualifier(df)
+    assert qualifier._plan
+    assert res.dtype == bool
+    assert res.index.equals(df.index)
+    assert res.tolist() == _expected(qualifier, df).tolist()
+
+
+@pytest.mark.parametrize("index", range(len(_qualifiers())))
+def test_numexpr_matches_regular_path(index, monkeypatch):
+    numexpr = pytest.importorskip("numexpr")
+    monkeypatch.setattr(shared, "_NUMEXPR_MIN_ROWS", 0)
+    monkeypatch.setattr(numexpr, "get_num_threads", lambda: 2)
+    qualifier = _qualifiers()[index]
+    df = _df()
+    assert qualifier(df).tolist() == _expected(qualifier, df).tolist()
+
+
+def test_compound_trees_are_flattened():
+    qualifier = rq.ColValGt("i", 2) & rq.ColValLt("i", 8) & rq.ColValNotNa("f")
+    assert qualifier._plan is None
+    qualifier(_df())
+    assert qualifier._plan[0] == "and"
+    assert len(qualifier._plan) == 4
+
+
+def test_uncompilable_trees_fall_back():
+    df = _df()
+    qualifier = rq.ColValEq("s", "x") & rq.ColValGt("i", 4)
+    res = qualifier(df)
+    assert qualifier._plan is False
+    assert res.tolist() == ((df["s"] == "x") & (df["i"] > 4)).tolist()
+    custom = rq.RowQualifier(lambda X: X["i"] > 4) | rq.ColValLt("f", 1)
+    res = custom(df)
+    assert custom._plan is False
+    assert res.tolist() == ((df["i"] > 4) | (df["f"] < 1)).tolist()
+    nan_isin = rq.ColValIsIn("f", [np.nan])
+    assert nan_isin(df).tolist() == df["f"].isna().tolist()
+    assert nan_isin._plan is False
+
+
+def test_non_numeric_columns_fall_back():
+    df = _df()
+    df["t"] = pd.to_datetime("2020-01-01") + pd.to_timedelta(df["i"], "D")
+    qualifier = rq.ColValNotNa("t") & rq.ColValGt("i", 4)
+    assert qualifier(df).tolist() == (df["i"] > 4).tolist()
+    df["n"] = df["i"].astype("Int64")
+    qualifier = rq.ColValGt("n", 4)
+    assert qualifier(df).tolist() == (df["i"] > 4).tolist()
+
+
+def test_missing_column_raises():
+    with pytest.raises(KeyError):
+        rq.ColValGt("nope", 4)(_df())
+
+
+def test_pickled_qualifier_without_plan():
+    qualifier = rq.ColValGt("i", 4) & rq.ColValLt("f", 6)
+    state = qualifier.__dict__.copy()
+    del state["_plan"]
+    loaded = rq.RowQualifier.__new__(rq.RowQualifier)
+    loaded.__dict__.update(state)
+    loaded = pickle.loads(pickle.dumps(loaded))
+    df = _df()
+    assert loaded(df).tolist() == _expected(qualifier, df).tolist()
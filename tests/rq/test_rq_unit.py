@@ -69,3 +69,13 @@ def test_rq():
         q | "4"
     with pytest.raises(TypeError):
         q ^ "4"
+
+
+def test_col_val_is_in_value_set():
+    df = pd.DataFrame({"a": ["x", "y", None, "z"]}, index=[3, 1, 2, 0])
+    q = rq.ColValIsIn("a", ["x", "z"])
+    res = q(df)
+    assert res.index.tolist() == [3, 1, 2, 0]
+    assert res.tolist() == [True, False, False, True]
+    del q._rqfunc.__dict__["value_set"]
+    assert q(df).tolist() == [True, False, False, True]
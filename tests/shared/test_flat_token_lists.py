@@ -0,0 +1,206 @@
+"""Testing the flattened representation of token-list columns."""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pdpipe as pdp
+from pdpipe.nltk_stages import DropRareTokens
+from pdpipe.shared import _FlatTokenLists
+from pdpipe.text_stages import _FusedTokenFilters
+
+P = [0.3, 0.2, 0.2, 0.1, 0.1, 0.05, 0.05]
+
+
+def _token_lists(n_rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    words = ["a", "bb", "ccc", "dddd", "eeeee", "ff", "g"]
+    lists = [
+        [str(token) for token in rng.choice(words, rng.integers(0, 8), p=P)]
+        for _ in range(n_rows)
+    ]
+    return pd.Series(lists, index=np.arange(n_rows) * 2, name="tokens")
+
+
+def _df():
+    series = _token_lists()
+    return pd.DataFrame(
+        {
+            "num": np.arange(len(series)),
+            "tokens": series,
+            "other": _token_lists(seed=1).values,
+        },
+        index=series.index,
+    )
+
+
+def test_round_trip():
+    series = _token_lists()
+    flat = _FlatTokenLists.from_series(series)
+    assert flat.offsets[-1] == len(flat.codes) == series.map(len).sum()
+    assert len(flat.vocabulary) == 7
+    pd.testing.assert_series_equal(flat.to_series(), series)
+    counts = dict(zip(flat.vocabulary, flat.token_counts()))
+    assert counts["a"] == sum(tokens.count("a") for tokens in series)
+
+
+def test_filter():
+    series = _token_lists()
+    flat = _FlatTokenLists.from_series(series)
+    keep = np.array([len(token) % 2 == 1 for token in flat.vocabulary])
+    expected = series.map(lambda x: [t for t in x if len(t) % 2 == 1])
+    pd.testing.assert_series_equal(flat.filter(keep).to_series(), expected)
+    empty = series.iloc[:0]
+    pd.testing.assert_series_equal(
+        _FlatTokenLists.from_series(empty).to_series(), empty
+    )
+
+
+@pytest.mark.parametrize(
+    "cells",
+    [
+        [["a", "b"], np.nan],
+        [["a", None], ["b"]],
+        [["a", ["b"]], ["c"]],
+        [iter(["a"]), ["b"]],
+        [[1, True, 1.0, "a"], [0, False, 0.0]],
+        [[np.str_("a"), "a"], ["b"]],
+    ],
+)
+def test_unflattenable_series(cells):
+    series = pd.Series(cells, dtype=object)
+    assert _FlatTokenLists.from_series(series) is None
+
+
+def _stages():
+    return [
+        pdp.DropTokensByLength("tokens", 2),
+        pdp.DropTokensByList(["tokens", "other"], ["bb", "zz"]),
+        DropRareTokens("tokens", 80),
+        pdp.DropTokensByLength(["tokens", "other"], 1, 4),
+    ]
+
+
+def _sequential(stages, df):
+    for stage in stages:
+        df = stage.apply(df)
+    return df
+
+
+def _per_row(df):
+    res = df.copy()
+    res["tokens"] = res["tokens"].map(lambda x: [t for t in x if len(t) > 1])
+    bad = {"bb", "zz"}
+    for label in ["tokens", "other"]:
+        res[label] = res[label].map(lambda x: [t for t in x if t not in bad])
+    counts = pd.Series(
+        [t for tokens in res["tokens"] for t in tokens]
+    ).value_counts()
+    rare = set(counts[counts <= 80].index)
+    res["tokens"] = res["tokens"].map(
+        lambda x: [t for t in x if t not in rare]
+    )
+    for label in ["tokens", "other"]:
+        res[label] = res[label].map(lambda x: [t for t in x if len(t) <= 4])
+    return res, rare
+
+
+@pytest.mark.parametrize("index", range(len(_stages())))
+def test_stages_match_per_row_filtering(index):
+    df = _df()
+    stage = _stages()[index]
+    res = stage(df)
+    for label in ["tokens", "other"]:
+        if label in stage._get_columns(df, fit=False):
+            func = getattr(stage, "_func", None)
+            if func is None:
+                func = stage._rare_removers[label]
+            expected = df[label].map(func)
+            pd.testing.assert_series_equal(res[label], expected)
+        else:
+            assert res[label] is df[label] or res[label].equals(df[label])
+    assert res.columns.equals(df.columns)
+
+
+def test_consecutive_token_filters_are_fused():
+    pipeline = pdp.PdPipeline(
+        [pdp.ColRename({"num": "num"})]
+        + _stages()
+        + [pdp.DropTokensByList("tokens", ["a"], drop=False)]
+    )
+    units = list(pipeline._application_units())
+    assert len(units) == 3
+    index, unit = units[1]
+    assert index == 1
+    assert isinstance(unit, _FusedTokenFilters)
+    assert len(unit.stages) == 4
+
+
+def test_fused_run_matches_per_row_filtering():
+    df = _df()
+    expected, rare = _per_row(df)
+    assert rare
+    pipeline = pdp.PdPipeline(_stages())
+    res = pipeline.fit_transform(df)
+    pd.testing.assert_frame_equal(res, expected)
+    # tokens are counted over lists filtered by preceding stages
+    assert set(pipeline[2]._rare_removers["tokens"].rare_words.index) == rare
+    pd.testing.assert_frame_equal(pipeline.transform(df), expected)
+    pd.testing.assert_frame_equal(_sequential(_stages(), df), expected)
+    assert all(stage.is_fitted for stage in pipeline)
+    unpickled = pickle.loads(pickle.dumps(pipeline))
+    pd.testing.assert_frame_equal(unpickled.transform(df), expected)
+
+
+def test_fused_run_falls_back_to_per_row_filtering():
+    df = _df()
+    df["other"] = df["other"].astype(object)
+    df.at[df.index[0], "other"] = ["a", None, "bb"]
+    stages = [
+        pdp.DropTokensByList(["tokens", "other"], ["bb"]),
+        DropRareTokens("other", 80),
+    ]
+    res = pdp.PdPipeline(stages).apply(df)
+    expected = _sequential(stages, df)
+    pd.testing.assert_frame_equal(res, expected)
+    assert res["other"].iloc[0] == ["a"]
+
+
+def test_fused_run_with_labels_and_postconditions():
+    df = _df()
+    y = pd.Series(np.arange(len(df)), index=df.index)
+    stages = _stages()
+    stages[1] = pdp.DropTokensByList(
+        ["tokens", "other"],
+        ["bb", "zz"],
+        post=pdp.cond.HasAllColumns(["tokens", "other"]),
+    )
+    res_X, res_y = pdp.PdPipeline(stages).fit_transform(df, y)
+    pd.testing.assert_frame_equal(res_X, _per_row(df)[0])
+    pd.testing.assert_series_equal(res_y, y)
+
+
+def test_fused_run_with_remove_stopwords():
+    df = pd.DataFrame({"u": [["the", "cat"], ["of", "the", "a"]]})
+    stages = [
+        pdp.RemoveStopwords(["the"], "u"),
+        pdp.DropTokensByLength("u", 2),
+    ]
+    pipeline = pdp.PdPipeline(stages)
+    index, unit = list(pipeline._application_units())[0]
+    assert isinstance(unit, _FusedTokenFilters)
+    res = pipeline.apply(df)
+    assert res["u"].tolist() == [["cat"], ["of"]]
+    pd.testing.assert_frame_equal(res, _sequential(stages, df))
+
+
+def test_token_filters_keep_tokens_of_other_types():
+    df = pd.DataFrame({"t": [[1, True, 1.0, "a"], [0, False, 0.0]]})
+    res = pdp.DropTokensByList("t", ["zzz"])(df)
+    assert res["t"].tolist() == [[1, True, 1.0, "a"], [0, False, 0.0]]
+    assert [type(t) for t in res["t"][0]] == [int, bool, float, str]
+    df = pd.DataFrame({"t": [[np.str_("a"), "bb"]]})
+    res = pdp.DropTokensByLength("t", 2)(df)
+    assert res["t"].tolist() == [["bb"]]
@@ -0,0 +1,79 @@
+"""Testing precompiled value sets."""
+
+import itertools
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdpipe.shared import _ValueSet
+
+SERIES = {
+    "int": pd.Series([1, 2, 3, 0]),
+    "uint": pd.Series([1, 2, 3, 0], dtype="uint8"),
+    "float": pd.Series([1.0, np.nan, 2.5, 0.0]),
+    "bool": pd.Series([True, False, True, False]),
+    "str": pd.Series(["a", "b", None, "1"]),
+    "obj": pd.Series(["a", 1, None, 2.5], dtype=object),
+    "cat": pd.Series(["a", "b", "a", None], dtype="category"),
+    "dt": pd.Series(pd.to_datetime(["2020-01-01", "2021-01-01", None])),
+    "Int64": pd.Series([1, None, 3, 0], dtype="Int64"),
+}
+
+VALUES = [
+    [],
+    [1],
+    [1.0],
+    [0],
+    [True],
+    [False],
+    ["a"],
+    [1, "a"],
+    [np.nan],
+    [None],
+    [1, None],
+    ["a", None],
+    [2.5, 1],
+    [10**20],
+    [pd.Timestamp("2020-01-01")],
+    ["2020-01-01"],
+    list(range(1, 9)),
+    {1, "b"},
+]
+
+
+@pytest.mark.parametrize(
+    "label, values", list(itertools.product(SERIES, range(len(VALUES))))
+)
+def test_value_set_matches_isin(label, values):
+    series = SERIES[label]
+    values = VALUES[values]
+    try:
+        expected = series.isin(values).to_numpy(dtype=bool)
+    except OverflowError:
+        # pyarrow-backed strings can't be compared to out of bounds integers
+        expected = series.astype(object).isin(values).to_numpy(dtype=bool)
+    value_set = _ValueSet(values)
+    for _ in range(2):
+        res = value_set.isin(series)
+        assert res.dtype == bool
+        assert (res == expected).all()
+
+
+def test_value_set_is_hashed_once():
+    value_set = _ValueSet(["a", "b"])
+    value_set.isin(SERIES["str"])
+    index = value_set._index
+    assert isinstance(index, pd.Index)
+    value_set.isin(SERIES["obj"])
+    assert value_set._index is index
+    loaded = pickle.loads(pickle.dumps(value_set))
+    assert loaded._index is None
+    assert loaded.isin(SERIES["str"]).tolist() == [True, True, False, False]
+
+
+def test_value_set_unhashable_values():
+    series = pd.Series([[1], "a", 2], dtype=object)
+    assert _ValueSet(["a"]).isin(series).tolist() == [False, True, False]
+    assert _ValueSet([[1]]).isin(SERIES["str"]).tolist() == [False] * 4
@@ -3,6 +3,7 @@
 import pickle
 
 import pytest
+import numpy as np
 import pandas as pd
 
 # from numpy.testing import assert_approx_equal
@@ -10,7 +11,7 @@ import pandas as pd
 from pdpipe.sklearn_stages import Decompose
 from pdpipe.exceptions import PipelineApplicationError
 
-from sklearn.decomposition import PCA
+from sklearn.decomposition import PCA, IncrementalPCA
 
 from pdptestutil import random_pickle_path
 
@@ -177,3 +178,62 @@ def test_sklearn_missing_dep_decompose():
             Decompose(PCA())
     finally:
         sk._SKLEARN_INSTALLED = original
+
+
+def _tall_df(n_rows=103):
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=(n_rows, 2))
+    df = pd.DataFrame(
+        base @ rng.normal(size=(2, 5)) + rng.normal(0, 0.01, (n_rows, 5)),
+        columns=list("abcde"),
+    )
+    df["lbl"] = "x"
+    return df
+
+
+@pytest.mark.parametrize("drop", [True, False])
+def test_decompose_chunked(drop):
+    df = _tall_df()
+    expected = Decompose(PCA(), n_components=2, drop=drop)(df)
+    stage = Decompose(
+        IncrementalPCA(), n_components=2, chunk_size=10, drop=drop
+    )
+    res = stage(df)
+    assert list(res.columns) == list(expected.columns)
+    # components are equal up to sign
+    for col in ["mdc0", "mdc1"]:
+        np.testing.assert_allclose(
+            res[col].abs(), expected[col].abs(), rtol=1e-6, atol=1e-8
+        )
+    assert stage._transformer.n_samples_seen_ == len(df)
+    pd.testing.assert_frame_equal(stage(df), res)
+
+
+def test_decompose_fit_chunks():
+    df = _tall_df()
+    stage = Decompose(IncrementalPCA(), n_components=2, lbl_format="c{}")
+    assert stage.fit_chunks(df.iloc[i:].head(20) for i in range(0, 103, 20))
+    assert stage.is_fitted
+    res = stage(df)
+    assert list(res.columns) == ["lbl", "c0", "c1"]
+    chunked = Decompose(IncrementalPCA(), n_components=2, chunk_size=20)
+    chunked.fit_chunks([df])
+    np.testing.assert_allclose(
+        chunked(df)[["mdc0", "mdc1"]].abs().to_numpy(),
+        res[["c0", "c1"]].abs().to_numpy(),
+        rtol=1e-6,
+    )
+
+
+def test_decompose_chunked_errors():
+    with pytest.raises(ValueError):
+        Decompose(PCA(), chunk_size=10)
+    with pytest.raises(ValueError):
+        Decompose(IncrementalPCA(), chunk_size=0)
+    with pytest.raises(ValueError):
+        Decompose(PCA()).fit_chunks([_tall_df()])
+    with pytest.raises(ValueError):
+        Decompose(IncrementalPCA()).fit_chunks([])
+    stage = Decompose(IncrementalPCA(), n_components=2)
+    with pytest.raises(PipelineApplicationError):
+        stage.fit_chunks([_tall_df(1)])
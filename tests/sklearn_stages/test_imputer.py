@@ -289,3 +289,118 @@ def test_sklearn_missing_dep_imputer():
             Imputer("mean")
     finally:
         sk._SKLEARN_INSTALLED = original
+
+
+def _mixed_df():
+    return pd.DataFrame(
+        {
+            "f": [1.0, np.nan, 3.0, 3.0],
+            "g": np.array([np.nan, 2.0, 4.0, 4.0], dtype=np.float32),
+            "i": [1, 2, 2, 5],
+            "s": ["a", None, "b", "b"],
+            "c": pd.Categorical(["x", "x", np.nan, "y"]),
+        },
+        index=[3, 5, 7, 9],
+    )
+
+
+def test_imputer_keeps_dtypes():
+    """Test that imputed columns keep their dtypes."""
+    df = _mixed_df()
+    res = Imputer("most_frequent")(df)
+    assert res.dtypes.equals(df.dtypes)
+    assert res["f"].tolist() == [1.0, 3.0, 3.0, 3.0]
+    assert res["g"].tolist() == [4.0, 2.0, 4.0, 4.0]
+    assert res["i"].tolist() == [1, 2, 2, 5]
+    assert res["s"].tolist() == ["a", "b", "b", "b"]
+    assert res["c"].tolist() == ["x", "x", "x", "y"]
+    # the input dataframe is not modified
+    assert df["f"].isna().sum() == 1
+
+
+def test_imputer_numeric_matches_simple_imputer():
+    """Test numeric imputation against SimpleImputer."""
+    from sklearn.impute import SimpleImputer
+
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(50, 4))
+    values[rng.random((50, 4)) < 0.2] = np.nan
+    df = pd.DataFrame(values, columns=list("abcd"))
+    for strategy in ["mean", "median", "most_frequent"]:
+        res = Imputer(strategy)(df)
+        expected = SimpleImputer(strategy=strategy).fit_transform(values)
+        np.testing.assert_allclose(res.to_numpy(), expected, rtol=1e-12)
+
+
+def test_imputer_constant_strategy_mixed_dtypes():
+    """Test constant imputation of fill values the dtype can't hold."""
+    df = _mixed_df()
+    res = Imputer("constant", columns=["f", "s"], fill_value=0)(df)
+    assert res["f"].dtype == np.float64
+    assert res["f"].tolist() == [1.0, 0.0, 3.0, 3.0]
+    assert res["s"].tolist() == ["a", 0, "b", "b"]
+
+
+def test_imputer_constant_strategy_string_fill_value():
+    """Test constant imputation of a string into numeric columns."""
+    df = _mixed_df()
+    df["b"] = [True, False, True, True]
+    res = Imputer("constant", fill_value="missing")(df)
+    assert res["f"].dtype == object
+    assert res["f"].tolist() == [1.0, "missing", 3.0, 3.0]
+    assert res["i"].tolist() == [1, 2, 2, 5]
+    assert res["b"].tolist() == [True, False, True, True]
+    assert res["s"].tolist() == ["a", "missing", "b", "b"]
+    res = Imputer("constant", columns=["f"], fill_value="missing")(df)
+    assert res["f"].tolist() == [1.0, "missing", 3.0, 3.0]
+
+
+def test_imputer_nullable_integer_columns():
+    """Test imputation of nullable integer columns by their mean."""
+    df = pd.DataFrame(
+        {
+            "n": pd.array([1, 2, None], dtype="Int64"),
+            "m": pd.array([1, 3, None], dtype="Int64"),
+        }
+    )
+    res = Imputer("mean")(df)
+    assert res["n"].dtype == "Float64"
+    assert res["n"].tolist() == [1.0, 2.0, 1.5]
+    assert res["m"].dtype == "Int64"
+    assert res["m"].tolist() == [1, 3, 2]
+
+
+def test_imputer_missing_values_marker():
+    """Test imputation of a missing values marker other than NaN."""
+    df = pd.DataFrame({"i": [1, -1, 3, 3], "s": ["a", "?", "b", "b"]})
+    res = Imputer("most_frequent", columns=["i"], missing_values=-1)(df)
+    assert res["i"].dtype == df["i"].dtype
+    assert res["i"].tolist() == [1, 3, 3, 3]
+    res = Imputer("mean", columns=["i"], missing_values=-1)(df)
+    assert res["i"].tolist() == [1.0, 7 / 3, 3.0, 3.0]
+    res = Imputer("most_frequent", columns=["s"], missing_values="?")(df)
+    assert res["s"].tolist() == ["a", "b", "b", "b"]
+
+
+def test_imputer_transform_by_dtype():
+    """Test transform of columns whose dtype changed after fit."""
+    df = pd.DataFrame({"i": [1, 2, 2], "s": ["a", "b", "b"]})
+    stage = Imputer("most_frequent")
+    stage(df)
+    df2 = pd.DataFrame({"i": [np.nan, 1.0, 1.0], "s": ["a", None, "a"]})
+    res = stage(df2)
+    assert res["i"].tolist() == [2.0, 1.0, 1.0]
+    assert res["s"].tolist() == ["a", "b", "a"]
+
+
+def test_imputer_pickled_before_dtype_groups():
+    """Test transform by stages fitted before imputation by dtype groups."""
+    df = _some_df_with_nans()
+    stage = Imputer("mean", columns=["x", "y"])
+    stage(df)
+    stage.imputer_ = stage.imputers_[0]
+    del stage.__dict__["statistics_"]
+    del stage.__dict__["_numeric_columns"]
+    res = stage(_some_df_with_nans_b())
+    assert res["x"][3] == 1.5
+    assert res["y"][1] == 5.0
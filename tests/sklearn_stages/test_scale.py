@@ -3,12 +3,15 @@
 import pickle
 
 import pytest
+import numpy as np
 import pandas as pd
+from skutil.preprocessing import scaler_by_params
 
 # from numpy.testing import assert_approx_equal
 
 from pdpipe.sklearn_stages import Scale
 from pdpipe.exceptions import PipelineApplicationError
+from pdpipe.util import per_column_values_sklearn_transform
 
 from pdptestutil import random_pickle_path
 
@@ -172,6 +175,48 @@ def test_scale_with_joint():
     assert (res_df >= 1).sum().sum() == 0
 
 
+_JOINT_SCALERS = [
+    ("StandardScaler", {}),
+    ("StandardScaler", {"with_mean": False}),
+    ("MinMaxScaler", {"feature_range": (-1, 2)}),
+    ("MinMaxScaler", {"clip": True}),
+    ("MaxAbsScaler", {}),
+    ("RobustScaler", {}),
+    ("RobustScaler", {"quantile_range": (10, 90), "unit_variance": True}),
+    ("QuantileTransformer", {"n_quantiles": 20}),
+]
+
+
+def _flattened_joint_scaling(scaler, kwargs, fit_df, df):
+    fitted = scaler_by_params(scaler, **kwargs)
+    fitted.fit(np.array([fit_df.values.flatten()]).T)
+    return per_column_values_sklearn_transform(df, fitted.transform)
+
+
+@pytest.mark.parametrize("scaler, kwargs", _JOINT_SCALERS)
+def test_scale_joint_matches_flattened_fit(scaler, kwargs):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(3, 2, (60, 3)), columns=["a", "b", "c"])
+    df["d"] = rng.integers(0, 10, 60)
+    df.loc[::7, "b"] = np.nan
+    df2 = df * 1.5 - 1
+    stage = Scale(scaler, joint=True, **kwargs)
+    res = stage(df)
+    expected = _flattened_joint_scaling(scaler, kwargs, df, df)
+    np.testing.assert_allclose(res.to_numpy(), expected.to_numpy(), 1e-10)
+    res = stage(df2)
+    expected = _flattened_joint_scaling(scaler, kwargs, df, df2)
+    np.testing.assert_allclose(res.to_numpy(), expected.to_numpy(), 1e-10)
+
+
+def test_scale_joint_keeps_float32():
+    df = pd.DataFrame(
+        {"a": [1.0, 2.0, 3.0], "b": [4.0, 5.0, 7.0]}, dtype=np.float32
+    )
+    res = Scale("StandardScaler", joint=True)(df)
+    assert (res.dtypes == np.float32).all()
+
+
 def test_pickle_scale(pdpipe_tests_dir_path):
     """Testing Scale pickling."""
     df = _some_df2()
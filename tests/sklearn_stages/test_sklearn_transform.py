@@ -366,3 +366,27 @@ def test_sklearn_missing_dep_sklearn_transform():
             SklearnColumnTransform(StandardScaler(), "x")
     finally:
         sk._SKLEARN_INSTALLED = original
+
+
+def test_sklearn_column_transform_keeps_passthrough_columns():
+    df = pd.DataFrame(
+        {
+            "a": [1.0, 2.0, 3.0],
+            "s": ["x", "y", "z"],
+            "b": [4.0, 5.0, 6.0],
+            "i": pd.array([1, None, 3], dtype="Int64"),
+        }
+    )
+    stage = SklearnColumnTransform(
+        FunctionTransformer(lambda X: X * 2), columns=["b", "a"]
+    )
+    res = stage(df)
+    assert list(res.columns) == ["a", "s", "b", "i"]
+    assert res["a"].tolist() == [2.0, 4.0, 6.0]
+    assert res["b"].tolist() == [8.0, 10.0, 12.0]
+    pd.testing.assert_series_equal(res["i"], df["i"])
+    pd.testing.assert_series_equal(res["s"], df["s"])
+    # identity output is not shared with the input dataframe
+    res = SklearnColumnTransform(FunctionTransformer(), columns=["a"])(df)
+    res.loc[0, "a"] = 100.0
+    assert df.loc[0, "a"] == 1.0
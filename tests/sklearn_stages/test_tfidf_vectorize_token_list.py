@@ -2,10 +2,14 @@
 
 import pickle
 
+import numpy as np
 import pandas as pd
 import pytest
+import scipy.sparse
 
 import pdpipe as pdp
+from pdpipe import sklearn_stages
+from pdpipe.sklearn_stages import _sparse_frame
 
 from pdptestutil import random_pickle_path
 
@@ -96,3 +100,91 @@ def test_sklearn_missing_dep_tfidf():
             pdp.TfidfVectorizeTokenLists("tokens")
     finally:
         sk._SKLEARN_INSTALLED = original
+
+
+@pytest.mark.parametrize("drop", [True, False])
+def test_tfidf_vec_sparse(drop):
+    dense = pdp.TfidfVectorizeTokenLists("Quote", drop=drop)
+    tf = pdp.TfidfVectorizeTokenLists("Quote", drop=drop, sparse=True)
+    res_df = tf(DF)
+    expected = dense(DF)
+    assert list(res_df.columns) == list(expected.columns)
+    vec_cols = [c for c in res_df.columns if c not in ("Age", "Quote")]
+    for col in vec_cols:
+        assert isinstance(res_df[col].dtype, pd.SparseDtype)
+        assert res_df[col].dtype.fill_value == 0
+    pd.testing.assert_frame_equal(
+        res_df[vec_cols].sparse.to_dense(), expected[vec_cols]
+    )
+    res_df2 = tf(DF2)
+    pd.testing.assert_frame_equal(
+        res_df2[vec_cols].sparse.to_dense(), dense(DF2)[vec_cols]
+    )
+
+
+def test_tfidf_vec_hashing():
+    tf = pdp.TfidfVectorizeTokenLists(
+        "Quote", hashing=True, n_features=64, hierarchical_labels=True
+    )
+    res_df = tf(DF)
+    assert list(res_df.columns) == ["Age"] + [f"Quote_{i}" for i in range(64)]
+    assert not hasattr(tf, "_tfidf_vectorizer")
+    # no hash collisions among these tokens, so same tf-idf values
+    expected = pdp.TfidfVectorizeTokenLists("Quote")(DF)
+    vec = res_df.drop("Age", axis=1)
+    vec = vec.loc[:, (vec > 0).any()]
+    assert sorted(vec.sum().round(8)) == sorted(
+        expected.drop("Age", axis=1).sum().round(8)
+    )
+    res_df2 = tf(DF2)
+    assert res_df2.shape == (1, 65)
+    assert ((res_df2.drop("Age", axis=1) > 0).sum(axis=1) == 3).all()
+
+
+def test_tfidf_vec_hashing_sparse_kwargs():
+    tf = pdp.TfidfVectorizeTokenLists(
+        "Quote",
+        hashing=True,
+        sparse=True,
+        n_features=2**10,
+        norm=None,
+        alternate_sign=False,
+        use_idf=False,
+    )
+    res_df = tf(DF)
+    assert res_df.shape == (2, 2**10 + 1)
+    assert res_df.drop("Age", axis=1).sparse.density < 0.01
+    assert res_df.drop("Age", axis=1).sum(axis=1).tolist() == [4.0, 3.0]
+    # pickled stages keep transforming
+    loaded_stage = pickle.loads(pickle.dumps(tf))
+    res_df2 = loaded_stage(DF2)
+    assert res_df2.drop("Age", axis=1).sum(axis=1).tolist() == [3.0]
+
+
+def test_tfidf_vec_hashing_default_width():
+    res_df = pdp.TfidfVectorizeTokenLists("Quote", hashing=True)(DF)
+    assert res_df.shape == (2, 2**10 + 1)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"min_df": 2}, {"max_df": 0.5}, {"max_features": 10}, {"vocabulary": []}],
+)
+def test_tfidf_vec_hashing_rejects_vocabulary_kwargs(kwargs):
+    with pytest.raises(ValueError):
+        pdp.TfidfVectorizeTokenLists("Quote", hashing=True, **kwargs)
+    pdp.TfidfVectorizeTokenLists("Quote", **kwargs)
+
+
+@pytest.mark.parametrize("internals", [True, False])
+@pytest.mark.parametrize("dtype", [np.float64, np.int64])
+def test_sparse_frame(dtype, internals, monkeypatch):
+    if not internals:
+        monkeypatch.setattr(sklearn_stages, "IntIndex", None)
+    dense = np.array([[0, 2, 0], [1, 0, 0], [3, 4, 0]], dtype=dtype)
+    res = _sparse_frame(scipy.sparse.csr_matrix(dense), [5, 6, 7], list("abc"))
+    assert list(res.columns) == ["a", "b", "c"]
+    for col in res.columns:
+        assert res[col].dtype == pd.SparseDtype(dtype, 0)
+    expected = pd.DataFrame(dense, index=[5, 6, 7], columns=list("abc"))
+    pd.testing.assert_frame_equal(res.sparse.to_dense(), expected)
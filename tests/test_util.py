@@ -1,9 +1,10 @@
 """Testing pdpipe util module."""
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from pdpipe.util import out_of_place_col_insert
+from pdpipe.util import out_of_place_col_insert, replace_column_block
 
 
 def _test_df():
@@ -57,3 +58,53 @@ def test_out_of_place_col_last_position():
     assert result_df.columns.get_loc("Tigers") == 2
     assert result_df["Tigers"][1] == 10
     assert result_df["Tigers"][2] == 20
+
+
+def _block_df():
+    return pd.DataFrame(
+        data=[[1, "a", 2.5, True], [2, "b", 3.5, False]],
+        index=[4, 7],
+        columns=["num", "char", "flt", "flag"],
+    )
+
+
+def test_replace_column_block_in_place():
+    df = _block_df()
+    values = np.array([[10.0, 20.0], [30.0, 40.0]])
+    res = replace_column_block(df, ["flt", "num"], values)
+    assert list(res.columns) == ["num", "char", "flt", "flag"]
+    assert res["flt"].tolist() == [10.0, 30.0]
+    assert res["num"].tolist() == [20.0, 40.0]
+    assert res["char"].tolist() == ["a", "b"]
+    assert res["flag"].dtype == bool
+    assert list(res.index) == [4, 7]
+    # the input dataframe is not modified
+    assert df["num"].tolist() == [1, 2]
+
+
+def test_replace_column_block_renamed():
+    df = _block_df()
+    values = np.array([[10.0, 20.0], [30.0, 40.0]])
+    res = replace_column_block(df, ["num", "flt"], values, ["n2", "f2"])
+    assert list(res.columns) == ["n2", "char", "f2", "flag"]
+    assert res["f2"].tolist() == [20.0, 40.0]
+
+
+def test_replace_column_block_at_loc():
+    df = _block_df()
+    values = np.arange(6).reshape(2, 3)
+    res = replace_column_block(
+        df, ["num", "flt"], values, ["x", "y", "z"], loc=1
+    )
+    assert list(res.columns) == ["char", "x", "y", "z", "flag"]
+    assert res["z"].tolist() == [2, 5]
+    res = replace_column_block(df, [], values, ["x", "y", "z"], loc=4)
+    assert list(res.columns) == ["num", "char", "flt", "flag", "x", "y", "z"]
+    res = replace_column_block(df, df.columns, values, ["x", "y", "z"], loc=0)
+    assert list(res.columns) == ["x", "y", "z"]
+
+
+def test_replace_column_block_width_mismatch():
+    df = _block_df()
+    with pytest.raises(ValueError):
+        replace_column_block(df, ["num"], np.zeros((2, 2)), ["a", "b"])
@@ -69,3 +69,19 @@ def test_pickle_drop_tokens_by_list(pdpipe_tests_dir_path):
     assert "bad" not in res_df.loc[1]["text"]
     assert "a" in res_df.loc[1]["text"]
     assert "cat" in res_df.loc[1]["text"]
+
+
+def test_drop_tokens_by_list_old_pickled_filter():
+    data = [[4, ["a", "bad", "cat"]], [5, ["bad", "not", "good"]]]
+    df = pd.DataFrame(data, [1, 2], ["age", "text"])
+    stage = pdp.DropTokensByList("text", ["bad", "not"])
+    assert stage._func.bad_token_set == frozenset(["bad", "not"])
+    del stage._func.__dict__["bad_token_set"]
+    res_df = stage(df)
+    assert res_df.loc[2]["text"] == ["good"]
+
+
+def test_drop_tokens_by_list_unhashable_tokens():
+    df = pd.DataFrame({"text": [["a", ["x"], "bb"], ["a"]]})
+    res_df = pdp.DropTokensByList("text", ["a"])(df)
+    assert res_df["text"].tolist() == [[["x"], "bb"], []]
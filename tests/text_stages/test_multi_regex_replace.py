@@ -0,0 +1,205 @@
+"""Test the MultiRegexReplace pipeline stage, and fused regex replacement."""
+
+import pickle
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pdpipe as pdp
+from pdpipe import text_stages
+from pdpipe.exceptions import PipelineApplicationError
+from pdpipe.text_stages import (
+    RegexReplace,
+    _compile_passes,
+    _FusedRegexReplaces,
+    _MultiRegexReplacer,
+)
+
+
+def _replacers(replacements, flags=0):
+    return [
+        RegexReplace._RegexReplacer(pattern, replace, flags)
+        for pattern, replace in replacements
+    ]
+
+
+def _sequential_sub(replacements, string, flags=0):
+    for pattern, replace in replacements:
+        string = re.sub(pattern, replace, string, flags=flags)
+    return string
+
+
+def _texts(n_rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    words = ["more", "than", "12", "with", "5", "Mr.", "x\ny", "ab9", "é"]
+    return [" ".join(rng.choice(words, 6)) for _ in range(n_rows)]
+
+
+REPLACEMENTS = [
+    (r"\b[0-9]+\b", "NUM"),
+    ("more", "less"),
+    ("th", "TH"),
+    (" ", "_"),
+    ("é", "e"),
+    (r"(\w)(\d)", r"\2\1"),
+    ("_", " "),
+    ("x", ""),
+    ("y", "Y"),
+]
+
+
+@pytest.mark.parametrize(
+    "replacements, n_passes",
+    [
+        ([("a", "X"), ("b", "Y"), ("cd", "Z")], 1),
+        ([("a", "X"), ("b", "")], 1),
+        ([("a", ""), ("b", "Y")], 2),
+        ([("a", "b"), ("b", "c")], 2),
+        ([("b", "a"), ("ab", "c")], 2),
+        ([("ab", "X"), ("bc", "Y")], 2),
+        ([("abc", "X"), ("b", "Y")], 2),
+        ([("a", "X"), ("a", "Y")], 2),
+        ([("a", "X"), (r"\d", "D"), ("b", "Y"), ("c", "Z")], 3),
+        ([("a", "\\\\"), ("b", "Y")], 2),
+        ([("a.", "X"), ("b", "Y")], 2),
+        (REPLACEMENTS, 5),
+    ],
+)
+def test_compile_passes(replacements, n_passes, monkeypatch):
+    replacers = _replacers(replacements)
+    assert len(_compile_passes(replacers)) == len(replacements)
+    monkeypatch.setattr(text_stages, "_MIN_ALTERNATION_SIZE", 2)
+    assert len(_compile_passes(replacers)) == n_passes
+    multi = _MultiRegexReplacer(replacers)
+    for string in ["abcd", "aabbccdd", "bca", "xab9 a.b\\c", "cba" * 3]:
+        assert multi(string) == _sequential_sub(replacements, string)
+
+
+def test_random_literal_replacements_match_sequential_ones(monkeypatch):
+    monkeypatch.setattr(text_stages, "_MIN_ALTERNATION_SIZE", 2)
+    rng = np.random.default_rng(0)
+    alphabet = list("abc")
+    for _ in range(300):
+        replacements = [
+            (
+                "".join(rng.choice(alphabet, rng.integers(1, 4))),
+                "".join(rng.choice(alphabet + ["X"], rng.integers(0, 3))),
+            )
+            for _ in range(rng.integers(1, 6))
+        ]
+        multi = pdp.MultiRegexReplace("text", replacements)._func
+        for _ in range(10):
+            string = "".join(rng.choice(alphabet, rng.integers(0, 12)))
+            assert multi(string) == _sequential_sub(replacements, string)
+
+
+@pytest.mark.parametrize("dtype", [object, "str", "string", "string[pyarrow]"])
+def test_multi_regex_replace(dtype):
+    if dtype == "string[pyarrow]":
+        pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"age": range(200), "text": _texts()})
+    df["text"] = df["text"].astype(dtype)
+    stage = pdp.MultiRegexReplace("text", REPLACEMENTS)
+    res = stage(df)
+    expected = [_sequential_sub(REPLACEMENTS, x) for x in df["text"]]
+    assert res["text"].tolist() == expected
+    assert res.columns.tolist() == ["age", "text"]
+    sequential = df
+    for pattern, replace in REPLACEMENTS:
+        sequential = RegexReplace("text", pattern, replace).apply(sequential)
+    pd.testing.assert_frame_equal(res, sequential)
+
+
+def test_multi_regex_replace_params():
+    df = pd.DataFrame({"text": ["Mr. John", "MR. Bob"]})
+    stage = pdp.MultiRegexReplace(
+        "text", {r"^mr\.": "x", "john": "J"}, flags=re.IGNORECASE, drop=False
+    )
+    res = stage(df)
+    assert res["text"].tolist() == ["Mr. John", "MR. Bob"]
+    assert res["text_regex"].tolist() == ["x J", "x Bob"]
+    loaded_stage = pickle.loads(pickle.dumps(stage))
+    pd.testing.assert_frame_equal(loaded_stage(df), res)
+    with pytest.raises(ValueError):
+        pdp.MultiRegexReplace("text", [("a", "b", "c")])
+
+
+def test_multi_regex_replace_non_string_values():
+    df = pd.DataFrame({"text": ["a 1", 2, "b"]})
+    with pytest.raises(TypeError):
+        pdp.MultiRegexReplace("text", [(r"\d", "D"), ("a", "b")])(df)
+
+
+def _stages():
+    return [
+        RegexReplace("text", r"\b[0-9]+\b", "NUM"),
+        RegexReplace(["text", "other"], "more", "less"),
+        pdp.MultiRegexReplace("text", [("th", "TH"), (" ", "_")]),
+        RegexReplace("other", r"^mr.*", "x", flags=re.IGNORECASE),
+        RegexReplace(["text", "other"], "é", "e"),
+    ]
+
+
+def _df():
+    return pd.DataFrame(
+        {"text": _texts(), "num": range(200), "other": _texts(seed=1)}
+    )
+
+
+def test_adjacent_regex_replace_stages_are_fused():
+    pipeline = pdp.PdPipeline(
+        [pdp.ColRename({"num": "num"})]
+        + _stages()
+        + [RegexReplace("text", "a", "b", drop=False)]
+    )
+    units = list(pipeline._application_units())
+    assert len(units) == 3
+    index, unit = units[1]
+    assert index == 1
+    assert isinstance(unit, _FusedRegexReplaces)
+    assert len(unit.stages) == 5
+
+
+def test_fused_regex_replace_matches_sequential_application():
+    df = _df()
+    expected = df
+    for stage in _stages():
+        expected = stage.apply(expected)
+    pipeline = pdp.PdPipeline(_stages())
+    res = pipeline.fit_transform(df)
+    pd.testing.assert_frame_equal(res, expected)
+    pd.testing.assert_frame_equal(pipeline.transform(df), expected)
+    assert all(stage.is_fitted for stage in pipeline)
+    unpickled = pickle.loads(pickle.dumps(pipeline))
+    pd.testing.assert_frame_equal(unpickled.transform(df), expected)
+
+
+def test_fused_regex_replace_non_string_values():
+    df = _df()
+    df["other"] = df["other"].astype(object)
+    df.loc[3, "other"] = 5
+    with pytest.raises(PipelineApplicationError):
+        pdp.PdPipeline(_stages()).apply(df)
+
+
+@pytest.mark.parametrize("dtype", [object, "str", "string", "string[pyarrow]"])
+def test_multi_regex_replace_unicode(dtype):
+    if dtype == "string[pyarrow]":
+        pytest.importorskip("pyarrow")
+    replacements = [(r"\w+", "W"), ("W W", "V"), (r"\d", "D")]
+    df = pd.DataFrame({"t": ["café ünï 123", "x ١٢٣", "abc"]}, dtype=dtype)
+    res = pdp.MultiRegexReplace("t", replacements)(df)
+    assert res["t"].tolist() == ["V W", "V", "W"]
+
+
+@pytest.mark.parametrize("dtype", [object, "str", "string", "string[pyarrow]"])
+def test_multi_regex_replace_re2_differences(dtype):
+    if dtype == "string[pyarrow]":
+        pytest.importorskip("pyarrow")
+    replacements = [("a", r"\0"), ("x*", "-"), ("t|", "T")]
+    df = pd.DataFrame({"t": ["cat ab", "xbbx"]}, dtype=dtype)
+    res = pdp.MultiRegexReplace("t", replacements)(df)
+    expected = [_sequential_sub(replacements, x) for x in df["t"]]
+    assert res["t"].tolist() == expected
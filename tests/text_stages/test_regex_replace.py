@@ -3,9 +3,12 @@
 import pickle
 import re
 
+import numpy as np
 import pandas as pd
+import pytest
 
 import pdpipe as pdp
+from pdpipe import text_stages
 
 from pdptestutil import random_pickle_path
 
@@ -87,3 +90,120 @@ def test_pickle_regex_replace(pdpipe_tests_dir_path):
     res_df = loaded_stage(DF)
     assert res_df.loc[1]["text"] == "more than NUM"
     assert res_df.loc[2]["text"] == "with NUM more"
+
+
+def _texts(n_rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    words = ["more", "than", "12", "with", "5", "Mr.", "x\ny", "ab9", "é"]
+    return [" ".join(rng.choice(words, 6)) for _ in range(n_rows)]
+
+
+REPLACEMENTS = [
+    (r"\b[0-9]+\b", "NUM", 0),
+    (r"^mr.*", "x", re.IGNORECASE),
+    (r".+", "T", re.DOTALL),
+    (r"(\w)(\d)", r"\2\1", 0),
+    (r"y$", "Y", re.MULTILINE | re.IGNORECASE),
+    (r"(?<=m)o", "0", 0),
+    (r"a b", "", re.VERBOSE),
+]
+
+
+@pytest.mark.parametrize("dtype", [object, "str", "string", "string[pyarrow]"])
+@pytest.mark.parametrize("pattern, replace, flags", REPLACEMENTS)
+def test_regex_replace_matches_element_wise(dtype, pattern, replace, flags):
+    if dtype == "string[pyarrow]":
+        pytest.importorskip("pyarrow")
+    series = pd.Series(_texts(), dtype=dtype, name="text")
+    stage = pdp.RegexReplace("text", pattern, replace, flags=flags)
+    res = stage(series.to_frame())["text"]
+    expected = [re.sub(pattern, replace, x, flags=flags) for x in series]
+    assert res.tolist() == expected
+    if dtype == object:
+        pd.testing.assert_series_equal(res, series.apply(stage._func))
+    else:
+        assert res.dtype == series.dtype
+
+
+def test_regex_replace_non_string_values():
+    df = pd.DataFrame({"text": ["a 1", 2, "b"]})
+    with pytest.raises(TypeError):
+        pdp.RegexReplace("text", r"\d", "D")(df)
+    df = pd.DataFrame({"text": ["a 1", None]}, dtype="string")
+    with pytest.raises(TypeError):
+        pdp.RegexReplace("text", r"\d", "D")(df)
+
+
+NON_ASCII_REPLACEMENTS = [
+    (r"\w+", "W", "café ünï 123", "W W W"),
+    (r"\d", "D", "x ١٢٣", "x DDD"),
+    (r"(\w+) (\w+)", r"\2 \1", "café ünï", "ünï café"),
+    (r"\s", "_", "a\x0bb\x1cc", "a_b_c"),
+    (r"\bé", "E", "é ué", "E ué"),
+    (r"a$", "A", "ba\n", "bA\n"),
+]
+
+
+RE2_DIFFERENCES = [
+    ("a", r"\0", ["c\x00t \x00b", "xbbx"]),
+    ("a", r"\01", ["c\x01t \x01b", "xbbx"]),
+    ("x*", "-", ["-c-a-t- -a-b-", "--b-b--"]),
+    ("a|", "-", ["-c--t- --b-", "-x-b-b-x-"]),
+    (r"b*\b", "-", ["-cat- -a--", "-xbbx-"]),
+    ("[[:alpha:]]", "-", ["cat ab", "xbbx"]),
+]
+
+
+@pytest.mark.filterwarnings("ignore:Possible nested set:FutureWarning")
+@pytest.mark.parametrize("dtype", [object, "str", "string", "string[pyarrow]"])
+@pytest.mark.parametrize("pattern, replace, expected", RE2_DIFFERENCES)
+def test_regex_replace_re2_differences(dtype, pattern, replace, expected):
+    if dtype == "string[pyarrow]":
+        pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"t": ["cat ab", "xbbx"]}, dtype=dtype)
+    res = pdp.RegexReplace("t", pattern, replace)(df)
+    assert res["t"].tolist() == expected
+    assert expected == [re.sub(pattern, replace, x) for x in df["t"]]
+
+
+@pytest.mark.parametrize("dtype", [object, "str", "string", "string[pyarrow]"])
+@pytest.mark.parametrize(
+    "pattern, replace, string, expected", NON_ASCII_REPLACEMENTS
+)
+def test_regex_replace_unicode(dtype, pattern, replace, string, expected):
+    if dtype == "string[pyarrow]":
+        pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"t": [string, "abc"]}, dtype=dtype)
+    res = pdp.RegexReplace("t", pattern, replace)(df)
+    assert res["t"].tolist() == [expected, re.sub(pattern, replace, "abc")]
+
+
+@pytest.mark.parametrize(
+    "pattern, replace, ascii_only, compatible",
+    [
+        ("more", "less", False, True),
+        (r"\b[0-9]+\b", "NUM", False, False),
+        (r"\b[0-9]+\b", "NUM", True, True),
+        (r"(\w)(\d)", r"\2\1", True, True),
+        (r"(\w)(\d)", r"\g<2>", True, False),
+        (r"\s+", " ", True, False),
+        (r"a\tb\.", "x", False, True),
+        (r"a\\d", "x", False, True),
+        (r"y$", "Y", True, False),
+        (r"(?<=m)o", "0", True, False),
+        (r"(a)\1", "x", True, False),
+        ("a", r"\0", True, False),
+        ("(a)", r"\01", True, False),
+        ("(a)", r"\12", True, False),
+        ("x*", "-", True, False),
+        ("a?", "-", True, False),
+        ("a|", "-", True, False),
+        ("(|a)b", "-", True, False),
+        (r"a*\b", "-", True, False),
+        ("^mr.*", "x", True, True),
+        ("[[:alpha:]]", "-", True, False),
+    ],
+)
+def test_is_re2_compatible(pattern, replace, ascii_only, compatible):
+    res = text_stages._is_re2_compatible(pattern, replace, ascii_only)
+    assert res == compatible